@@ -13,9 +13,13 @@ if [ "$1" = "--debug" ]; then
   exec su-exec "$USER" python manage.py runserver "0.0.0.0:$DJANGO_DEV_SERVER_PORT"
 else
   # Gunicorn
+  # Threaded workers keep reporting to the arbiter while a thread streams a
+  # long export, sync workers are killed after GUNICORN_TIMEOUT.
   exec su-exec "$USER" gunicorn "$PROJECT_NAME.wsgi:application" \
     --bind "0.0.0.0:$GUNICORN_PORT" \
     --workers "$GUNICORN_WORKERS" \
+    --worker-class gthread \
+    --threads "$GUNICORN_THREADS" \
     --timeout "$GUNICORN_TIMEOUT" \
     --log-level "$GUNICORN_LOG_LEVEL"
 fi
@@ -1,28 +1,87 @@
 from collections.abc import Sequence
-from functools import partialmethod
+from functools import cache, partialmethod
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.utils import unquote
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.forms.models import BaseInlineFormSet
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.facets import IGNORED_PARAMS
+from apps.core.paginators import EstimatedCountPaginator, InvalidCursor, KeysetPaginator
+from apps.core.xlsx import XLSX_CONTENT_TYPE
+
+CURSOR_VAR = 'cursor'
+
+ALL_PERMISSIONS = '__all__'
+
+# Request attribute holding the permissions resolved during the request.
+REQUEST_PERMISSIONS_ATTR = '_admin_model_permissions'
+
+
+class AllActions(frozenset):
+    """
+    Contains every action, the compiled form of ``'__all__'``.
+    """
+
+    def __contains__(self, action) -> bool:
+        return True
+
+
+ALL_ACTIONS = AllActions()
+
+
+def compile_permissions(permissions: Sequence[str] | str | None) -> frozenset[str]:
+    if permissions == ALL_PERMISSIONS:
+        return ALL_ACTIONS
+    return frozenset(permissions or ())
 
 
 class AdminModelPermissionMixin:
+    """
+    Grants the actions listed in ``permissions`` for the user's status,
+    superusers may do everything. The actions a user may take are resolved
+    once per request and admin class, each ``has_*_permission`` call is a
+    set lookup.
+    """
+
     permissions: dict[str, Sequence[str] | str] = {}
+    status_permissions: dict[str, frozenset[str]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.status_permissions = {status: compile_permissions(perms) for status, perms in cls.permissions.items()}
 
-    def get_user_status_permissions(self, request) -> Sequence[str] | str | None:
-        return self.permissions.get(getattr(request.user, 'status', None), [])
+    def get_user_status_permissions(self, request) -> frozenset[str]:
+        return self.status_permissions.get(getattr(request.user, 'status', None), frozenset())
 
     @classmethod
     def _check_superuser_permissions(cls, request) -> bool:
         return request.user and request.user.is_authenticated and request.user.is_superuser
 
+    def get_request_permissions(self, request) -> frozenset[str]:
+        resolved = request.__dict__.setdefault(REQUEST_PERMISSIONS_ATTR, {})
+        key = (type(self), request.user.pk)
+        if key not in resolved:
+            if self._check_superuser_permissions(request):
+                resolved[key] = ALL_ACTIONS
+            else:
+                resolved[key] = self.get_user_status_permissions(request)
+        return resolved[key]
+
     def has_permission(self, request, *args, action: str, **kwargs) -> bool:
-        perms = self.get_user_status_permissions(request) or []
-        if perms == "__all__":
-            return True
-        return self._check_superuser_permissions(request) or action in perms
+        return action in self.get_request_permissions(request)
 
     def has_any_permissions(self, request, *args, actions: Sequence[str], **kwargs) -> bool:
-        perms = self.get_user_status_permissions(request)
-        if perms == "__all__":
-            return True
-        return self._check_superuser_permissions(request) or any(action in perms for action in actions)
+        perms = self.get_request_permissions(request)
+        return any(action in perms for action in actions)
 
     has_view_permission = partialmethod(has_permission, action="view")
     has_add_permission = partialmethod(has_permission, action="add")
@@ -30,3 +89,336 @@ class AdminModelPermissionMixin:
     has_delete_permission = partialmethod(has_permission, action="delete")
     has_view_or_change_permission = partialmethod(has_any_permissions, actions=["view", "change"])
     has_module_permission = partialmethod(has_permission, action="module")
+
+
+class EstimatedCount:
+    """
+    Stands in for a queryset whose only use is ``count()``.
+    """
+
+    def __init__(self, paginator: EstimatedCountPaginator):
+        self.paginator = paginator
+
+    def count(self) -> int:
+        return self.paginator.count
+
+
+class EstimatedCountChangeList(ChangeList):
+    def get_results(self, request):
+        # The unfiltered total is counted the same way as the filtered result.
+        root_queryset = self.root_queryset
+        self.root_queryset = EstimatedCount(self.model_admin.get_paginator(request, root_queryset, self.list_per_page))
+        try:
+            super().get_results(request)
+        finally:
+            self.root_queryset = root_queryset
+
+
+class EstimatedCountAdminMixin:
+    """
+    Changelist counts come from planner estimates on large PostgreSQL tables,
+    see ``EstimatedCountPaginator``.
+    """
+
+    paginator = EstimatedCountPaginator
+
+    def get_changelist(self, request, **kwargs):
+        return EstimatedCountChangeList
+
+
+class KeysetChangeListMixin:
+    """
+    Shows the page after or before ``?cursor=`` when the changelist is in the
+    admin's ``keyset_ordering``, other orderings keep the numbered pages.
+    """
+
+    keyset_page = None
+    first_page_url = None
+    next_page_url = None
+    previous_page_url = None
+
+    def get_queryset(self, request):
+        # The cursor is not a filter, and changing any filter restarts at the first page.
+        self.params.pop(CURSOR_VAR, None)
+        return super().get_queryset(request)
+
+    def get_results(self, request):
+        super().get_results(request)
+        ordering = list(self.model_admin.keyset_ordering)
+        if list(self.queryset.query.order_by) != ordering or (self.show_all and self.can_show_all):
+            return
+        try:
+            page = KeysetPaginator(self.queryset, self.list_per_page, ordering).page(request.GET.get(CURSOR_VAR))
+        except InvalidCursor as e:
+            raise IncorrectLookupParameters from e
+        self.keyset_page = page
+        self.result_list = page.object_list
+        self.first_page_url = self.get_query_string(remove=[PAGE_VAR])
+        if page.has_next():
+            self.next_page_url = self.get_query_string({CURSOR_VAR: page.next_cursor}, [PAGE_VAR])
+        if page.has_previous():
+            self.previous_page_url = self.get_query_string({CURSOR_VAR: page.previous_cursor}, [PAGE_VAR])
+
+
+class RankedSearchChangeListMixin:
+    """
+    Orders search results by ``search_rank`` unless a column is sorted.
+    """
+
+    def get_ordering(self, request, queryset):
+        query = queryset.query
+        if self.query and ORDER_VAR not in self.params and 'search_rank' in query.annotations:
+            return ['-search_rank', '-pk']
+        return super().get_ordering(request, queryset)
+
+
+class QueryCacheChangeListMixin:
+    """
+    Reads the counts, rows and date hierarchy of the changelist through the
+    query cache of the model's queryset, see ``CachedQuerySetMixin``.
+    """
+
+    def get_queryset(self, request):
+        name = f'{self.opts.label_lower}.changelist'
+        self.root_queryset = self.root_queryset.cached(name)
+        return super().get_queryset(request).cached(name)
+
+
+@cache
+def extend_changelist(mixin: type, changelist: type[ChangeList]) -> type[ChangeList]:
+    """
+    The changelist class with ``mixin`` applied, so admin mixins can each add
+    behaviour to whatever changelist the other mixins return.
+    """
+    return type(f'{mixin.__name__.removesuffix("ChangeListMixin")}{changelist.__name__}', (mixin, changelist), {})
+
+
+class KeysetPaginationAdminMixin:
+    """
+    Pages the changelist with cursors on ``keyset_ordering`` instead of OFFSET,
+    see ``KeysetPaginator``. Combines with the changelist of other mixins.
+    """
+
+    keyset_ordering: Sequence[str] = ('-created_at', '-pk')
+
+    def get_changelist(self, request, **kwargs):
+        return extend_changelist(KeysetChangeListMixin, super().get_changelist(request, **kwargs))
+
+
+class RankedSearchAdminMixin:
+    """
+    Hands the changelist search to ``get_search_backend()``, whose
+    ``search(queryset, term)`` narrows the queryset and annotates
+    ``search_rank``. Results are listed by relevance.
+    """
+
+    def get_search_backend(self):
+        raise NotImplementedError
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return self.get_search_backend().search(queryset, search_term.strip()), False
+
+    def get_changelist(self, request, **kwargs):
+        return extend_changelist(RankedSearchChangeListMixin, super().get_changelist(request, **kwargs))
+
+
+class QueryCacheAdminMixin:
+    """
+    Caches the changelist queries until a table version of the queryset's
+    ``get_query_cache()`` changes. Those tables must be registered with
+    ``track_table_versions()``, and writes bypassing model signals must bump
+    their versions.
+    """
+
+    def get_changelist(self, request, **kwargs):
+        return extend_changelist(QueryCacheChangeListMixin, super().get_changelist(request, **kwargs))
+
+
+class CachedAutocompleteAdminMixin:
+    """
+    Autocomplete lookups of this model are answered from process memory, see
+    ``CachedAutocompleteJsonView``. The model must be registered with
+    ``track_table_versions()``, so saves and deletes refresh the index.
+    """
+
+    cached_autocomplete = True
+
+
+class RollupDateHierarchyAdminMixin:
+    """
+    Builds the date hierarchy from ``get_date_hierarchy_rollup()``, the sorted
+    days that have rows, while no other filter or search narrows the list.
+    Use the ``rollup_date_hierarchy`` tag in the changelist template.
+    """
+
+    def get_date_hierarchy_rollup(self) -> list:
+        raise NotImplementedError
+
+    def get_date_hierarchy_days(self, changelist) -> list | None:
+        date_params = {f'{self.date_hierarchy}__{part}' for part in ('year', 'month', 'day')}
+        if any(value and name not in IGNORED_PARAMS and name not in date_params for name, value in changelist.params.items()):
+            return None
+        return self.get_date_hierarchy_rollup()
+
+
+class KeysetInlineFormSet(BaseInlineFormSet):
+    """
+    Lists ``per_page`` related rows in ``keyset_ordering``, starting after
+    ``cursor``. Bound to POST data, only the posted rows are loaded and rows
+    that were not changed are neither validated nor saved.
+    """
+
+    keyset_ordering: Sequence[str] = ('-pk',)
+    per_page = 20
+
+    def __init__(self, *args, cursor: str | None = None, **kwargs):
+        self.cursor = cursor
+        self.keyset_page = None
+        super().__init__(*args, **kwargs)
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            queryset = self.queryset.order_by(*self.keyset_ordering)
+            if self.is_bound:
+                self._queryset = list(queryset.filter(pk__in=self._posted_pks()))
+            else:
+                self.keyset_page = KeysetPaginator(queryset, self.per_page, self.keyset_ordering).page(self.cursor)
+                self._queryset = self.keyset_page.object_list
+        return self._queryset
+
+    def _posted_pks(self) -> list:
+        pk_field = self.model._meta.pk
+        pks = []
+        for i in range(min(self.initial_form_count(), self.absolute_max)):
+            try:
+                pk = pk_field.to_python(self.data.get(f'{self.add_prefix(i)}-{pk_field.name}'))
+            except ValidationError:
+                continue
+            if pk is not None:
+                pks.append(pk)
+        return pks
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if self.is_bound and i < self.initial_form_count():
+            # full_clean() skips unchanged forms that may be empty.
+            form.empty_permitted = True
+        return form
+
+
+class KeysetInlineMixin:
+    """
+    Inline showing a page of ``per_page`` rows in ``keyset_ordering``, see
+    ``KeysetInlineFormSet``. Its template loads other pages from the parent
+    admin's inline page view, see ``KeysetInlinesAdminMixin``.
+    """
+
+    formset = KeysetInlineFormSet
+    keyset_ordering: Sequence[str] = ('-pk',)
+    per_page = 20
+    template = 'admin/edit_inline/keyset_stacked.html'
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.keyset_ordering = self.keyset_ordering
+        formset.per_page = self.per_page
+        return formset
+
+
+class KeysetInlinesAdminMixin:
+    """
+    Serves the pages of ``KeysetInlineMixin`` inlines as HTML fragments,
+    which replace the inline on the change form.
+    """
+
+    def get_urls(self):
+        return [
+            path(
+                '<path:object_id>/inline/<str:prefix>/',
+                self.admin_site.admin_view(self.inline_page_view),
+                name=f'{self.opts.app_label}_{self.opts.model_name}_inline_page',
+            ),
+            *super().get_urls(),
+        ]
+
+    def inline_page_view(self, request, object_id, prefix):
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+        for formset_class, inline in self.get_formsets_with_inlines(request, obj):
+            if formset_class.get_default_prefix() != prefix or not issubclass(formset_class, KeysetInlineFormSet):
+                continue
+            formset = formset_class(**self.get_formset_kwargs(request, obj, inline, prefix), cursor=request.GET.get(CURSOR_VAR))
+            try:
+                formset.get_queryset()
+            except InvalidCursor:
+                return HttpResponseBadRequest()
+            inline_admin_formset, = self.get_inline_formsets(request, [formset], [inline], obj)
+            context = {
+                **self.admin_site.each_context(request),
+                'opts': self.opts,
+                'original': obj,
+                'inline_admin_formset': inline_admin_formset,
+            }
+            return TemplateResponse(request, inline.template, context)
+        raise Http404
+
+
+class ExportAdminMixin:
+    """
+    Exports the selected rows with the ``export_csv`` and ``export_xlsx``
+    actions, and every row matching the changelist filters and search from
+    the export view, ``<app>_<model>_export`` with the format as argument.
+
+    ``get_exporter(queryset)`` returns an object whose ``iter_csv()`` yields
+    CSV lines and whose ``iter_xlsx()`` yields the bytes of a workbook. Both
+    are streamed as the rows are read.
+    """
+
+    export_formats = ['csv', 'xlsx']
+
+    def get_exporter(self, queryset):
+        raise NotImplementedError
+
+    @admin.action(description=_('Export selected %(verbose_name_plural)s as CSV'), permissions=['view'])
+    def export_csv(self, request, queryset):
+        return self.export_response(queryset, 'csv')
+
+    @admin.action(description=_('Export selected %(verbose_name_plural)s as XLSX'), permissions=['view'])
+    def export_xlsx(self, request, queryset):
+        return self.export_response(queryset, 'xlsx')
+
+    def get_urls(self):
+        return [
+            path(
+                'export/<str:export_format>/',
+                self.admin_site.admin_view(self.export_view),
+                name=f'{self.opts.app_label}_{self.opts.model_name}_export',
+            ),
+            *super().get_urls(),
+        ]
+
+    def export_view(self, request, export_format):
+        if export_format not in self.export_formats:
+            raise Http404
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            changelist = self.get_changelist_instance(request)
+        except IncorrectLookupParameters:
+            return HttpResponseBadRequest()
+        return self.export_response(changelist.queryset, export_format)
+
+    def export_response(self, queryset, export_format):
+        exporter = self.get_exporter(queryset)
+        filename = f'{self.opts.model_name}-export-{timezone.localdate():%Y-%m-%d}.{export_format}'
+        if export_format == 'xlsx':
+            response = StreamingHttpResponse(exporter.iter_xlsx(), content_type=XLSX_CONTENT_TYPE)
+        else:
+            response = StreamingHttpResponse(exporter.iter_csv(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
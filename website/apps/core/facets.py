@@ -0,0 +1,87 @@
+from collections.abc import Sequence
+from copy import copy
+
+from django.contrib.admin.filters import BooleanFieldListFilter, RelatedFieldListFilter
+from django.contrib.admin.views.main import ALL_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, TO_FIELD_VAR
+from django.db.models import Count, Model, QuerySet
+
+from apps.core.query_cache import QueryCache
+
+# Query parameters that change how results are shown, not which rows are counted.
+IGNORED_PARAMS = {ALL_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, TO_FIELD_VAR, 'cursor'}
+
+
+class FacetCounter:
+    """
+    Counts the rows of a queryset per value of a field with one GROUP BY.
+
+    Counts are cached per field, filter state and version of the tables of
+    ``models``, bump a version to invalidate them. ``timeout`` defaults to
+    ``QUERY_CACHE_TIMEOUT``.
+    """
+
+    def __init__(self, models: Sequence[type[Model]], timeout: int | None = None):
+        self.query_cache = QueryCache(models, timeout)
+
+    def counts(self, queryset: QuerySet, field: str, state: str) -> dict:
+        return self.query_cache.get_or_set(
+            f'{queryset.model._meta.label_lower}.facets.{field}', state, lambda: self.count(queryset, field)
+        )
+
+    def count(self, queryset: QuerySet, field: str) -> dict:
+        return dict(
+            queryset.order_by().values(field).annotate(facet_count=Count('pk')).values_list(field, 'facet_count')
+        )
+
+
+def get_facet_counts(changelist, list_filter, field: str) -> dict:
+    """
+    Counts of the changelist's ``facet_counter`` for the current search and
+    filters except ``list_filter`` itself, so its other choices show how many
+    rows selecting them would list. ``list_filter.request`` is the request
+    the changelist was built for.
+    """
+    if not hasattr(changelist, 'facet_counts'):
+        changelist.facet_counts = {}
+    if field not in changelist.facet_counts:
+        own_params = set(list_filter.expected_parameters())
+        params = {name: value for name, value in changelist.params.items() if name not in own_params}
+        # A copy, building a queryset replaces the filters and query strings
+        # of the changelist that is being rendered.
+        facet_changelist = copy(changelist)
+        facet_changelist.params = params
+        queryset = facet_changelist.get_queryset(list_filter.request)
+        state = sorted((name, value) for name, value in params.items() if name not in IGNORED_PARAMS)
+        changelist.facet_counts[field] = changelist.model_admin.facet_counter.counts(queryset, field, repr(state))
+    return changelist.facet_counts[field]
+
+
+def facet_label(label, count: int) -> str:
+    return f'{label} ({count})'
+
+
+class FacetRelatedFieldListFilter(RelatedFieldListFilter):
+    def __init__(self, field, request, *args, **kwargs):
+        self.request = request
+        super().__init__(field, request, *args, **kwargs)
+
+    def choices(self, changelist):
+        counts = get_facet_counts(changelist, self, self.field_path)
+        self.lookup_choices = [(pk, facet_label(label, counts.get(pk, 0))) for pk, label in self.lookup_choices]
+        yield from super().choices(changelist)
+
+
+class FacetBooleanFieldListFilter(BooleanFieldListFilter):
+    def __init__(self, field, request, *args, **kwargs):
+        self.request = request
+        super().__init__(field, request, *args, **kwargs)
+
+    def choices(self, changelist):
+        counts = get_facet_counts(changelist, self, self.field_path)
+        all_choice, *choices = super().choices(changelist)
+        yield all_choice
+        # "Yes", "No" and, for nullable fields, "Unknown".
+        values = [True, False, None] if self.field.null else [True, False]
+        for value, choice in zip(values, choices, strict=True):
+            choice['display'] = facet_label(choice['display'], counts.get(value, 0))
+            yield choice
@@ -1,8 +1,9 @@
 from django.db import models
-from django.db.models import UniqueConstraint
-from django.db.models.functions import Lower
+from django.db.models import F, UniqueConstraint
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.text import normalize_name
+
 # Create your models here.
 
 class TimestampModel(models.Model):
@@ -43,12 +44,35 @@ class NamedModel(models.Model):
 
 
 class UniqueNamedModel(NamedModel):
+    """
+    Names are unique ignoring case, compared by ``normalized_name``, which is
+    derived from ``name`` on save. Code creating rows without ``save()``, e.g.
+    ``bulk_create``, must set it with ``normalize_name``.
+    """
+
+    # Case folding may lengthen a name, e.g. ``ß`` becomes ``ss``.
+    normalized_name = models.CharField(max_length=255, editable=False, verbose_name=_('Normalized name'))
+
     class Meta(NamedModel.Meta):
         abstract = True
         constraints = [
             UniqueConstraint(
-                Lower('name'),
+                F('normalized_name'),
                 name='unique_name_%(class)s',
                 violation_error_message=_('Record with this name already exists'),
             )
         ]
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_name(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_name'}
+        super().save(*args, **kwargs)
+
+    def validate_constraints(self, exclude=None):
+        # Forms exclude the derived field, the constraint applies to the name.
+        self.normalized_name = normalize_name(self.name)
+        if exclude and 'name' not in exclude:
+            exclude = set(exclude) - {'normalized_name'}
+        super().validate_constraints(exclude)
@@ -0,0 +1,192 @@
+import base64
+import binascii
+import json
+from collections.abc import Iterator, Sequence
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """
+    Row count estimated by the PostgreSQL planner, ``None`` on other backends.
+
+    Unfiltered querysets read ``pg_class.reltuples`` of the table, filtered
+    ones the row estimate of the query plan.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            # Tables that were never analyzed report -1.
+            return row[0] if row and row[0] >= 0 else None
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the planner estimate as the object count when it is at least
+    ``threshold`` and counts exactly otherwise, or when no estimate is
+    available.
+
+    Above the threshold the number of pages is approximate: trailing pages
+    may be empty or the last few rows may only be reachable by narrowing
+    the filters.
+    """
+
+    @property
+    def threshold(self) -> int:
+        return settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+
+    @cached_property
+    def count(self) -> int:
+        if isinstance(self.object_list, QuerySet):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= self.threshold:
+                return estimate
+        return super().count
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class KeysetPage:
+    def __init__(self, object_list: list, next_cursor: str | None, previous_cursor: str | None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Pages through ``object_list`` by seeking past the edge row of the adjacent
+    page instead of skipping rows with OFFSET, so deep pages cost the same as
+    the first one.
+
+    ``ordering`` must end with a unique field and should be backed by an
+    index. Pages are addressed by opaque cursors, ``None`` is the first page.
+    """
+
+    NEXT = 'next'
+    PREVIOUS = 'previous'
+
+    def __init__(self, object_list: QuerySet, per_page: int, ordering: Sequence[str] = ('-created_at', '-pk')):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        opts = object_list.model._meta
+        try:
+            self.fields = [
+                opts.pk if name.lstrip('-') == 'pk' else opts.get_field(name.lstrip('-'))
+                for name in self.ordering
+            ]
+        except FieldDoesNotExist as e:
+            raise ValueError(f'Keyset ordering must consist of model fields: {e}') from e
+
+    def page(self, cursor: str | None = None) -> KeysetPage:
+        direction, values = self.decode_cursor(cursor) if cursor else (self.NEXT, None)
+        backwards = direction == self.PREVIOUS
+        ordering = [_reverse_ordering(name) for name in self.ordering] if backwards else self.ordering
+        queryset = self.object_list.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(_seek(ordering, values))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor(self.NEXT, rows[-1]) if has_next and rows else None,
+            previous_cursor=self.encode_cursor(self.PREVIOUS, rows[0]) if has_previous and rows else None,
+        )
+
+    def after(self, cursor: str | None = None) -> QuerySet:
+        """
+        Every row after a next page ``cursor`` in ``ordering``, for reading
+        the rest of the list with ``iterator()``.
+        """
+        queryset = self.object_list.order_by(*self.ordering)
+        if cursor is None:
+            return queryset
+        direction, values = self.decode_cursor(cursor)
+        if direction != self.NEXT:
+            raise InvalidCursor(f'Invalid cursor: {cursor}')
+        return queryset.filter(_seek(self.ordering, values))
+
+    def iter_pages(self) -> Iterator[KeysetPage]:
+        cursor = None
+        while True:
+            page = self.page(cursor)
+            yield page
+            if not page.has_next():
+                return
+            cursor = page.next_cursor
+
+    def encode_cursor(self, direction: str, obj) -> str:
+        payload = [direction, [field.value_to_string(obj) for field in self.fields]]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[str, list]:
+        try:
+            direction, values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if direction not in (self.NEXT, self.PREVIOUS) or len(values) != len(self.fields):
+                raise ValueError(cursor)
+            return direction, [field.to_python(value) for field, value in zip(self.fields, values, strict=True)]
+        except (binascii.Error, ValueError, TypeError, ValidationError) as e:
+            raise InvalidCursor(f'Invalid cursor: {cursor}') from e
+
+
+def _reverse_ordering(name: str) -> str:
+    return name[1:] if name.startswith('-') else f'-{name}'
+
+
+def _seek(ordering: Sequence[str], values: Sequence) -> Q:
+    """
+    Rows after ``values`` in ``ordering``, e.g.
+    ``a <= x AND (a < x OR (a = x AND b < y))`` for ``['-a', '-b']``.
+
+    The redundant bound on the first field lets the database read the index
+    on it as a range, in order, and stop at the page size.
+    """
+    condition = Q()
+    equal = {}
+    for name, value in zip(ordering, values, strict=True):
+        field = name.lstrip('-')
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{field}__{lookup}': value})
+        equal[field] = value
+    first = ordering[0]
+    return Q(**{f'{first.lstrip("-")}__{"lte" if first.startswith("-") else "gte"}': values[0]}) & condition
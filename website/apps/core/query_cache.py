@@ -0,0 +1,133 @@
+import hashlib
+import threading
+from collections import Counter
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Model
+
+from apps.core.table_versions import get_table_versions
+
+T = TypeVar('T')
+
+HIT = 'hits'
+MISS = 'misses'
+
+_MISSING = object()
+
+_stats: Counter[tuple[str, str]] = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_query_cache_stats() -> dict[str, dict[str, int]]:
+    """
+    Hits and misses per query name since the process started.
+    """
+    with _stats_lock:
+        stats = {}
+        for (name, outcome), amount in sorted(_stats.items()):
+            stats.setdefault(name, {HIT: 0, MISS: 0})[outcome] = amount
+        return stats
+
+
+def reset_query_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _record(name: str, outcome: str):
+    with _stats_lock:
+        _stats[name, outcome] += 1
+
+
+class QueryCache:
+    """
+    Caches results of named queries per parameters and per version of the
+    tables of ``models``, bump a version to invalidate every result read
+    from that table.
+
+    Results are stored in the ``alias`` cache of ``CACHES``, any Django
+    cache backend can hold them. Hits and misses are counted per name, see
+    ``get_query_cache_stats()``. Every query reads the database while
+    ``QUERY_CACHE_ENABLED`` is off.
+    """
+
+    def __init__(self, models: Sequence[type[Model]], timeout: int | None = None, alias: str = DEFAULT_CACHE_ALIAS):
+        self.models = list(models)
+        self.timeout = settings.QUERY_CACHE_TIMEOUT if timeout is None else timeout
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, name: str, params) -> str:
+        versions = '.'.join(str(version) for version in get_table_versions(*self.models))
+        digest = hashlib.sha1(repr(params).encode()).hexdigest()
+        return f'query-cache:{name}:{versions}:{digest}'
+
+    def get_or_set(self, name: str, params, compute: Callable[[], T]) -> T:
+        if not settings.QUERY_CACHE_ENABLED:
+            return compute()
+        key = self.key(name, params)
+        result = self.cache.get(key, _MISSING)
+        if result is not _MISSING:
+            _record(name, HIT)
+            return result
+        _record(name, MISS)
+        result = compute()
+        self.cache.set(key, result, self.timeout)
+        return result
+
+
+class CachedQuerySetMixin:
+    """
+    Querysets marked with ``cached(name)`` read their rows and counts from
+    ``get_query_cache()``, keyed by their SQL. The mark is kept through
+    filtering, slicing and ``values()``. Querysets used for writing, and
+    ``iterator()``, always read the database.
+    """
+
+    _query_cache_name: str | None = None
+
+    def get_query_cache(self) -> QueryCache:
+        return QueryCache([self.model])
+
+    def cached(self, name: str):
+        clone = self._chain()
+        clone._query_cache_name = name
+        return clone
+
+    def uncached(self):
+        clone = self._chain()
+        clone._query_cache_name = None
+        return clone
+
+    def count(self) -> int:
+        if self._query_cache_name is None or self._result_cache is not None:
+            return super().count()
+        return self._get_or_set_cached('count', super().count)
+
+    def _fetch_all(self):
+        if self._query_cache_name is not None and self._result_cache is None and not self._for_write:
+            self._result_cache = self._get_or_set_cached('rows', lambda: list(self._iterable_class(self)))
+        super()._fetch_all()
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._query_cache_name = self._query_cache_name
+        return clone
+
+    def _get_or_set_cached(self, kind: str, compute: Callable[[], T]) -> T:
+        if self.query.select_for_update:
+            return compute()
+        try:
+            sql, params = self.query.get_compiler(self.db).as_sql()
+        except EmptyResultSet:
+            return compute()
+        # values() and values_list() share the SQL but not the shape of the rows.
+        shape = (self._iterable_class.__name__, self._fields)
+        return self.get_query_cache().get_or_set(f'{self._query_cache_name}.{kind}', (self.db, shape, sql, params), compute)
@@ -0,0 +1,73 @@
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+VERSION_KEY = 'table-version:{}'
+
+
+def _key(model: type[Model]) -> str:
+    return VERSION_KEY.format(model._meta.db_table)
+
+
+def get_table_versions(*models: type[Model]) -> tuple[int, ...]:
+    """
+    Current versions of the tables of ``models``, for cache keys of data
+    derived from them.
+    """
+    keys = [_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A fresh start value, so an evicted version never repeats an old one.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_table_versions(*models: type[Model]):
+    """
+    Invalidates everything cached under the current versions of ``models``.
+    Inside a transaction the bump waits for the commit, so readers never
+    cache uncommitted data under the new version.
+    """
+    transaction.on_commit(partial(_bump, models))
+
+
+def _bump(models):
+    for model in models:
+        try:
+            cache.incr(_key(model))
+        except ValueError:
+            cache.set(_key(model), time.time_ns(), timeout=None)
+
+
+def track_table_versions(*models: type[Model]):
+    """
+    Bumps the version of the tables of ``models`` whenever a row is saved or
+    deleted through the ORM, or a many-to-many relation of it changes.
+    ``QuerySet.update()``, ``bulk_create()``, ``bulk_update()`` and raw SQL
+    send no signals, code writing that way must call
+    :func:`bump_table_versions` itself.
+    """
+    for model in models:
+        post_save.connect(_bump_sender, sender=model, dispatch_uid=f'table-version:{model._meta.label}:save')
+        post_delete.connect(_bump_sender, sender=model, dispatch_uid=f'table-version:{model._meta.label}:delete')
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                _bump_sender_m2m,
+                sender=field.remote_field.through,
+                dispatch_uid=f'table-version:{model._meta.label}:{field.name}',
+            )
+
+
+def _bump_sender(sender, **kwargs):
+    bump_table_versions(sender)
+
+
+def _bump_sender_m2m(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_table_versions(type(instance), model)
@@ -0,0 +1,95 @@
+import datetime
+
+from django import template
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.utils import formats
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+register = template.Library()
+
+
+def rollup_date_hierarchy(cl):
+    """
+    The admin's date hierarchy built from the days ``get_date_hierarchy_days``
+    of the model admin returns, falling back to the admin's queries when it
+    returns ``None``.
+    """
+    days = cl.model_admin.get_date_hierarchy_days(cl) if cl.date_hierarchy else None
+    if days is None:
+        return date_hierarchy(cl)
+
+    field_name = cl.date_hierarchy
+    year_field = f'{field_name}__year'
+    month_field = f'{field_name}__month'
+    day_field = f'{field_name}__day'
+    year_lookup = cl.params.get(year_field)
+    month_lookup = cl.params.get(month_field)
+    day_lookup = cl.params.get(day_field)
+
+    def link(filters):
+        return cl.get_query_string(filters, [f'{field_name}__'])
+
+    if not (year_lookup or month_lookup or day_lookup) and days:
+        # Start at the deepest level that still has more than one choice.
+        if days[0].year == days[-1].year:
+            year_lookup = days[0].year
+            if days[0].month == days[-1].month:
+                month_lookup = days[0].month
+
+    if year_lookup and month_lookup and day_lookup:
+        day = datetime.date(int(year_lookup), int(month_lookup), int(day_lookup))
+        return {
+            'show': True,
+            'back': {
+                'link': link({year_field: year_lookup, month_field: month_lookup}),
+                'title': capfirst(formats.date_format(day, 'YEAR_MONTH_FORMAT')),
+            },
+            'choices': [{'title': capfirst(formats.date_format(day, 'MONTH_DAY_FORMAT'))}],
+        }
+    if year_lookup and month_lookup:
+        return {
+            'show': True,
+            'back': {'link': link({year_field: year_lookup}), 'title': str(year_lookup)},
+            'choices': [
+                {
+                    'link': link({year_field: year_lookup, month_field: month_lookup, day_field: day.day}),
+                    'title': capfirst(formats.date_format(day, 'MONTH_DAY_FORMAT')),
+                }
+                for day in days
+                if day.year == int(year_lookup) and day.month == int(month_lookup)
+            ],
+        }
+    if year_lookup:
+        months = sorted({day.replace(day=1) for day in days if day.year == int(year_lookup)})
+        return {
+            'show': True,
+            'back': {'link': link({}), 'title': _('All dates')},
+            'choices': [
+                {
+                    'link': link({year_field: year_lookup, month_field: month.month}),
+                    'title': capfirst(formats.date_format(month, 'YEAR_MONTH_FORMAT')),
+                }
+                for month in months
+            ],
+        }
+    return {
+        'show': True,
+        'back': None,
+        'choices': [
+            {'link': link({year_field: str(year)}), 'title': str(year)}
+            for year in sorted({day.year for day in days})
+        ],
+    }
+
+
+@register.tag(name='rollup_date_hierarchy')
+def rollup_date_hierarchy_tag(parser, token):
+    return InclusionAdminNode(
+        parser,
+        token,
+        func=rollup_date_hierarchy,
+        template_name='date_hierarchy.html',
+        takes_context=False,
+    )
@@ -0,0 +1,9 @@
+import unicodedata
+
+
+def normalize_name(name) -> str:
+    """
+    Case-insensitive form of a name. Folded in Python, the ``LOWER()`` of
+    SQLite only folds ASCII letters.
+    """
+    return unicodedata.normalize('NFKC', str(name)).casefold()
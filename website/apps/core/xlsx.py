@@ -0,0 +1,173 @@
+import zipfile
+from collections.abc import Iterable
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+DOCUMENT_RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+CONTENT_TYPE_PREFIX = 'application/vnd.openxmlformats-officedocument.spreadsheetml'
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Cell styles of styles.xml: default, datetime and date.
+DATETIME_STYLE = 1
+DATE_STYLE = 2
+
+STYLES = (
+    f'{XML_DECLARATION}<styleSheet xmlns="{MAIN_NS}">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="yyyy-mm-dd h:mm:ss"/>'
+    '<numFmt numFmtId="165" formatCode="yyyy-mm-dd"/>'
+    '</numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+class _Pipe:
+    """
+    Write-only file collecting what ``zipfile`` writes until it is taken.
+    Without ``seek`` and ``tell`` the archive is written strictly forward.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+
+class XlsxStreamWriter:
+    """
+    Writes a workbook of inline string, number, boolean and date cells as a
+    stream of bytes, without a temporary file: every sheet is compressed
+    into the archive as its rows are appended, the workbook parts naming
+    the sheets follow at the end.
+
+    Append rows after ``add_sheet()`` and pass what ``take()`` returns on
+    whenever ``pending`` is large enough, ``close()`` returns the rest.
+    """
+
+    def __init__(self):
+        self.pipe = _Pipe()
+        self.archive = zipfile.ZipFile(self.pipe, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.sheets = []
+        self.sheet = None
+        self.row_number = 0
+
+    @property
+    def pending(self) -> int:
+        return self.pipe.size
+
+    def take(self) -> bytes:
+        return self.pipe.take()
+
+    def add_sheet(self, title: str):
+        self._close_sheet()
+        self.sheets.append(title)
+        # Sheets of a million rows can exceed the 2 GiB a zip entry without
+        # the ZIP64 extension may hold, the size is unknown up front.
+        self.sheet = self.archive.open(f'xl/worksheets/sheet{len(self.sheets)}.xml', 'w', force_zip64=True)
+        self.sheet.write(f'{XML_DECLARATION}<worksheet xmlns="{MAIN_NS}"><sheetData>'.encode())
+        self.row_number = 0
+
+    def append(self, values: Iterable):
+        self.row_number += 1
+        cells = ''.join(
+            self._cell(f'{get_column_letter(column)}{self.row_number}', value)
+            for column, value in enumerate(values, start=1)
+        )
+        self.sheet.write(f'<row r="{self.row_number}">{cells}</row>'.encode())
+
+    def close(self) -> bytes:
+        self._close_sheet()
+        sheet_numbers = range(1, len(self.sheets) + 1)
+        self.archive.writestr('[Content_Types].xml', (
+            f'{XML_DECLARATION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{CONTENT_TYPE_PREFIX}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{CONTENT_TYPE_PREFIX}.styles+xml"/>'
+            + ''.join(
+                f'<Override PartName="/xl/worksheets/sheet{number}.xml" ContentType="{CONTENT_TYPE_PREFIX}.worksheet+xml"/>'
+                for number in sheet_numbers
+            )
+            + '</Types>'
+        ))
+        self.archive.writestr('_rels/.rels', (
+            f'{XML_DECLARATION}<Relationships xmlns="{RELATIONSHIPS_NS}">'
+            f'<Relationship Id="rId1" Type="{DOCUMENT_RELATIONSHIPS_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ))
+        self.archive.writestr('xl/workbook.xml', (
+            f'{XML_DECLARATION}<workbook xmlns="{MAIN_NS}" xmlns:r="{DOCUMENT_RELATIONSHIPS_NS}"><sheets>'
+            + ''.join(
+                f'<sheet name={quoteattr(title)} sheetId="{number}" r:id="rId{number}"/>'
+                for number, title in enumerate(self.sheets, start=1)
+            )
+            + '</sheets></workbook>'
+        ))
+        self.archive.writestr('xl/_rels/workbook.xml.rels', (
+            f'{XML_DECLARATION}<Relationships xmlns="{RELATIONSHIPS_NS}">'
+            + ''.join(
+                f'<Relationship Id="rId{number}" Type="{DOCUMENT_RELATIONSHIPS_NS}/worksheet" '
+                f'Target="worksheets/sheet{number}.xml"/>'
+                for number in sheet_numbers
+            )
+            + f'<Relationship Id="rId{len(self.sheets) + 1}" Type="{DOCUMENT_RELATIONSHIPS_NS}/styles" Target="styles.xml"/>'
+            + '</Relationships>'
+        ))
+        self.archive.writestr('xl/styles.xml', STYLES)
+        self.archive.close()
+        return self.take()
+
+    def _close_sheet(self):
+        if self.sheet is not None:
+            self.sheet.write(b'</sheetData></worksheet>')
+            self.sheet.close()
+            self.sheet = None
+
+    @staticmethod
+    def _cell(reference: str, value) -> str:
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, int | float | Decimal):
+            return f'<c r="{reference}"><v>{value}</v></c>'
+        if isinstance(value, datetime):
+            return f'<c r="{reference}" s="{DATETIME_STYLE}"><v>{to_excel(value)}</v></c>'
+        if isinstance(value, date):
+            return f'<c r="{reference}" s="{DATE_STYLE}"><v>{to_excel(value)}</v></c>'
+        text = escape(ILLEGAL_CHARACTERS_RE.sub('', str(value)))
+        return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
@@ -3,18 +3,51 @@ from django.contrib.auth import get_user_model
 from django.db.models import TextChoices
 from django.utils.translation import gettext_lazy as _
 
-from apps.core.admin import AdminModelPermissionMixin
-
-from .models import Canton, Company, CompanyContactRecord, CompanyNote, CompanyType, LegalForm, LegalSeat
+from apps.core.admin import (
+    AdminModelPermissionMixin,
+    CachedAutocompleteAdminMixin,
+    EstimatedCountAdminMixin,
+    ExportAdminMixin,
+    KeysetInlineMixin,
+    KeysetInlinesAdminMixin,
+    KeysetPaginationAdminMixin,
+    QueryCacheAdminMixin,
+    RankedSearchAdminMixin,
+    RollupDateHierarchyAdminMixin,
+)
+from apps.core.facets import (
+    FacetBooleanFieldListFilter,
+    FacetCounter,
+    FacetRelatedFieldListFilter,
+    facet_label,
+    get_facet_counts,
+)
+
+from .models import (
+    COMPANY_REFERENCE_MODELS,
+    Canton,
+    Company,
+    CompanyContactRecord,
+    CompanyDailyCount,
+    CompanyImportRun,
+    CompanyNote,
+    CompanyType,
+    LegalForm,
+    LegalSeat,
+    count_days,
+)
+from .services.company_export import CompanyExporter
+from .services.company_search import get_company_search_backend
 
 # Register your models here.
 
 User = get_user_model()
 
 
-class CompanyContactRecordStacked(AdminModelPermissionMixin, admin.StackedInline):
+class CompanyContactRecordStacked(KeysetInlineMixin, AdminModelPermissionMixin, admin.StackedInline):
     model = CompanyContactRecord
     readonly_fields = ['user', 'contacted_at']
+    keyset_ordering = ['-contacted_at', '-pk']
     permissions = {
         User.Status.MANAGER: '__all__',
         User.Status.OPERATOR: '__all__',
@@ -22,9 +55,10 @@ class CompanyContactRecordStacked(AdminModelPermissionMixin, admin.StackedInline
     extra = 0
 
 
-class CompanyNoteStacked(AdminModelPermissionMixin, admin.StackedInline):
+class CompanyNoteStacked(KeysetInlineMixin, AdminModelPermissionMixin, admin.StackedInline):
     model = CompanyNote
     readonly_fields = ['user']
+    keyset_ordering = ['-created_at', '-pk']
     permissions = {
         User.Status.MANAGER: '__all__',
         User.Status.OPERATOR: '__all__',
@@ -53,6 +87,10 @@ class LastContactStatusFilter(admin.SimpleListFilter):
     title = _('Last contact status')
     parameter_name = 'last_contact_status'
 
+    def __init__(self, request, *args, **kwargs):
+        self.request = request
+        super().__init__(request, *args, **kwargs)
+
     def lookups(self, request, model_admin):
         return CompanyContactRecord.Status.choices
 
@@ -62,17 +100,32 @@ class LastContactStatusFilter(admin.SimpleListFilter):
             return queryset.filter_last_contact_status(status=value)
         return queryset
 
+    def choices(self, changelist):
+        counts = get_facet_counts(changelist, self, 'last_contact_status')
+        self.lookup_choices = [(value, facet_label(label, counts.get(value, 0))) for value, label in self.lookup_choices]
+        yield from super().choices(changelist)
+
 
 @admin.register(Company)
-class CompanyAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
-    search_fields = ['title']
-    search_help_text = _('Type company name')
+class CompanyAdmin(
+    ExportAdminMixin,
+    KeysetInlinesAdminMixin,
+    QueryCacheAdminMixin,
+    RollupDateHierarchyAdminMixin,
+    RankedSearchAdminMixin,
+    KeysetPaginationAdminMixin,
+    EstimatedCountAdminMixin,
+    AdminModelPermissionMixin,
+    admin.ModelAdmin,
+):
+    search_fields = ['title', 'description']
+    search_help_text = _('Type company name or description')
     autocomplete_fields = ['type', 'legal_form', 'legal_seat', 'canton']
     list_filter = [
-        'canton',
-        'legal_seat',
-        'legal_form',
-        'in_liquidation',
+        ('canton', FacetRelatedFieldListFilter),
+        ('legal_seat', FacetRelatedFieldListFilter),
+        ('legal_form', FacetRelatedFieldListFilter),
+        ('in_liquidation', FacetBooleanFieldListFilter),
         LastContactStatusFilter,
         IsReadyStatusFilter,
         'created_at',
@@ -91,7 +144,9 @@ class CompanyAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
         'created_at',
     ]
     date_hierarchy = 'created_at'
+    facet_counter = FacetCounter(models=[Company, CompanyContactRecord, *COMPANY_REFERENCE_MODELS])
     inlines = [CompanyNoteStacked, CompanyContactRecordStacked]
+    actions = ['export_csv', 'export_xlsx']
     permissions = {
         User.Status.MANAGER: '__all__',
         User.Status.OPERATOR: ['change', 'view', 'module'],
@@ -101,9 +156,39 @@ class CompanyAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
     def display_liquidation(self, obj):
         return not obj.in_liquidation
 
-    @admin.display(description=_('Last contact status'))
+    @admin.display(description=_('Last contact status'), ordering='last_contact_status')
     def display_last_contact_status(self, obj):
-        return obj.contact_records.latest('contacted_at').get_status_display()
+        return obj.get_last_contact_status_display() or None
+
+    def get_search_backend(self):
+        return get_company_search_backend()
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related('canton', 'legal_seat', 'legal_form')
+        )
+
+    def get_date_hierarchy_rollup(self):
+        return CompanyDailyCount.objects.days()
+
+    def get_exporter(self, queryset):
+        return CompanyExporter(queryset)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            CompanyDailyCount.objects.add(count_days([obj.created_at]))
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        CompanyDailyCount.objects.add({day: -amount for day, amount in count_days([obj.created_at]).items()})
+
+    def delete_queryset(self, request, queryset):
+        days = queryset.daily_counts()
+        super().delete_queryset(request, queryset)
+        CompanyDailyCount.objects.add({day: -amount for day, amount in days.items()})
 
     def save_formset(self, request, form, formset, change):
         instances = formset.save(commit=False)
@@ -112,6 +197,8 @@ class CompanyAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
                 if not instance.pk:
                     instance.user = request.user
         super().save_formset(request, form, formset, change)
+        if issubclass(formset.model, CompanyContactRecord):
+            Company.objects.filter(pk=form.instance.pk).refresh_contact_summary()
 
     def change_view(self, request, object_id, *args, **kwargs):
         extra_context = {
@@ -122,7 +209,7 @@ class CompanyAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
 
 
 @admin.register(CompanyType)
-class CompanyTypeAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
+class CompanyTypeAdmin(CachedAutocompleteAdminMixin, AdminModelPermissionMixin, admin.ModelAdmin):
     search_fields = ['name']
     permissions = {
         User.Status.MANAGER: '__all__',
@@ -131,7 +218,7 @@ class CompanyTypeAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
 
 
 @admin.register(LegalForm)
-class LegalFormAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
+class LegalFormAdmin(CachedAutocompleteAdminMixin, AdminModelPermissionMixin, admin.ModelAdmin):
     search_fields = ['name']
     permissions = {
         User.Status.MANAGER: '__all__',
@@ -140,7 +227,7 @@ class LegalFormAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
 
 
 @admin.register(LegalSeat)
-class LegalSeatAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
+class LegalSeatAdmin(CachedAutocompleteAdminMixin, AdminModelPermissionMixin, admin.ModelAdmin):
     search_fields = ['name']
     permissions = {
         User.Status.MANAGER: '__all__',
@@ -149,9 +236,19 @@ class LegalSeatAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
 
 
 @admin.register(Canton)
-class CantonAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
+class CantonAdmin(CachedAutocompleteAdminMixin, AdminModelPermissionMixin, admin.ModelAdmin):
     search_fields = ['name']
     permissions = {
         User.Status.MANAGER: '__all__',
         User.Status.OPERATOR: ['view'],
     }
+
+
+@admin.register(CompanyImportRun)
+class CompanyImportRunAdmin(AdminModelPermissionMixin, admin.ModelAdmin):
+    list_display = ['file_name', 'mode', 'status', 'last_sheet', 'last_row', 'rows_imported', 'created_at', 'finished_at']
+    list_filter = ['status', 'mode']
+    readonly_fields = [field.name for field in CompanyImportRun._meta.fields]
+    permissions = {
+        User.Status.MANAGER: ['view', 'delete', 'module'],
+    }
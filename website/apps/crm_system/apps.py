@@ -6,3 +6,18 @@ class CrmSystemConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.crm_system'
     verbose_name = _('CRM Management System')
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+
+        from apps.core.table_versions import track_table_versions
+        from apps.crm_system.models import (
+            COMPANY_REFERENCE_MODELS,
+            Company,
+            CompanyContactRecord,
+            CompanyNote,
+            record_company_deletion,
+        )
+
+        track_table_versions(Company, CompanyContactRecord, CompanyNote, *COMPANY_REFERENCE_MODELS)
+        post_delete.connect(record_company_deletion, sender=Company, dispatch_uid='record_company_deletion')
@@ -0,0 +1,47 @@
+from django import forms
+
+from apps.crm_system.models import Canton, CompanyQuerySet, CompanyType, ContactStatus, LegalForm, LegalSeat
+from apps.crm_system.services.company_feed import HISTORY
+
+
+class FeedForm(forms.Form):
+    """
+    Query parameters every feed takes.
+    """
+
+    FORMATS = ['ndjson', 'json']
+
+    cursor = forms.CharField(required=False)
+    format = forms.ChoiceField(choices=[(name, name) for name in FORMATS], required=False)
+
+
+class CompanyFeedForm(FeedForm):
+    """
+    Query parameters of the company feed. Reference filters take names and
+    may be repeated, e.g. ``?canton=ZH&canton=AG``.
+    """
+
+    include = forms.MultipleChoiceField(choices=[(name, name) for name in HISTORY], required=False)
+    updated_since = forms.DateTimeField(required=False)
+    last_status = forms.ChoiceField(choices=ContactStatus.choices, required=False)
+    contact_ready = forms.NullBooleanField(required=False)
+    in_liquidation = forms.NullBooleanField(required=False)
+    canton = forms.ModelMultipleChoiceField(Canton.objects.all(), to_field_name='name', required=False)
+    legal_seat = forms.ModelMultipleChoiceField(LegalSeat.objects.all(), to_field_name='name', required=False)
+    legal_form = forms.ModelMultipleChoiceField(LegalForm.objects.all(), to_field_name='name', required=False)
+    type = forms.ModelMultipleChoiceField(CompanyType.objects.all(), to_field_name='name', required=False)
+
+    def filter(self, queryset: CompanyQuerySet) -> CompanyQuerySet:
+        data = self.cleaned_data
+        if data['last_status']:
+            queryset = queryset.filter_last_contact_status(data['last_status'])
+        if data['contact_ready'] is not None:
+            queryset = queryset.filter_contact_ready_status(data['contact_ready'])
+        if data['in_liquidation'] is not None:
+            queryset = queryset.filter(in_liquidation=data['in_liquidation'])
+        if data['updated_since']:
+            queryset = queryset.filter(updated_at__gte=data['updated_since'])
+        for name in ['canton', 'legal_seat', 'legal_form', 'type']:
+            if data[name]:
+                queryset = queryset.filter(**{f'{name}__in': data[name]})
+        return queryset
@@ -0,0 +1,42 @@
+from django.core.management import BaseCommand, CommandError
+
+from apps.crm_system.services.query_plan_advisor import canonical_queries, sequential_scans, table_sizes
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the company admin queries and flag sequential scans on large tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=10_000,
+            help='Sequential scans are only flagged on tables with at least this many rows'
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Exit with an error when a sequential scan is flagged'
+        )
+
+    def handle(self, *args, **options):
+        sizes = table_sizes()
+        flagged = 0
+        for name, queryset in canonical_queries().items():
+            plan = queryset.explain()
+            scans = {
+                table: sizes[table]
+                for table in sequential_scans(queryset, plan)
+                if sizes.get(table, 0) >= options['min_rows']
+            }
+            if scans:
+                flagged += 1
+                tables = ', '.join(f'{table} ({rows} rows)' for table, rows in sorted(scans.items()))
+                self.stdout.write(self.style.WARNING(f'{name}: sequential scan on {tables}'))
+            else:
+                self.stdout.write(f'{name}: ok')
+            if options['verbosity'] > 1 or scans:
+                self.stdout.write('\n'.join(f'    {line}' for line in plan.splitlines()))
+
+        if flagged and options['strict']:
+            raise CommandError(f'{flagged} queries scan large tables sequentially')
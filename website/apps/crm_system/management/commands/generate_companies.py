@@ -0,0 +1,234 @@
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from openpyxl import Workbook
+
+from apps.core.table_versions import bump_table_versions
+from apps.crm_system.models import Company, CompanyContactRecord, CompanyDailyCount, CompanyNote, count_days
+from apps.crm_system.services.company_export import XLSX_MAX_ROWS
+from apps.crm_system.services.company_import_service import REFERENCE_MODELS
+from apps.crm_system.services.import_keys import make_import_key
+from apps.crm_system.services.reference_resolver import ReferenceResolver
+from apps.crm_system.services.synthetic_company_generator import IMPORT_HEADERS, REFERENCE_DATE, SyntheticCompanyGenerator
+
+User = get_user_model()
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """
+    Lets generated rows keep their own values in ``auto_now`` / ``auto_now_add`` fields.
+    """
+    flags = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic dataset of companies, contact records and notes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--companies',
+            type=int,
+            required=True
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0
+        )
+        parser.add_argument(
+            '--contact-records',
+            type=float,
+            default=2.0,
+            help='Mean number of contact records per company'
+        )
+        parser.add_argument(
+            '--notes',
+            type=float,
+            default=0.5,
+            help='Mean number of notes per company'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.5,
+            help='Pareto shape of the records and notes per company, smaller is more skewed, 0 disables skew'
+        )
+        parser.add_argument(
+            '--years',
+            type=int,
+            default=5,
+            help='Companies are created within this many years before --reference-date'
+        )
+        parser.add_argument(
+            '--reference-date',
+            type=date.fromisoformat,
+            default=REFERENCE_DATE,
+            help=f'Day the generated history ends, YYYY-MM-DD. Defaults to {REFERENCE_DATE}, so a seed always gives the same dates'
+        )
+        parser.add_argument(
+            '--output',
+            required=False,
+            help='Write an .xlsx or .csv file in the import_companies format instead of writing to the database'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000
+        )
+
+    def handle(self, *args, **options):
+        generator = SyntheticCompanyGenerator(
+            options['companies'],
+            seed=options['seed'],
+            years=options['years'],
+            reference_date=options['reference_date'],
+        )
+        output = options['output']
+        if output:
+            suffix = Path(output).suffix.lower()
+            if suffix not in ('.xlsx', '.csv'):
+                raise CommandError('Output must be an .xlsx or .csv file')
+            self.write_file(generator, output, suffix, options)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {generator.count} companies to {output}'))
+            self.stdout.write(
+                'Import with: --title "Name" --type "Type" --canton "Kanton" --legal_seat "Legal Seat ID" '
+                '--legal_form "Legal Form ID" --liquidation "in Liquidation" --visited "Angerufen" '
+                '--phone "Telefon" --email "E-Mail" --website "Website"'
+            )
+            return
+
+        with transaction.atomic():
+            totals = self.write_database(generator, options)
+            bump_table_versions(Company, CompanyContactRecord, CompanyNote)
+        self.stdout.write(self.style.SUCCESS(
+            'Generated {companies} companies, {records} contact records and {notes} notes'.format(**totals)
+        ))
+
+    def write_database(self, generator: SyntheticCompanyGenerator, options) -> dict[str, int]:
+        batch_size = options['batch_size']
+        resolvers = {
+            attribute: ReferenceResolver(model)
+            for attribute, model in REFERENCE_MODELS.items()
+        }
+        users = list(User.objects.values_list('pk', flat=True))
+        totals = {'companies': 0, 'records': 0, 'notes': 0}
+        timestamp_fields = [
+            Company._meta.get_field('created_at'),
+            Company._meta.get_field('updated_at'),
+            CompanyContactRecord._meta.get_field('contacted_at'),
+            CompanyNote._meta.get_field('created_at'),
+            CompanyNote._meta.get_field('updated_at'),
+        ]
+        with explicit_timestamps(*timestamp_fields):
+            for chunk, frame in enumerate(generator.iter_companies()):
+                for attribute, resolver in resolvers.items():
+                    resolver.resolve(pd.unique(frame[attribute]))
+                companies = Company.objects.bulk_create(
+                    (
+                        Company(
+                            title=title,
+                            in_liquidation=in_liquidation,
+                            canton_id=resolvers['canton'].get_id(canton),
+                            type_id=resolvers['type'].get_id(company_type),
+                            legal_seat_id=resolvers['legal_seat'].get_id(legal_seat),
+                            legal_form_id=resolvers['legal_form'].get_id(legal_form),
+                            phone=phone,
+                            email=email,
+                            website=website,
+                            import_key=make_import_key(title, legal_seat, legal_form),
+                            created_at=created_at,
+                            updated_at=created_at,
+                        )
+                        for title, in_liquidation, canton, company_type, legal_seat, legal_form, phone, email, website, created_at in zip(
+                            *(frame[column].tolist() for column in [
+                                'title', 'in_liquidation', 'canton', 'type', 'legal_seat', 'legal_form',
+                                'phone', 'email', 'website', 'created_at',
+                            ]),
+                            strict=True,
+                        )
+                    ),
+                    batch_size=batch_size,
+                )
+                company_ids = [company.pk for company in companies]
+                if None in company_ids:
+                    raise CommandError('The database backend does not return primary keys from bulk inserts')
+                CompanyDailyCount.objects.add(count_days(frame['created_at']))
+                totals['companies'] += len(companies)
+
+                records = generator.contact_records(
+                    chunk, company_ids, frame['created_at'], options['contact_records'], options['skew'],
+                )
+                record_users = generator.rng(3, chunk).choice(users, len(records)).tolist() if users else [None] * len(records)
+                CompanyContactRecord.objects.bulk_create(
+                    (
+                        CompanyContactRecord(company_id=company_id, status=status, contacted_at=at, user_id=user_id)
+                        for company_id, status, at, user_id in zip(
+                            records['company_id'].tolist(), records['status'], records['at'], record_users, strict=True,
+                        )
+                    ),
+                    batch_size=batch_size,
+                )
+                # The generated history keeps the generated timestamps.
+                Company.objects.filter(pk__in=company_ids).refresh_contact_summary(touch=False)
+                totals['records'] += len(records)
+
+                notes = generator.notes(chunk, company_ids, frame['created_at'], options['notes'], options['skew'])
+                note_users = generator.rng(4, chunk).choice(users, len(notes)).tolist() if users else [None] * len(notes)
+                CompanyNote.objects.bulk_create(
+                    (
+                        CompanyNote(company_id=company_id, note=note, created_at=at, updated_at=at, user_id=user_id)
+                        for company_id, note, at, user_id in zip(
+                            notes['company_id'].tolist(), notes['note'], notes['at'], note_users, strict=True,
+                        )
+                    ),
+                    batch_size=batch_size,
+                )
+                totals['notes'] += len(notes)
+                self.stdout.write(f'{totals["companies"]}/{generator.count} companies')
+        return totals
+
+    def write_file(self, generator: SyntheticCompanyGenerator, output: str, suffix: str, options):
+        frames = self._iter_import_frames(generator, options)
+        if suffix == '.csv':
+            for chunk, frame in enumerate(frames):
+                frame.to_csv(output, mode='w' if chunk == 0 else 'a', header=chunk == 0, index=False)
+            return
+
+        workbook = Workbook(write_only=True)
+        sheets = {}
+        for frame in frames:
+            for canton, rows in frame.groupby(IMPORT_HEADERS['canton'], sort=False):
+                sheet, written = sheets.get(canton, (None, XLSX_MAX_ROWS))
+                for values in rows.itertuples(index=False, name=None):
+                    if written >= XLSX_MAX_ROWS:
+                        title = canton if sheet is None else f'{canton} ({len(workbook.worksheets) + 1})'
+                        sheet = workbook.create_sheet(title)
+                        sheet.append(list(rows.columns))
+                        written = 1
+                    sheet.append(list(values))
+                    written += 1
+                sheets[canton] = (sheet, written)
+        workbook.save(output)
+
+    @staticmethod
+    def _iter_import_frames(generator: SyntheticCompanyGenerator, options):
+        for chunk, frame in enumerate(generator.iter_companies()):
+            frame['visited'] = generator.contact_counts(chunk, len(frame), options['contact_records'], options['skew']) > 0
+            for column in ('visited', 'in_liquidation'):
+                frame[column] = np.where(frame[column], 'Ja', '')
+            yield frame[list(IMPORT_HEADERS)].rename(columns=IMPORT_HEADERS)
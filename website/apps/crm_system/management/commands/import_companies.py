@@ -1,20 +1,38 @@
+import hashlib
+import os
+from collections import Counter
+from contextlib import nullcontext
+
 import pandas as pd
 from django.core.management import BaseCommand, CommandError
 from django.db import transaction
 
-from apps.crm_system.models import (
-    Canton,
-    Company,
-    CompanyContactRecord,
-    CompanyType,
-    LegalForm,
-    LegalSeat,
-)
+from apps.crm_system.models import Company, CompanyDailyCount, CompanyImportRun
+from apps.crm_system.services.company_frame_mapper import MissingColumnError
+from apps.crm_system.services.company_import_service import DEFAULT_BATCH_SIZE, CompanyImportService
+from apps.crm_system.services.company_import_validator import REPORT_COLUMNS, CompanyImportValidator, ReportLevel
+from apps.crm_system.services.company_loaders import ImportMode, LoaderBackend
+from apps.crm_system.services.import_progress import ImportProgress
 
 
 class Command(BaseCommand):
     help = "Import companies"
 
+    COLUMN_OPTIONS = [
+        'title',
+        'type',
+        'description',
+        'liquidation',
+        'canton',
+        'legal_seat',
+        'legal_form',
+        'visited',
+        'phone',
+        'email',
+        'website',
+        'key',
+    ]
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--file',
@@ -56,65 +74,236 @@ class Command(BaseCommand):
             '--visited',
             required=False
         )
+        parser.add_argument(
+            '--phone',
+            required=False
+        )
+        parser.add_argument(
+            '--email',
+            required=False
+        )
+        parser.add_argument(
+            '--website',
+            required=False
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of companies written to the database per INSERT'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes parsing sheets in parallel'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            action='store_true',
+            help='Commit every batch and record the last completed row, so the import can be resumed'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue the last interrupted checkpointed import of the same file. '
+                 'Column options, status and mode must be the same as in the interrupted run'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only validate the file and report bad rows, nothing is written to the database'
+        )
+        parser.add_argument(
+            '--report',
+            required=False,
+            help='Path of the --dry-run report, ".json" writes JSON, anything else CSV. Defaults to CSV on stdout'
+        )
+        parser.add_argument(
+            '--progress-interval',
+            type=float,
+            default=5.0,
+            help='Seconds between progress reports'
+        )
+        parser.add_argument(
+            '--mode',
+            choices=ImportMode.values,
+            default=ImportMode.REPLACE,
+            help='"replace" deletes all companies before loading, "upsert" only inserts new and updates changed companies'
+        )
+        parser.add_argument(
+            '--loader',
+            choices=LoaderBackend.values,
+            default=LoaderBackend.AUTO,
+            help='"copy" streams rows through PostgreSQL COPY, "orm" uses batched INSERTs, '
+                 '"auto" picks COPY when available'
+        )
+        parser.add_argument(
+            '--key',
+            required=False,
+            help='Column with a stable registry identifier used to match companies in upsert mode. '
+                 'Defaults to title, legal seat and legal form'
+        )
+        parser.add_argument(
+            '--flag-missing',
+            action='store_true',
+            help='In upsert mode, mark companies that are not present in the file as delisted'
+        )
 
     def handle(self, *args, **options):
         file_path = options['file']
-        visited_option = options.get('visited')
-        companies = []
-        CompanyContactRecord.objects.all().delete()
-        Company.objects.all().delete()
+        if not os.path.exists(file_path):
+            raise CommandError('File not found')
+        if options['dry_run']:
+            return self.validate(file_path, options)
+
+        if options['flag_missing'] and (options['checkpoint'] or options['resume']):
+            raise CommandError('--flag-missing needs the whole file in one transaction and can\'t be checkpointed')
+        if options['flag_missing'] and options['mode'] != ImportMode.UPSERT:
+            raise CommandError('--flag-missing can only be used with --mode=upsert')
+
+        # Options a resumed run has to be started with again, the rows already
+        # imported were mapped with them.
+        import_options = {
+            **{attribute: options[attribute] for attribute in self.COLUMN_OPTIONS},
+            'status': options['status'] or '',
+            'mode': options['mode'],
+        }
+
+        # The run is only saved once the options are known to be usable, so a
+        # rejected invocation leaves nothing behind for --resume to pick up.
+        run = None
+        start = None
+        if options['resume']:
+            run = self._get_resumable_run(file_path)
+            changed = [
+                key for key, value in import_options.items()
+                if run.stats.get('options', {}).get(key) != value
+            ]
+            if changed:
+                raise CommandError(
+                    'Options differ from the interrupted import: '
+                    + ', '.join(f'--{key}' for key in changed)
+                )
+            start = (run.last_sheet, run.last_row) if run.last_sheet else None
+        elif options['checkpoint']:
+            run = CompanyImportRun(
+                file_name=os.path.basename(file_path),
+                file_size=os.path.getsize(file_path),
+                file_hash=self._file_hash(file_path),
+                mode=options['mode'],
+                stats={'options': import_options},
+            )
+
+        progress = ImportProgress(
+            write=self.stdout.write,
+            interval=options['progress_interval'],
+            initial_rows=run.rows_imported if run else 0,
+        )
         try:
-            df = pd.read_excel(file_path, sheet_name=None)
-        except FileNotFoundError as e:
-            raise CommandError('File not found') from e
-
-        if not len(df):
-            raise CommandError('Provided file is empty')
-
-        with transaction.atomic():
-            self.stdout.write(self.style.SUCCESS('Reading file...'))
-            for sheet in df.keys():
-                df[sheet].fillna('', inplace=True)
-                for _, row in df[sheet].iterrows():
-                    title = row[options['title']]
-                    description = row.get(options['description'], '')
-                    in_liquidation = bool(row.get(options['liquidation'], False))
-                    canton_name = row[options['canton']]
-                    company_type_name = row[options['type']]
-                    legal_seat_name = row[options['legal_seat']]
-                    legal_form_name = row[options['legal_form']]
-
-                    canton, _ = Canton.objects.get_or_create(
-                        name=canton_name,
-                    )
-                    company_type, _ = CompanyType.objects.get_or_create(
-                        name=company_type_name,
-                    )
-                    legal_seat, _ = LegalSeat.objects.get_or_create(
-                        name=legal_seat_name,
-                    )
-                    legal_form, _ = LegalForm.objects.get_or_create(
-                        name=legal_form_name
-                    )
-                    company = Company(
-                        title=title,
-                        type=company_type,
-                        description=description,
-                        in_liquidation=in_liquidation,
-                        canton=canton,
-                        legal_seat=legal_seat,
-                        legal_form=legal_form,
-                    )
-                    if visited_option and bool(row[visited_option]):
-                        company.save()
-                        status = options['status'] or ''
-                        CompanyContactRecord.objects.create(
-                            company_id=company.pk,
-                            status=status
-                        )
-                        continue
-                    companies.append(company)
-
-            self.stdout.write(self.style.SUCCESS('Loading data into database...'))
-            Company.objects.bulk_create(companies)
-            self.stdout.write(self.style.SUCCESS('Successfully imported companies'))
+            service = CompanyImportService(
+                columns={
+                    attribute: options[attribute]
+                    for attribute in self.COLUMN_OPTIONS
+                },
+                status=options['status'] or '',
+                batch_size=options['batch_size'],
+                mode=options['mode'],
+                loader=options['loader'],
+                progress=progress,
+                run=run,
+            )
+            # Checkpointed replace imports delete the companies in their own
+            # transaction, an empty file or a misspelt column must fail first.
+            if not options['resume'] and not service.check_file(file_path):
+                raise CommandError('Provided file is empty')
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        # Checkpointed runs commit every chunk on their own.
+        with transaction.atomic() if run is None else nullcontext():
+            if run is not None:
+                run.status = CompanyImportRun.Status.RUNNING
+                run.save()
+            if options['mode'] == ImportMode.REPLACE and not options['resume']:
+                # Replaced companies get new ids, the tombstones tell feed
+                # clients to drop the old ones.
+                Company.objects.all().delete_with_tombstones()
+                CompanyDailyCount.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS('Streaming file into database...'))
+            try:
+                imported = service.import_file(file_path, workers=options['workers'], start=start)
+                if not imported and start is None:
+                    raise CommandError('Provided file is empty')
+                if options['flag_missing']:
+                    service.flag_missing()
+            except MissingColumnError as e:
+                service.complete_run(CompanyImportRun.Status.FAILED)
+                raise CommandError(str(e)) from e
+            except Exception:
+                service.complete_run(CompanyImportRun.Status.FAILED)
+                raise
+            service.complete_run()
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully imported {imported} companies'))
+        for key, value in sorted(service.stats.items()):
+            self.stdout.write(f'  {key}: {value}')
+        for line in progress.summary():
+            self.stdout.write(line)
+
+    def validate(self, file_path, options):
+        validator = CompanyImportValidator(
+            columns={
+                attribute: options[attribute]
+                for attribute in self.COLUMN_OPTIONS
+            },
+            known_references=CompanyImportValidator.load_known_references(),
+        )
+        reports = validator.validate_file(file_path, options['batch_size'])
+        report_path = options['report']
+        counts = Counter()
+        if report_path and report_path.endswith('.json'):
+            reports = list(reports)
+            report = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=REPORT_COLUMNS)
+            report.to_json(report_path, orient='records', force_ascii=False, indent=1)
+            counts.update(zip(report['level'], report['error'], strict=True))
+        else:
+            output = open(report_path, 'w', newline='') if report_path else self.stdout
+            try:
+                pd.DataFrame(columns=REPORT_COLUMNS).to_csv(output, index=False)
+                for report in reports:
+                    report.to_csv(output, header=False, index=False)
+                    counts.update(zip(report['level'], report['error'], strict=True))
+            finally:
+                if report_path:
+                    output.close()
+
+        # The CSV report may be on stdout, keep the summary out of it.
+        summary = self.stderr if not report_path else self.stdout
+        for (level, error), count in sorted(counts.items()):
+            summary.write(f'  {level} {error}: {count}')
+        errors = sum(count for (level, _), count in counts.items() if level == ReportLevel.ERROR)
+        if errors:
+            raise CommandError(f'Validation found {errors} errors')
+        summary.write(self.style.SUCCESS('File is valid'))
+
+    @staticmethod
+    def _file_hash(file_path) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            while block := file.read(1024 * 1024):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def _get_resumable_run(cls, file_path) -> CompanyImportRun:
+        runs = CompanyImportRun.objects.filter(
+            file_name=os.path.basename(file_path),
+            status__in=[CompanyImportRun.Status.RUNNING, CompanyImportRun.Status.FAILED],
+        )
+        run = runs.filter(file_size=os.path.getsize(file_path), file_hash=cls._file_hash(file_path)).first()
+        if run is None:
+            if runs.exists():
+                raise CommandError('The file changed since the interrupted import, start a new import instead')
+            raise CommandError('No interrupted import of this file to resume')
+        return run
@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from apps.crm_system.models import CompanyDailyCount
+
+
+class Command(BaseCommand):
+    help = "Recount the companies created per day that the company admin's date hierarchy reads"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            days = CompanyDailyCount.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Counted companies of {days} days'))
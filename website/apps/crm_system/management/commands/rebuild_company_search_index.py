@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+
+from apps.crm_system.services.company_search import get_company_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the company search index from the company table, recreating missing sync triggers"
+
+    def handle(self, *args, **options):
+        backend = get_company_search_backend()
+        for name in backend.rebuild():
+            self.stdout.write(self.style.WARNING(f'Recreated missing {name}'))
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the search index of {type(backend).__name__}'))
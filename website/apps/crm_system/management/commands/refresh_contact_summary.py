@@ -0,0 +1,35 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from apps.crm_system.models import Company
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored last contact status, last contact date and contact records count of companies"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of company ids updated per transaction'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        bounds = Company.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('No companies')
+            return
+
+        updated = 0
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            with transaction.atomic():
+                updated += (
+                    Company.objects
+                    .filter(pk__gte=start, pk__lt=start + batch_size)
+                    .refresh_contact_summary()
+                )
+            self.stdout.write(f'{updated} companies corrected')
+        self.stdout.write(self.style.SUCCESS(f'Corrected the contact summary of {updated} companies'))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-18 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0003_alter_company_created_at_alter_company_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='delisted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Missing from registry since'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='import_key',
+            field=models.CharField(blank=True, editable=False, max_length=40, verbose_name='Import key'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['import_key'], name='crm_system__import__a6857d_idx'),
+        ),
+    ]
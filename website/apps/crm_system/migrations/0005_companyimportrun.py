@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-18 06:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0004_company_import_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('file_name', models.CharField(max_length=255, verbose_name='File name')),
+                ('file_size', models.PositiveBigIntegerField(verbose_name='File size')),
+                ('mode', models.CharField(max_length=20, verbose_name='Mode')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20, verbose_name='Status')),
+                ('last_sheet', models.CharField(blank=True, max_length=255, verbose_name='Last completed sheet')),
+                ('last_row', models.PositiveIntegerField(default=0, verbose_name='Last completed row')),
+                ('rows_imported', models.PositiveIntegerField(default=0, verbose_name='Imported rows')),
+                ('stats', models.JSONField(blank=True, default=dict, verbose_name='Statistics')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished')),
+            ],
+            options={
+                'verbose_name': 'Company import run',
+                'verbose_name_plural': 'Company import runs',
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['-created_at'], name='crm_system__created_23b615_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.23 on 2026-10-18 06:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_contact_summary(apps, schema_editor):
+    Company = apps.get_model('crm_system', 'Company')
+    CompanyContactRecord = apps.get_model('crm_system', 'CompanyContactRecord')
+    records = CompanyContactRecord.objects.filter(company=OuterRef('pk'))
+    latest = records.order_by('-contacted_at', '-pk')
+    records_count = records.order_by().values('company').annotate(amount=Count('pk')).values('amount')
+    Company.objects.filter(pk__in=CompanyContactRecord.objects.values('company')).update(
+        last_contact_status=Coalesce(Subquery(latest.values('status')[:1]), Value('')),
+        last_contacted_at=Subquery(latest.values('contacted_at')[:1]),
+        contact_records_count=Coalesce(Subquery(records_count), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0005_companyimportrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='contact_records_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Contact records'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='last_contact_status',
+            field=models.CharField(blank=True, choices=[('decline', 'Decline'), ('agreed', 'Agreed'), ('repeat', 'Repeat')], editable=False, max_length=20, verbose_name='Last contact status'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='last_contacted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Last contacted'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['last_contact_status'], name='crm_system__last_co_78b5ba_idx'),
+        ),
+        migrations.RunPython(fill_contact_summary, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-18 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0006_company_contact_summary'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='company',
+            name='crm_system__last_co_78b5ba_idx',
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['last_contact_status', '-created_at'], name='crm_system__last_co_7aade5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['canton', 'legal_form', '-created_at'], name='crm_system__canton__a5be84_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['legal_form', '-created_at'], name='crm_system__legal_f_8a5499_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(condition=models.Q(('in_liquidation', True)), fields=['-created_at'], name='company_in_liquidation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companycontactrecord',
+            index=models.Index(fields=['company', '-contacted_at'], name='crm_system__company_27848c_idx'),
+        ),
+    ]
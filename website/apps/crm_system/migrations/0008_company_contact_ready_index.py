@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0007_company_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(condition=models.Q(('contact_records_count', 0), models.Q(models.Q(('phone', ''), _negated=True), models.Q(('email', ''), _negated=True), _connector='OR')), fields=['-created_at'], name='company_contact_ready_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+from django.db import migrations
+
+SQLITE_SEARCH_TABLE = 'crm_system_company_search'
+
+# The triggers are raw SQL that Django's schema editor does not know about.
+# A later migration that makes Django rebuild crm_system_company on SQLite
+# (most field alterations do) drops them silently and the index goes stale.
+# Run rebuild_company_search_index after such a migration, it recreates
+# missing triggers from this dict, see services.company_search.
+SQLITE_TRIGGERS = {
+    f"{SQLITE_SEARCH_TABLE}_insert": (
+        f"CREATE TRIGGER {SQLITE_SEARCH_TABLE}_insert AFTER INSERT ON crm_system_company BEGIN "
+        f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        f"END"
+    ),
+    f"{SQLITE_SEARCH_TABLE}_delete": (
+        f"CREATE TRIGGER {SQLITE_SEARCH_TABLE}_delete AFTER DELETE ON crm_system_company BEGIN "
+        f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, title, description) "
+        f"VALUES ('delete', old.id, old.title, old.description); "
+        f"END"
+    ),
+    f"{SQLITE_SEARCH_TABLE}_update": (
+        f"CREATE TRIGGER {SQLITE_SEARCH_TABLE}_update AFTER UPDATE OF title, description ON crm_system_company BEGIN "
+        f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, title, description) "
+        f"VALUES ('delete', old.id, old.title, old.description); "
+        f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        f"END"
+    ),
+}
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {SQLITE_SEARCH_TABLE} USING fts5("
+    f"title, description, content='crm_system_company', content_rowid='id', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    *SQLITE_TRIGGERS.values(),
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    f'DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_update',
+    f'DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}',
+]
+
+
+def postgres_indexes():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Must match services.company_search.search_vector().
+    document = (
+        SearchVector('title', weight='A', config='simple')
+        + SearchVector('description', weight='B', config='simple')
+    )
+    return [
+        GinIndex(document, name='company_search_document_idx'),
+        GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='company_title_trgm_idx'),
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        Company = apps.get_model('crm_system', 'Company')
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for index in postgres_indexes():
+            schema_editor.add_index(Company, index)
+    elif vendor == 'sqlite':
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        Company = apps.get_model('crm_system', 'Company')
+        for index in postgres_indexes():
+            schema_editor.remove_index(Company, index)
+    elif vendor == 'sqlite':
+        for statement in SQLITE_BACKWARD:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0008_company_contact_ready_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.23 on 2026-10-18 06:53
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_counts(apps, schema_editor):
+    Company = apps.get_model('crm_system', 'Company')
+    CompanyDailyCount = apps.get_model('crm_system', 'CompanyDailyCount')
+    days = (
+        Company.objects
+        .order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values_list('day')
+        .annotate(amount=Count('pk'))
+        .values_list('day', 'amount')
+    )
+    CompanyDailyCount.objects.bulk_create(CompanyDailyCount(day=day, companies=amount) for day, amount in days)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0009_company_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True, verbose_name='Day')),
+                ('companies', models.PositiveIntegerField(default=0, verbose_name='Companies')),
+            ],
+            options={
+                'verbose_name': 'Company daily count',
+                'verbose_name_plural': 'Company daily counts',
+                'ordering': ['day'],
+            },
+        ),
+        migrations.RunPython(fill_daily_counts, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0010_companydailycount'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companynote',
+            index=models.Index(fields=['company', '-created_at'], name='crm_system__company_0a32c2_idx'),
+        ),
+    ]
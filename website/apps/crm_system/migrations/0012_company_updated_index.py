@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0011_companynote_company_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['updated_at', 'id'], name='crm_system__updated_c2fbb0_idx'),
+        ),
+    ]
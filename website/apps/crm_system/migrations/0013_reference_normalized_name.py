@@ -0,0 +1,95 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:16
+
+import unicodedata
+from collections import defaultdict
+
+from django.db import migrations, models
+
+REFERENCE_MODELS = ['Canton', 'CompanyType', 'LegalForm', 'LegalSeat']
+
+
+def normalize_name(name) -> str:
+    return unicodedata.normalize('NFKC', str(name)).casefold()
+
+
+def fill_normalized_names(apps, schema_editor):
+    # Names that only differ in non-ASCII case passed LOWER() on SQLite, their
+    # rows are merged into the oldest one before the constraint is added.
+    for model_name in REFERENCE_MODELS:
+        model = apps.get_model('crm_system', model_name)
+        rows = defaultdict(list)
+        for pk, name in model.objects.order_by('pk').values_list('pk', 'name').iterator():
+            rows[normalize_name(name)].append(pk)
+        for normalized_name, (pk, *duplicates) in rows.items():
+            if duplicates:
+                for relation in model._meta.related_objects:
+                    relation.related_model.objects.filter(**{f'{relation.field.name}__in': duplicates}).update(**{relation.field.name: pk})
+                model.objects.filter(pk__in=duplicates).delete()
+            model.objects.filter(pk=pk).update(normalized_name=normalized_name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0012_company_updated_index'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='canton',
+            name='unique_name_canton',
+        ),
+        migrations.RemoveConstraint(
+            model_name='companytype',
+            name='unique_name_companytype',
+        ),
+        migrations.RemoveConstraint(
+            model_name='legalform',
+            name='unique_name_legalform',
+        ),
+        migrations.RemoveConstraint(
+            model_name='legalseat',
+            name='unique_name_legalseat',
+        ),
+        migrations.AddField(
+            model_name='canton',
+            name='normalized_name',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='Normalized name'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='companytype',
+            name='normalized_name',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='Normalized name'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='legalform',
+            name='normalized_name',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='Normalized name'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='legalseat',
+            name='normalized_name',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='Normalized name'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='canton',
+            constraint=models.UniqueConstraint(models.F('normalized_name'), name='unique_name_canton', violation_error_message='Record with this name already exists'),
+        ),
+        migrations.AddConstraint(
+            model_name='companytype',
+            constraint=models.UniqueConstraint(models.F('normalized_name'), name='unique_name_companytype', violation_error_message='Record with this name already exists'),
+        ),
+        migrations.AddConstraint(
+            model_name='legalform',
+            constraint=models.UniqueConstraint(models.F('normalized_name'), name='unique_name_legalform', violation_error_message='Record with this name already exists'),
+        ),
+        migrations.AddConstraint(
+            model_name='legalseat',
+            constraint=models.UniqueConstraint(models.F('normalized_name'), name='unique_name_legalseat', violation_error_message='Record with this name already exists'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:40
+
+import hashlib
+import unicodedata
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+KEY_SEPARATOR = '\x1f'
+
+
+def make_import_key(*parts) -> str:
+    # Frozen copy of services.import_keys.make_import_key.
+    joined = KEY_SEPARATOR.join(unicodedata.normalize('NFKC', str(part).strip()).casefold() for part in parts)
+    return hashlib.sha1(joined.encode()).hexdigest()
+
+
+def fill_import_keys(apps, schema_editor):
+    # Companies from before 0004, or created in the admin since, have no key.
+    # Without one the first upsert import would insert them again.
+    Company = apps.get_model('crm_system', 'Company')
+    rows = Company.objects.filter(import_key='').order_by('pk').values_list('pk', 'title', 'legal_seat__name', 'legal_form__name')
+    last_pk = 0
+    # Batches are read by pk, not with a cursor over the rows being updated.
+    while batch := list(rows.filter(pk__gt=last_pk)[:BATCH_SIZE]):
+        last_pk = batch[-1][0]
+        Company.objects.bulk_update(
+            [Company(pk=pk, import_key=make_import_key(title, legal_seat, legal_form)) for pk, title, legal_seat, legal_form in batch],
+            ['import_key'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0013_reference_normalized_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_import_keys, migrations.RunPython.noop, elidable=True),
+    ]
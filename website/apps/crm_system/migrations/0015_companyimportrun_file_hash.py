@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0014_fill_company_import_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companyimportrun',
+            name='file_hash',
+            field=models.CharField(blank=True, max_length=64, verbose_name='File SHA-256'),
+        ),
+    ]
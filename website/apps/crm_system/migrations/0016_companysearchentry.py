@@ -0,0 +1,44 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:22
+
+import apps.crm_system.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+SQLITE_SEARCH_TABLE = 'crm_system_company_search'
+
+
+def configure_rank(apps, schema_editor):
+    # The rank column is bm25 with titles weighing more than descriptions,
+    # the weights are stored in the FTS5 table.
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+
+
+def reset_rank(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rank) VALUES ('rank', 'bm25()')")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0015_companyimportrun_file_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanySearchEntry',
+            fields=[
+                ('company', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='crm_system.company')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('document', apps.crm_system.models.SearchDocumentField(db_column='crm_system_company_search')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'crm_system_company_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(configure_rank, reset_rank),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:28
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0016_companysearchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company_id', models.BigIntegerField(verbose_name='Company ID')),
+                ('import_key', models.CharField(blank=True, max_length=40, verbose_name='Import key')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Deleted')),
+            ],
+            options={
+                'verbose_name': 'Company deletion',
+                'verbose_name_plural': 'Company deletions',
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='crm_system__deleted_b9a144_idx')],
+            },
+        ),
+    ]
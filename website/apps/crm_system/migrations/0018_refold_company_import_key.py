@@ -0,0 +1,48 @@
+import hashlib
+import unicodedata
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+KEY_SEPARATOR = '\x1f'
+
+
+def make_lowered_import_key(*parts) -> str:
+    # Keys as 0014 and imports before this migration made them.
+    joined = KEY_SEPARATOR.join(str(part).strip().lower() for part in parts)
+    return hashlib.sha1(joined.encode()).hexdigest()
+
+
+def make_import_key(*parts) -> str:
+    # Frozen copy of services.import_keys.make_import_key.
+    joined = KEY_SEPARATOR.join(unicodedata.normalize('NFKC', str(part).strip()).casefold() for part in parts)
+    return hashlib.sha1(joined.encode()).hexdigest()
+
+
+def refold_import_keys(apps, schema_editor):
+    # Keys are now folded like reference names, "Straße" and "STRASSE" match.
+    # Only keys made from the title, legal seat and legal form are rehashed,
+    # keys of a registry column can't be told from their hash.
+    Company = apps.get_model('crm_system', 'Company')
+    rows = Company.objects.order_by('pk').values_list('pk', 'import_key', 'title', 'legal_seat__name', 'legal_form__name')
+    last_pk = 0
+    while batch := list(rows.filter(pk__gt=last_pk)[:BATCH_SIZE]):
+        last_pk = batch[-1][0]
+        changed = []
+        for pk, import_key, *parts in batch:
+            new_key = make_import_key(*parts)
+            if import_key != new_key and import_key == make_lowered_import_key(*parts):
+                changed.append(Company(pk=pk, import_key=new_key))
+        Company.objects.bulk_update(changed, ['import_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm_system', '0017_companydeletion'),
+    ]
+
+    operations = [
+        migrations.RunPython(refold_import_keys, migrations.RunPython.noop, elidable=True),
+    ]
@@ -1,10 +1,20 @@
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime
+
 from django.conf import settings
-from django.db import models
-from django.db.models import BooleanField, Case, Count, OuterRef, Q, Subquery, Value, When
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import BooleanField, Count, Exists, ExpressionWrapper, F, Lookup, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, TruncDate
 from django.db.models.manager import BaseManager
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models import DescriptiveModel, TimestampModel, UniqueNamedModel
+from apps.core.paginators import KeysetPaginator
+from apps.core.query_cache import CachedQuerySetMixin, QueryCache
+from apps.core.table_versions import bump_table_versions
+from apps.crm_system.services.import_keys import make_import_key
 
 __all__ = [
     'Canton',
@@ -14,6 +24,10 @@ __all__ = [
     'CompanyContactRecord',
     'CompanyNote',
     'CompanyType',
+    'CompanyImportRun',
+    'CompanyDailyCount',
+    'CompanySearchEntry',
+    'CompanyDeletion',
 ]
 
 
@@ -37,48 +51,141 @@ class LegalForm(UniqueNamedModel):
         verbose_name_plural = _('Legal forms')
 
 
-class CompanyQuerySet(models.QuerySet):
+HAS_CONTACT_DATA = ~Q(phone='') | ~Q(email='')
+
+# Never contacted, but there is a way to get in touch.
+CONTACT_READY = Q(contact_records_count=0) & HAS_CONTACT_DATA
+
+
+class ContactStatus(models.TextChoices):
+    DECLINE = 'decline', _('Decline')
+    AGREED = 'agreed', _('Agreed')
+    REPEAT = 'repeat', _('Repeat')
+
+
+class CompanyQuerySet(CachedQuerySetMixin, models.QuerySet):
+    def get_query_cache(self) -> QueryCache:
+        # Company pages show the contact summary, the contact records, notes
+        # and the names of the referenced rows, which filters and search use.
+        return QueryCache([Company, CompanyContactRecord, CompanyNote, *COMPANY_REFERENCE_MODELS])
+
     def annotate_last_contact_status(self):
-        last_status_sq = (CompanyContactRecord.objects
-                          .filter(company=OuterRef('pk'))
-                          .order_by('-contacted_at')
-                          .values('status')
-                          )[:1]
         return (
             self
-            .annotate(last_status=Subquery(last_status_sq))
+            .annotate(last_status=F('last_contact_status'))
         )
 
     def filter_last_contact_status(self, status: str):
         return (
             self
-            .annotate_last_contact_status()
-            .filter(last_status=status)
+            .filter(last_contact_status=status)
         )
 
+    def refresh_contact_summary(self, touch: bool = True) -> int:
+        """
+        Recomputes the stored last contact status, last contact date and
+        contact records count of the companies in this queryset from their
+        contact records. Call it after creating or deleting contact records.
+
+        Only companies whose summary changed are written, ``touch`` sets
+        their ``updated_at``, so incremental syncs pick them up again.
+        Returns the number of changed companies.
+        """
+        records = CompanyContactRecord.objects.filter(company=OuterRef('pk'))
+        latest = records.order_by('-contacted_at', '-pk')
+        records_count = records.order_by().values('company').annotate(amount=Count('pk')).values('amount')
+        summary = {
+            'last_contact_status': Coalesce(Subquery(latest.values('status')[:1]), Value('')),
+            'last_contacted_at': Subquery(latest.values('contacted_at')[:1]),
+            'contact_records_count': Coalesce(Subquery(records_count), Value(0)),
+        }
+        changed = (
+            Q(last_contacted_at__isnull=True, current_contacted_at__isnull=False)
+            | Q(last_contacted_at__isnull=False, current_contacted_at__isnull=True)
+            | Q(last_contacted_at__lt=F('current_contacted_at'))
+            | Q(last_contacted_at__gt=F('current_contacted_at'))
+            | ~Q(last_contact_status=F('current_status'))
+            | ~Q(contact_records_count=F('current_records_count'))
+        )
+        touched = {'updated_at': timezone.now()} if touch else {}
+        updated = (
+            self
+            .order_by()
+            .alias(
+                current_status=summary['last_contact_status'],
+                current_contacted_at=summary['last_contacted_at'],
+                current_records_count=summary['contact_records_count'],
+            )
+            .filter(changed)
+            .update(**summary, **touched)
+        )
+        bump_table_versions(Company, CompanyContactRecord)
+        return updated
+
+    def delete_with_tombstones(self) -> int:
+        """
+        Deletes the companies of this queryset with their contact records and
+        notes, leaving a ``CompanyDeletion`` per company for the feed.
+
+        Unlike ``delete()`` rows are not loaded and no delete signals are
+        sent, each table takes one statement. Returns the number of deleted
+        companies.
+        """
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        company_table = quote(Company._meta.db_table)
+        company_ids, params = self.order_by().values('pk').query.sql_with_params()
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {quote(CompanyDeletion._meta.db_table)} (company_id, import_key, deleted_at) '
+                f'SELECT id, import_key, %s FROM {company_table} WHERE id IN ({company_ids})',
+                [timezone.now(), *params],
+            )
+            for model in [CompanyContactRecord, CompanyNote]:
+                cursor.execute(f'DELETE FROM {quote(model._meta.db_table)} WHERE company_id IN ({company_ids})', params)
+            cursor.execute(f'DELETE FROM {company_table} WHERE id IN ({company_ids})', params)
+            deleted = cursor.rowcount
+        bump_table_versions(Company, CompanyContactRecord, CompanyNote)
+        return deleted
+
     def annotate_contact_ready_status(self):
-        query = Q(contact_records_amount=0) & (~Q(phone='') | ~Q(email=''))
+        records = CompanyContactRecord.objects.filter(company=OuterRef('pk'))
         return (
             self
-            .annotate(
-                contact_records_amount=Count('contact_records'),
-                contact_ready=Case(
-                    When(
-                        condition=query,
-                        then=Value(True),
-                    ),
-                    output_field=BooleanField(),
-                    default=Value(False),
-                ))
+            .annotate(contact_ready=ExpressionWrapper(
+                ~Exists(records) & HAS_CONTACT_DATA,
+                output_field=BooleanField(),
+            ))
         )
 
     def filter_contact_ready_status(self, status: bool):
+        # Reads the stored records count, the partial index on CONTACT_READY
+        # serves the filter without touching the contact records.
         return (
             self
-            .annotate_contact_ready_status()
-            .filter(contact_ready=status)
+            .filter(CONTACT_READY if status else ~CONTACT_READY)
         )
 
+    def daily_counts(self) -> dict[date, int]:
+        """
+        Number of companies per local creation day.
+        """
+        return dict(
+            self
+            .order_by()
+            .annotate(day=TruncDate('created_at'))
+            .values_list('day')
+            .annotate(amount=Count('pk'))
+            .values_list('day', 'amount')
+        )
+
+    def keyset_paginator(self, per_page: int) -> KeysetPaginator:
+        """
+        Pages in changelist order (newest first) with cursors on
+        ``(created_at, id)``, served by the ``-created_at`` index.
+        """
+        return KeysetPaginator(self, per_page, ordering=['-created_at', '-pk'])
+
 
 class CompanyManager(BaseManager.from_queryset(CompanyQuerySet)):
     pass
@@ -90,6 +197,10 @@ class CompanyType(UniqueNamedModel):
         verbose_name_plural = _('Company types')
 
 
+# Tables whose names company pages, filters and search show.
+COMPANY_REFERENCE_MODELS = (CompanyType, Canton, LegalSeat, LegalForm)
+
+
 class Company(DescriptiveModel, TimestampModel):
     in_liquidation = models.BooleanField(default=False, blank=True, verbose_name=_('Liquidation'))
     type = models.ForeignKey(CompanyType, on_delete=models.PROTECT, verbose_name=_('Type'))
@@ -114,6 +225,17 @@ class Company(DescriptiveModel, TimestampModel):
         related_name='companies',
         verbose_name=_('Canton')
     )
+    import_key = models.CharField(max_length=40, blank=True, editable=False, verbose_name=_('Import key'))
+    delisted_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Missing from registry since'))
+    last_contact_status = models.CharField(
+        choices=ContactStatus.choices,
+        max_length=20,
+        blank=True,
+        editable=False,
+        verbose_name=_('Last contact status')
+    )
+    last_contacted_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_('Last contacted'))
+    contact_records_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Contact records'))
 
     objects = CompanyManager()
 
@@ -124,8 +246,70 @@ class Company(DescriptiveModel, TimestampModel):
         indexes = [
             models.Index(fields=['title']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['import_key']),
+            models.Index(fields=['last_contact_status', '-created_at']),
+            models.Index(fields=['canton', 'legal_form', '-created_at']),
+            models.Index(fields=['legal_form', '-created_at']),
+            models.Index(fields=['-created_at'], condition=Q(in_liquidation=True), name='company_in_liquidation_idx'),
+            models.Index(fields=['-created_at'], condition=CONTACT_READY, name='company_contact_ready_idx'),
+            models.Index(fields=['updated_at', 'id']),
         ]
 
+    def save(self, *args, **kwargs):
+        # Companies created by hand get the key an imported row would have,
+        # so a later upsert updates them instead of adding a duplicate.
+        if not self.import_key:
+            self.import_key = make_import_key(self.title, self.legal_seat.name, self.legal_form.name)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'import_key'}
+        super().save(*args, **kwargs)
+
+
+class SearchDocumentField(models.TextField):
+    """
+    The hidden column of an FTS5 table that is named after the table and
+    matches queries against all columns.
+    """
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class CompanySearchEntry(models.Model):
+    """
+    Row of the FTS5 table the SQLite migration creates, so search matches and
+    their ``rank`` can be joined to companies. The table does not exist on
+    other databases.
+    """
+
+    company = models.OneToOneField(
+        Company,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_entry',
+    )
+    title = models.TextField()
+    description = models.TextField()
+    document = SearchDocumentField(db_column='crm_system_company_search')
+    # bm25 with the weights configured on the table, lower is more relevant.
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'crm_system_company_search'
+
+    def __str__(self):
+        return self.title
+
 
 class CompanyNote(TimestampModel):
     note = models.TextField(verbose_name=_('Note'))
@@ -148,6 +332,7 @@ class CompanyNote(TimestampModel):
         ordering = ['created_at']
         indexes = [
             models.Index(fields=['created_at']),
+            models.Index(fields=['company', '-created_at']),
         ]
 
     def __str__(self):
@@ -157,10 +342,7 @@ class CompanyNote(TimestampModel):
 
 
 class CompanyContactRecord(models.Model):
-    class Status(models.TextChoices):
-        DECLINE = 'decline', _('Decline')
-        AGREED = 'agreed', _('Agreed')
-        REPEAT = 'repeat', _('Repeat')
+    Status = ContactStatus
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -176,7 +358,8 @@ class CompanyContactRecord(models.Model):
     class Meta:
         ordering = ['contacted_at']
         indexes = [
-            models.Index(fields=['contacted_at'])
+            models.Index(fields=['contacted_at']),
+            models.Index(fields=['company', '-contacted_at']),
         ]
         verbose_name = _('Company contact record')
         verbose_name_plural = _('Company contact records')
@@ -186,3 +369,122 @@ class CompanyContactRecord(models.Model):
             'user': str(self.user),
             'contacted_at': self.contacted_at.strftime("%Y-%m-%d %H:%M"),
         }
+
+
+class CompanyDeletion(models.Model):
+    """
+    Tombstone of a deleted company, so the feed can tell syncing clients
+    which ids to drop. Written by ``record_company_deletion`` for deletes
+    through the ORM and by ``CompanyQuerySet.delete_with_tombstones()``.
+    """
+
+    company_id = models.BigIntegerField(verbose_name=_('Company ID'))
+    import_key = models.CharField(max_length=40, blank=True, verbose_name=_('Import key'))
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name=_('Deleted'))
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id']),
+        ]
+        verbose_name = _('Company deletion')
+        verbose_name_plural = _('Company deletions')
+
+    def __str__(self):
+        return _('Company %(company_id)s deleted at %(deleted_at)s') % {
+            'company_id': self.company_id,
+            'deleted_at': self.deleted_at.strftime("%Y-%m-%d %H:%M"),
+        }
+
+
+def record_company_deletion(sender, instance: Company, **kwargs):
+    """
+    ``post_delete`` receiver of ``Company``.
+    """
+    CompanyDeletion.objects.create(company_id=instance.pk, import_key=instance.import_key)
+
+
+class CompanyImportRun(TimestampModel):
+    class Status(models.TextChoices):
+        RUNNING = 'running', _('Running')
+        COMPLETED = 'completed', _('Completed')
+        FAILED = 'failed', _('Failed')
+
+    file_name = models.CharField(max_length=255, verbose_name=_('File name'))
+    file_size = models.PositiveBigIntegerField(verbose_name=_('File size'))
+    file_hash = models.CharField(max_length=64, blank=True, verbose_name=_('File SHA-256'))
+    mode = models.CharField(max_length=20, verbose_name=_('Mode'))
+    status = models.CharField(choices=Status.choices, default=Status.RUNNING, max_length=20, verbose_name=_('Status'))
+    last_sheet = models.CharField(max_length=255, blank=True, verbose_name=_('Last completed sheet'))
+    last_row = models.PositiveIntegerField(default=0, verbose_name=_('Last completed row'))
+    rows_imported = models.PositiveIntegerField(default=0, verbose_name=_('Imported rows'))
+    stats = models.JSONField(default=dict, blank=True, verbose_name=_('Statistics'))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Finished'))
+
+    class Meta(TimestampModel.Meta):
+        verbose_name = _('Company import run')
+        verbose_name_plural = _('Company import runs')
+
+    def __str__(self):
+        return _('Import of %(file_name)s at %(created_at)s') % {
+            'file_name': self.file_name,
+            'created_at': self.created_at.strftime("%Y-%m-%d %H:%M"),
+        }
+
+
+def count_days(datetimes: Iterable[datetime]) -> Counter:
+    """
+    Number of ``datetimes`` per local day, the days ``CompanyDailyCount`` uses.
+    """
+    return Counter(timezone.localdate(value) for value in datetimes)
+
+
+class CompanyDailyCountQuerySet(models.QuerySet):
+    def add(self, counts: Mapping[date, int]):
+        """
+        Adds ``counts`` (negative for deleted companies) to the stored days.
+        """
+        for day, amount in counts.items():
+            if amount > 0:
+                if self.filter(day=day).update(companies=F('companies') + amount):
+                    continue
+                try:
+                    with transaction.atomic():
+                        self.create(day=day, companies=amount)
+                except IntegrityError:
+                    # Another transaction created the day meanwhile.
+                    self.filter(day=day).update(companies=F('companies') + amount)
+            elif amount < 0:
+                self.filter(day=day).update(companies=Greatest(F('companies') + amount, 0))
+        if any(amount < 0 for amount in counts.values()):
+            self.filter(companies=0).delete()
+
+    def rebuild(self) -> int:
+        self.all().delete()
+        created = self.bulk_create(
+            CompanyDailyCount(day=day, companies=amount)
+            for day, amount in Company.objects.daily_counts().items()
+        )
+        return len(created)
+
+    def days(self) -> list[date]:
+        return list(self.filter(companies__gt=0).order_by('day').values_list('day', flat=True))
+
+
+class CompanyDailyCount(models.Model):
+    """
+    Companies created per local day, the rollup the company admin's date
+    hierarchy reads instead of truncating every ``created_at``.
+    """
+
+    day = models.DateField(unique=True, verbose_name=_('Day'))
+    companies = models.PositiveIntegerField(default=0, verbose_name=_('Companies'))
+
+    objects = CompanyDailyCountQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _('Company daily count')
+        verbose_name_plural = _('Company daily counts')
+        ordering = ['day']
+
+    def __str__(self):
+        return f'{self.day}: {self.companies}'
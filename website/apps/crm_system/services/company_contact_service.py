@@ -11,4 +11,10 @@ class CompanyContactService:
             company=company,
             contacted_at=timezone.now(),
         )
+        Company.objects.filter(pk=company.pk).refresh_contact_summary()
         return record
+
+    @staticmethod
+    def delete_contact_record(record: CompanyContactRecord):
+        record.delete()
+        Company.objects.filter(pk=record.company_id).refresh_contact_summary()
@@ -0,0 +1,182 @@
+from collections import defaultdict
+from collections.abc import Collection, Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+from types import SimpleNamespace
+
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.core.paginators import KeysetPaginator
+from apps.crm_system.models import CompanyContactRecord, CompanyDeletion, CompanyNote
+
+# Output name: lookup
+COMPANY_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'type': 'type__name',
+    'canton': 'canton__name',
+    'legal_seat': 'legal_seat__name',
+    'legal_form': 'legal_form__name',
+    'in_liquidation': 'in_liquidation',
+    'phone': 'phone',
+    'email': 'email',
+    'website': 'website',
+    'last_contact_status': 'last_contact_status',
+    'last_contacted_at': 'last_contacted_at',
+    'contact_records_count': 'contact_records_count',
+    'delisted_at': 'delisted_at',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+CONTACT_RECORD_FIELDS = {
+    'id': 'id',
+    'status': 'status',
+    'note': 'note',
+    'user': 'user__username',
+    'contacted_at': 'contacted_at',
+}
+
+NOTE_FIELDS = {
+    'id': 'id',
+    'note': 'note',
+    'user': 'user__username',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+DELETION_FIELDS = {
+    'id': 'company_id',
+    'import_key': 'import_key',
+    'deleted_at': 'deleted_at',
+}
+
+# History lists a company row can include: model, fields, ordering.
+HISTORY = {
+    'contact_records': (CompanyContactRecord, CONTACT_RECORD_FIELDS, ['contacted_at', 'pk']),
+    'notes': (CompanyNote, NOTE_FIELDS, ['created_at', 'pk']),
+}
+
+
+def visible_until(using: str, settle_time: timedelta) -> datetime:
+    """
+    Latest timestamp a cursor may pass: rows stamped before it are committed.
+
+    Timestamps are taken before the writing transaction commits, a cursor
+    past a row that is not visible yet would skip it for good. On PostgreSQL
+    the bound is the start of the oldest transaction that has written
+    anything, minus ``settle_time`` for clock differences between the
+    application and the database. Sessions of other database roles are not
+    visible in ``pg_stat_activity``, the application must write as one role.
+    Elsewhere ``settle_time`` must cover the longest write transaction.
+    """
+    connection = connections[using]
+    until = timezone.now()
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT min(xact_start) FROM pg_stat_activity '
+                'WHERE datname = current_database() AND backend_xid IS NOT NULL AND pid <> pg_backend_pid()'
+            )
+            (oldest,) = cursor.fetchone()
+        if oldest is not None:
+            until = min(until, oldest)
+    return until - settle_time
+
+
+class CompanyFeed:
+    """
+    Reads companies as plain dicts in ``(updated_at, id)`` order, each with
+    the ``cursor`` that continues after it, so a sync can resume from the
+    last company it stored. Deleted companies are read the same way from
+    their tombstones, see ``deletions()``.
+
+    Rows are read with ``iterator()``, the requested ``include`` history is
+    fetched per chunk of ``chunk_size`` companies, memory does not grow with
+    the number of companies.
+
+    Rows stamped after ``visible_until()`` are left for the next sync.
+    """
+
+    ordering = ['updated_at', 'pk']
+    deletion_ordering = ['deleted_at', 'pk']
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        include: Collection[str] = (),
+        chunk_size: int = 1000,
+        settle_time: timedelta = timedelta(seconds=30),
+    ):
+        self.include = [name for name in HISTORY if name in include]
+        self.chunk_size = chunk_size
+        self.until = visible_until(queryset.db, settle_time)
+        self.paginator = KeysetPaginator(
+            queryset.filter(updated_at__lte=self.until),
+            chunk_size,
+            self.ordering,
+        )
+        self.deletion_paginator = KeysetPaginator(
+            CompanyDeletion.objects.using(queryset.db).filter(deleted_at__lte=self.until),
+            chunk_size,
+            self.deletion_ordering,
+        )
+
+    def rows(self, cursor: str | None = None) -> Iterator[dict]:
+        """
+        Companies after ``cursor``. The cursor is checked right away,
+        ``InvalidCursor`` is raised before the first row is read.
+        """
+        values = self.paginator.after(cursor).values(*COMPANY_FIELDS.values()).iterator(chunk_size=self.chunk_size)
+        return self._rows(values)
+
+    def deletions(self, cursor: str | None = None) -> Iterator[dict]:
+        """
+        Tombstones of the companies deleted after ``cursor``, ``id`` is the
+        deleted company's. Companies replaced by an import show up here with
+        their old ids and in ``rows()`` with new ones. The cursor is checked
+        right away like in ``rows()``.
+        """
+        values = self.deletion_paginator.after(cursor).values('pk', *DELETION_FIELDS.values())
+        return self._deletions(values.iterator(chunk_size=self.chunk_size))
+
+    def _deletions(self, values: Iterator[dict]) -> Iterator[dict]:
+        for row in values:
+            deletion = {name: row[lookup] for name, lookup in DELETION_FIELDS.items()}
+            deletion['cursor'] = self.deletion_paginator.encode_cursor(
+                KeysetPaginator.NEXT,
+                SimpleNamespace(id=row['pk'], deleted_at=row['deleted_at']),
+            )
+            yield deletion
+
+    def _rows(self, values: Iterator[dict]) -> Iterator[dict]:
+        while chunk := list(islice(values, self.chunk_size)):
+            history = self._history([row['id'] for row in chunk])
+            for row in chunk:
+                company = {name: row[lookup] for name, lookup in COMPANY_FIELDS.items()}
+                for name in self.include:
+                    company[name] = history[name].get(row['id'], [])
+                company['cursor'] = self.paginator.encode_cursor(
+                    KeysetPaginator.NEXT,
+                    SimpleNamespace(id=row['id'], updated_at=row['updated_at']),
+                )
+                yield company
+
+    def _history(self, company_ids: list[int]) -> dict[str, dict[int, list[dict]]]:
+        history = {}
+        for name in self.include:
+            model, fields, ordering = HISTORY[name]
+            entries = defaultdict(list)
+            rows = (
+                model.objects
+                .filter(company_id__in=company_ids)
+                .order_by('company_id', *ordering)
+                .values('company_id', *fields.values())
+            )
+            for row in rows.iterator(chunk_size=self.chunk_size):
+                entries[row['company_id']].append({field: row[lookup] for field, lookup in fields.items()})
+            history[name] = entries
+        return history
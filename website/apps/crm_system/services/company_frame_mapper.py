@@ -0,0 +1,142 @@
+from collections.abc import Mapping
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from apps.crm_system.services.import_keys import make_import_key
+from apps.crm_system.services.workbook_reader import WorkbookReader
+
+REFERENCE_ATTRIBUTES = ['canton', 'type', 'legal_seat', 'legal_form']
+
+REQUIRED_ATTRIBUTES = ['title', *REFERENCE_ATTRIBUTES]
+
+CONTACT_ATTRIBUTES = ['phone', 'email', 'website']
+
+FALSE_VALUES = {'', '0', '0.0', 'false', 'no', 'n', 'nein', 'non', 'none', 'nan'}
+
+
+class MissingColumnError(ValueError):
+    pass
+
+
+def normalize_text(series: pd.Series) -> pd.Series:
+    return series.fillna('').astype(str).str.strip()
+
+
+def normalize_names(series: pd.Series) -> pd.Series:
+    """
+    Column-wise ``normalize_name``, the case-insensitive form of reference names.
+    """
+    return series.str.normalize('NFKC').str.casefold()
+
+
+def normalize_bool(series: pd.Series) -> pd.Series:
+    return ~normalize_text(series).str.lower().isin(FALSE_VALUES)
+
+
+def make_import_keys(*parts: pd.Series) -> list[str]:
+    return [make_import_key(*values) for values in zip(*parts, strict=True)]
+
+
+def map_company_frame(frame: pd.DataFrame, columns: Mapping[str, str | None], import_keys: bool = True) -> pd.DataFrame:
+    """
+    Maps a raw workbook chunk to the importer's canonical columns.
+
+    ``columns`` maps the model attributes to the workbook column names. The
+    result has ``title``, ``description``, ``in_liquidation``, ``visited``,
+    ``phone``, ``email``, ``website``, ``import_key`` and one column per
+    reference attribute, all coerced and defaulted column-wise.
+    """
+    missing = [
+        columns.get(attribute) or attribute
+        for attribute in REQUIRED_ATTRIBUTES
+        if not columns.get(attribute) or columns[attribute] not in frame
+    ]
+    if columns.get('key') and columns['key'] not in frame:
+        missing.append(columns['key'])
+    if missing:
+        raise MissingColumnError(f'Columns not found: {", ".join(missing)}')
+
+    def optional(attribute: str) -> pd.Series | None:
+        column = columns.get(attribute)
+        if column and column in frame:
+            return frame[column]
+        return None
+
+    mapped = pd.DataFrame(index=frame.index)
+    mapped['title'] = normalize_text(frame[columns['title']])
+    for attribute in REFERENCE_ATTRIBUTES:
+        mapped[attribute] = normalize_text(frame[columns[attribute]])
+
+    for attribute in ['description', *CONTACT_ATTRIBUTES]:
+        values = optional(attribute)
+        mapped[attribute] = '' if values is None else normalize_text(values)
+    for attribute, target in (('liquidation', 'in_liquidation'), ('visited', 'visited')):
+        values = optional(attribute)
+        mapped[target] = False if values is None else normalize_bool(values)
+
+    if not import_keys:
+        return mapped
+    if columns.get('key'):
+        mapped['import_key'] = make_import_keys(normalize_text(frame[columns['key']]))
+    else:
+        mapped['import_key'] = make_import_keys(mapped['title'], mapped['legal_seat'], mapped['legal_form'])
+    return mapped
+
+
+def factorize_references(mapped: pd.DataFrame, attribute: str) -> tuple[np.ndarray, pd.Index]:
+    """
+    Returns integer codes of the case-insensitive reference names of a column
+    and the normalized unique names the codes point to.
+    """
+    codes, uniques = pd.factorize(normalize_names(mapped[attribute]))
+    return codes, pd.Index(uniques)
+
+
+# A mapped chunk sent between processes: row numbers and column arrays.
+Batch = tuple[np.ndarray, dict[str, np.ndarray]]
+
+
+def to_batch(mapped: pd.DataFrame) -> Batch:
+    return mapped.index.to_numpy(), {column: mapped[column].to_numpy() for column in mapped.columns}
+
+
+def from_batch(batch: Batch) -> pd.DataFrame:
+    index, columns = batch
+    return pd.DataFrame(columns, index=index)
+
+
+@lru_cache(maxsize=1)
+def _worker_reader(file_path) -> WorkbookReader:
+    # A pool worker maps several sheets of the same file, the workbook and its
+    # shared strings are only loaded once per process.
+    return WorkbookReader(file_path)
+
+
+def map_sheet(
+    file_path,
+    sheet_name: str,
+    columns: Mapping[str, str | None],
+    chunk_size: int,
+    skip_rows: int,
+    batches,
+) -> int:
+    """
+    Reads and maps a sheet chunk by chunk and puts every chunk on the
+    ``batches`` queue as a ``Batch``, followed by ``None``. Returns the number
+    of rows mapped.
+
+    Used as a process pool task, so it only depends on pandas and openpyxl.
+    ``batches`` is bounded, the worker waits while the parent is behind.
+    """
+    frames = _worker_reader(file_path).iter_frames(chunk_size, sheet_names=[sheet_name], start=(sheet_name, skip_rows))
+    rows = 0
+    try:
+        for _, frame in frames:
+            mapped = map_company_frame(frame, columns)
+            batches.put(to_batch(mapped))
+            rows += len(mapped)
+    finally:
+        batches.put(None)
+    return rows
@@ -0,0 +1,209 @@
+import multiprocessing
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.table_versions import bump_table_versions
+from apps.crm_system.models import Canton, Company, CompanyContactRecord, CompanyImportRun, CompanyType, LegalForm, LegalSeat
+from apps.crm_system.services.company_frame_mapper import (
+    CONTACT_ATTRIBUTES,
+    factorize_references,
+    from_batch,
+    map_company_frame,
+    map_sheet,
+)
+from apps.crm_system.services.company_loaders import ImportMode, LoaderBackend, get_company_loader
+from apps.crm_system.services.import_progress import ImportProgress
+from apps.crm_system.services.reference_resolver import ReferenceResolver
+from apps.crm_system.services.workbook_reader import WorkbookReader
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Mapped chunks a sheet worker may get ahead of the parent.
+PARALLEL_QUEUE_SIZE = 2
+
+REFERENCE_MODELS = {
+    'canton': Canton,
+    'type': CompanyType,
+    'legal_seat': LegalSeat,
+    'legal_form': LegalForm,
+}
+
+
+class CompanyImportService:
+    """
+    Streams companies from a workbook into the database.
+
+    ``columns`` maps the model attributes (``title``, ``type``, ``description``,
+    ``liquidation``, ``canton``, ``legal_seat``, ``legal_form``, ``visited``,
+    ``phone``, ``email``, ``website``, ``key``) to the column names used in
+    the workbook.
+
+    In ``upsert`` mode rows are matched to existing companies by
+    ``Company.import_key``: unknown keys are inserted, changed companies are
+    updated and untouched ones are skipped. Contact records and notes of
+    existing companies are never modified.
+
+    Writes go through a ``CompanyLoader``: the ``COPY`` loader on PostgreSQL,
+    batched ORM inserts elsewhere.
+
+    When a ``CompanyImportRun`` is given, every chunk is committed in its own
+    transaction together with the position of the last completed row, so an
+    interrupted import can be resumed from there.
+    """
+
+    def __init__(
+        self,
+        columns: Mapping[str, str | None],
+        status: str = '',
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        mode: str = ImportMode.REPLACE,
+        loader: str = LoaderBackend.AUTO,
+        progress: ImportProgress | None = None,
+        run: CompanyImportRun | None = None,
+    ):
+        self.columns = columns
+        self.batch_size = batch_size
+        self.progress = progress or ImportProgress()
+        self.run = run
+        self.resolvers = {
+            attribute: ReferenceResolver(model)
+            for attribute, model in REFERENCE_MODELS.items()
+        }
+        self.stats = Counter()
+        if run is not None:
+            # Counters of a resumed run keep accumulating.
+            self.stats.update({key: value for key, value in run.stats.items() if isinstance(value, int)})
+        self.loader = get_company_loader(
+            loader,
+            mode=mode,
+            status=status,
+            batch_size=batch_size,
+            stats=self.stats,
+            contact_fields=[attribute for attribute in CONTACT_ATTRIBUTES if columns.get(attribute)],
+        )
+
+    def import_file(self, file_path, workers: int = 1, start: tuple[str, int] | None = None) -> int:
+        """
+        With more than one worker the sheets are parsed and mapped in a process
+        pool while this process resolves references and writes to the database.
+        ``start`` is the ``(sheet, rows)`` position to continue from.
+        """
+        with WorkbookReader(file_path) as reader:
+            self.progress.set_totals(reader.row_counts())
+            if workers > 1:
+                return self.import_mapped(self._iter_parallel_sheets(file_path, reader.sheet_names(), workers, start))
+            frames = reader.iter_frames(self.batch_size, start=start)
+            return self.import_mapped((sheet, map_company_frame(frame, self.columns)) for sheet, frame in frames)
+
+    def check_file(self, file_path) -> bool:
+        """
+        Maps the first chunk of every sheet, so missing columns are reported
+        before anything is written. Returns whether the file has any rows.
+        """
+        has_rows = False
+        with WorkbookReader(file_path) as reader:
+            for sheet_name in reader.sheet_names():
+                for _, frame in islice(reader.iter_frames(self.batch_size, sheet_names=[sheet_name]), 1):
+                    map_company_frame(frame, self.columns)
+                    has_rows = True
+        return has_rows
+
+    def import_frames(self, frames: Iterable[pd.DataFrame]) -> int:
+        return self.import_mapped(('', map_company_frame(frame, self.columns)) for frame in frames)
+
+    def import_mapped(self, mapped_frames: Iterable[tuple[str, pd.DataFrame]]) -> int:
+        imported = 0
+        for sheet, mapped in self.progress.timed(mapped_frames, 'parse'):
+            with transaction.atomic() if self.run else nullcontext():
+                with self.progress.phase('resolve'):
+                    self._resolve_references(mapped)
+                with self.progress.phase('write'):
+                    self.loader.load(mapped)
+                    if self.run:
+                        self.loader.flush()
+                        self._save_checkpoint(sheet, len(mapped))
+                        bump_table_versions(Company, CompanyContactRecord)
+            imported += len(mapped)
+            self.progress.advance(sheet, len(mapped))
+        with self.progress.phase('write'):
+            self.loader.finish()
+        bump_table_versions(Company, CompanyContactRecord)
+        return imported
+
+    def complete_run(self, status: str = CompanyImportRun.Status.COMPLETED):
+        if self.run is None:
+            return
+        self.run.status = status
+        self.run.finished_at = timezone.now()
+        self.run.stats = {
+            **self.run.stats,
+            **self.stats,
+            'timings': dict(self.progress.timings),
+        }
+        self.run.save(update_fields=['status', 'finished_at', 'stats', 'updated_at'])
+
+    def flag_missing(self) -> int:
+        """
+        Marks companies whose key did not appear in the imported rows as delisted.
+        """
+        missing = self.loader.flag_missing()
+        bump_table_versions(Company)
+        return missing
+
+    def _save_checkpoint(self, sheet: str, rows: int):
+        if sheet != self.run.last_sheet:
+            self.run.last_sheet = sheet
+            self.run.last_row = 0
+        self.run.last_row += rows
+        self.run.rows_imported += rows
+        self.run.stats = {**self.run.stats, **self.stats}
+        self.run.save(update_fields=['last_sheet', 'last_row', 'rows_imported', 'stats', 'updated_at'])
+
+    def _iter_parallel_sheets(
+        self,
+        file_path,
+        sheet_names: list[str],
+        workers: int,
+        start: tuple[str, int] | None,
+    ) -> Iterator[tuple[str, pd.DataFrame]]:
+        # Spawned workers never inherit the parent's open database connection.
+        context = multiprocessing.get_context('spawn')
+        skip_rows = [0] * len(sheet_names)
+        if start is not None:
+            start_sheet, start_row = start
+            sheet_names = sheet_names[sheet_names.index(start_sheet):] if start_sheet in sheet_names else []
+            skip_rows = [start_row] + [0] * (len(sheet_names) - 1)
+        tasks = zip(sheet_names, skip_rows, strict=True)
+        # The manager shuts down first when the import is aborted, which
+        # releases workers waiting on a full queue before the pool joins them.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool, context.Manager() as manager:
+
+            def submit(sheet_name: str, skip: int):
+                batches = manager.Queue(maxsize=PARALLEL_QUEUE_SIZE)
+                future = pool.submit(map_sheet, file_path, sheet_name, dict(self.columns), self.batch_size, skip, batches)
+                return sheet_name, batches, future
+
+            # Sheets are read in order, at most one per worker at a time.
+            running = deque(submit(*task) for task in islice(tasks, workers))
+            while running:
+                sheet_name, batches, future = running.popleft()
+                while (batch := batches.get()) is not None:
+                    yield sheet_name, from_batch(batch)
+                future.result()
+                if task := next(tasks, None):
+                    running.append(submit(*task))
+
+    def _resolve_references(self, mapped: pd.DataFrame):
+        for attribute, resolver in self.resolvers.items():
+            resolver.resolve(mapped[attribute].drop_duplicates())
+            codes, names = factorize_references(mapped, attribute)
+            ids = np.array([resolver.get_id(name) for name in names])
+            mapped[f'{attribute}_id'] = ids[codes]
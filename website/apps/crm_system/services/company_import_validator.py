@@ -0,0 +1,113 @@
+from collections.abc import Iterator, Mapping
+
+import pandas as pd
+from django.db.models import TextChoices
+
+from apps.crm_system.models import Company
+from apps.crm_system.services.company_frame_mapper import (
+    REFERENCE_ATTRIBUTES,
+    MissingColumnError,
+    map_company_frame,
+    normalize_names,
+)
+from apps.crm_system.services.company_import_service import REFERENCE_MODELS
+from apps.crm_system.services.workbook_reader import WorkbookReader
+
+REPORT_COLUMNS = ['sheet', 'row', 'column', 'level', 'error', 'value']
+
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
+URL_PATTERN = r'^(?:https?|ftp)://[^\s/?#]+\.[^\s/?#]+(?:[/?#]\S*)?$'
+
+LENGTH_CHECKED_FIELDS = ['title', 'phone', 'email', 'website']
+
+
+class ReportLevel(TextChoices):
+    ERROR = 'error'
+    WARNING = 'warning'
+
+
+class CompanyImportValidator:
+    """
+    Checks workbook chunks column-wise and returns one report row per problem.
+
+    Errors are values the import would reject or truncate: missing columns,
+    empty titles, values longer than the model field, malformed emails and
+    URLs. Reference names that are not in the database yet are warnings,
+    the import creates them. The database is only read, never written.
+    """
+
+    def __init__(self, columns: Mapping[str, str | None], known_references: Mapping[str, set[str]] | None = None):
+        self.columns = columns
+        self.known_references = known_references
+        self._reported_missing: set[tuple[str, str]] = set()
+
+    @classmethod
+    def load_known_references(cls) -> dict[str, set[str]]:
+        return {
+            attribute: set(model.objects.values_list('normalized_name', flat=True).iterator())
+            for attribute, model in REFERENCE_MODELS.items()
+        }
+
+    def validate_file(self, file_path, chunk_size: int) -> Iterator[pd.DataFrame]:
+        with WorkbookReader(file_path) as reader:
+            for sheet, frame in reader.iter_frames(chunk_size):
+                report = self.validate(sheet, frame)
+                if len(report):
+                    yield report
+
+    def validate(self, sheet: str, frame: pd.DataFrame) -> pd.DataFrame:
+        try:
+            mapped = map_company_frame(frame, self.columns, import_keys=False)
+        except MissingColumnError as e:
+            if (sheet, str(e)) in self._reported_missing:
+                return pd.DataFrame(columns=REPORT_COLUMNS)
+            self._reported_missing.add((sheet, str(e)))
+            return pd.DataFrame([[sheet, None, None, ReportLevel.ERROR, 'missing_columns', str(e)]], columns=REPORT_COLUMNS)
+
+        reports = [
+            self._report(sheet, mapped, 'title', mapped['title'] == '', 'empty'),
+        ]
+        for field in LENGTH_CHECKED_FIELDS:
+            max_length = Company._meta.get_field(field).max_length
+            reports.append(self._report(sheet, mapped, field, mapped[field].str.len() > max_length, f'longer_than_{max_length}'))
+        for attribute, model in REFERENCE_MODELS.items():
+            max_length = model._meta.get_field('name').max_length
+            names = mapped[attribute]
+            reports.append(self._report(sheet, mapped, attribute, names == '', 'empty'))
+            reports.append(self._report(sheet, mapped, attribute, names.str.len() > max_length, f'longer_than_{max_length}'))
+
+        emails = mapped['email']
+        reports.append(self._report(sheet, mapped, 'email', (emails != '') & ~emails.str.match(EMAIL_PATTERN), 'invalid_email'))
+        websites = mapped['website']
+        reports.append(self._report(sheet, mapped, 'website', (websites != '') & ~websites.str.match(URL_PATTERN, case=False), 'invalid_url'))
+
+        if self.known_references is not None:
+            for attribute in REFERENCE_ATTRIBUTES:
+                names = mapped[attribute]
+                unknown = (names != '') & ~normalize_names(names).isin(self.known_references[attribute])
+                reports.append(self._report(sheet, mapped, attribute, unknown, 'unknown_reference', ReportLevel.WARNING))
+
+        reports = [report for report in reports if len(report)]
+        if not reports:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+        return pd.concat(reports, ignore_index=True).sort_values('row', kind='stable', ignore_index=True)
+
+    def _report(
+        self,
+        sheet: str,
+        mapped: pd.DataFrame,
+        attribute: str,
+        mask: pd.Series,
+        error: str,
+        level: str = ReportLevel.ERROR,
+    ) -> pd.DataFrame:
+        values = mapped.loc[mask, attribute]
+        return pd.DataFrame({
+            'sheet': sheet,
+            'row': values.index,
+            'column': self.columns.get(attribute) or attribute,
+            'level': level,
+            'error': error,
+            'value': values.to_numpy(),
+        }, columns=REPORT_COLUMNS)
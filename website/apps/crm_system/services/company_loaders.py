@@ -0,0 +1,353 @@
+import io
+from collections import Counter
+from collections.abc import Iterator, Sequence
+
+import pandas as pd
+from django.db import connection
+from django.db.models import TextChoices
+from django.utils import timezone
+
+from apps.crm_system.models import Company, CompanyContactRecord, CompanyDailyCount, count_days
+
+MODEL_COLUMNS = [
+    'title',
+    'description',
+    'in_liquidation',
+    'type_id',
+    'canton_id',
+    'legal_seat_id',
+    'legal_form_id',
+    'import_key',
+]
+
+TEXT_COLUMNS = {'title', 'description', 'import_key', 'phone', 'email', 'website'}
+
+UPSERT_FIELDS = ['title', 'description', 'in_liquidation', 'type', 'canton', 'legal_seat', 'legal_form']
+
+
+class ImportMode(TextChoices):
+    REPLACE = 'replace'
+    UPSERT = 'upsert'
+
+
+class LoaderBackend(TextChoices):
+    AUTO = 'auto'
+    ORM = 'orm'
+    COPY = 'copy'
+
+
+class CompanyLoader:
+    """
+    Writes mapped company chunks (see ``company_frame_mapper``) with resolved
+    ``*_id`` reference columns to the database.
+
+    ``contact_fields`` lists the contact columns (``phone``, ``email``,
+    ``website``) present in the file. Only those are written, so an upsert
+    never wipes contact data operators entered by hand.
+    """
+
+    def __init__(self, mode: str, status: str, batch_size: int, stats: Counter, contact_fields: Sequence[str] = ()):
+        self.mode = mode
+        self.status = status
+        self.batch_size = batch_size
+        self.stats = stats
+        self.model_columns = [*MODEL_COLUMNS, *contact_fields]
+        self.upsert_fields = [*UPSERT_FIELDS, *contact_fields]
+
+    def load(self, mapped: pd.DataFrame):
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+    def flush(self):
+        """
+        Writes everything loaded so far. Called before every checkpoint commit.
+        """
+        self.finish()
+
+    def flag_missing(self) -> int:
+        raise NotImplementedError
+
+
+class OrmCompanyLoader(CompanyLoader):
+    """
+    Writes every chunk right away with ``bulk_create`` / ``bulk_update``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen_keys: set[str] = set()
+
+    def load(self, mapped: pd.DataFrame):
+        companies = list(self._iter_companies(mapped))
+        if self.mode == ImportMode.UPSERT:
+            self._upsert(companies)
+        else:
+            self._insert(companies)
+
+    def flag_missing(self) -> int:
+        """
+        Marks companies whose key did not appear in the imported rows as delisted.
+        """
+        now = timezone.now()
+        missing = [
+            pk
+            for pk, import_key in (
+                Company.objects
+                .filter(delisted_at__isnull=True)
+                .exclude(import_key='')
+                .values_list('pk', 'import_key')
+                .iterator(chunk_size=self.batch_size)
+            )
+            if import_key not in self.seen_keys
+        ]
+        for start in range(0, len(missing), self.batch_size):
+            (Company.objects
+             .filter(pk__in=missing[start:start + self.batch_size])
+             .update(delisted_at=now, updated_at=now))
+        self.stats['missing'] += len(missing)
+        return len(missing)
+
+    def _iter_companies(self, mapped: pd.DataFrame) -> Iterator[tuple[Company, bool]]:
+        fields = [*self.model_columns, 'visited']
+        for *values, visited in zip(*(mapped[field].tolist() for field in fields), strict=True):
+            yield Company(**dict(zip(self.model_columns, values, strict=True))), visited
+
+    def _insert(self, companies: list[tuple[Company, bool]]):
+        created = Company.objects.bulk_create([company for company, _ in companies])
+        CompanyDailyCount.objects.add(count_days(company.created_at for company in created))
+        self.stats['created'] += len(created)
+        visited = [company for company, (_, is_visited) in zip(created, companies, strict=True) if is_visited]
+        if visited:
+            self._create_contact_records(visited)
+
+    def _create_contact_records(self, companies: list[Company]):
+        if all(company.pk for company in companies):
+            company_ids = [company.pk for company in companies]
+        else:
+            # Backends that can't return rows from a bulk insert leave pk unset,
+            # the freshly inserted companies are looked up by their import key.
+            company_ids = list(
+                Company.objects
+                .filter(import_key__in={company.import_key for company in companies})
+                .values_list('pk', flat=True)
+            )
+        CompanyContactRecord.objects.bulk_create(
+            CompanyContactRecord(company_id=company_id, status=self.status)
+            for company_id in company_ids
+        )
+        Company.objects.filter(pk__in=company_ids).refresh_contact_summary()
+        self.stats['contacted'] += len(company_ids)
+
+    def _upsert(self, companies: list[tuple[Company, bool]]):
+        unique = {}
+        for company, visited in companies:
+            if company.import_key in self.seen_keys or company.import_key in unique:
+                self.stats['duplicates'] += 1
+                continue
+            unique[company.import_key] = (company, visited)
+        self.seen_keys.update(unique)
+
+        attnames = [Company._meta.get_field(field).attname for field in self.upsert_fields]
+        existing = {
+            values['import_key']: values
+            for values in (
+                Company.objects
+                .filter(import_key__in=unique)
+                .values('pk', 'import_key', 'delisted_at', *attnames)
+            )
+        }
+
+        now = timezone.now()
+        changed = []
+        new_companies = []
+        for key, (company, visited) in unique.items():
+            current = existing.get(key)
+            if current is None:
+                new_companies.append((company, visited))
+                continue
+            if current['delisted_at'] is None and all(getattr(company, attname) == current[attname] for attname in attnames):
+                self.stats['unchanged'] += 1
+                continue
+            company.pk = current['pk']
+            company.updated_at = now
+            company.delisted_at = None
+            changed.append(company)
+
+        Company.objects.bulk_update(changed, [*self.upsert_fields, 'delisted_at', 'updated_at'])
+        self.stats['updated'] += len(changed)
+        self._insert(new_companies)
+
+
+class PostgresCopyCompanyLoader(CompanyLoader):
+    """
+    Streams every chunk into a temporary staging table with ``COPY FROM STDIN``
+    and merges the staging table into the company table with a single
+    set-based statement in :meth:`finish`.
+
+    Staging rows draw their ids from the company sequence, so inserted
+    companies keep them and contact records of visited rows can be created
+    with a join on the id. Must run inside a transaction.
+    """
+
+    STAGING_TABLE = 'crm_system_company_import_staging'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.company_table = connection.ops.quote_name(Company._meta.db_table)
+        self.record_table = connection.ops.quote_name(CompanyContactRecord._meta.db_table)
+        self._staging_created = False
+
+    def load(self, mapped: pd.DataFrame):
+        if not self._staging_created:
+            self._create_staging_table()
+        staging_columns = [*self.model_columns, 'visited']
+        text_columns = [column for column in self.model_columns if column in TEXT_COLUMNS]
+        buffer = io.StringIO()
+        mapped[staging_columns].to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {self.STAGING_TABLE} ({", ".join(staging_columns)}) FROM STDIN '
+                f'WITH (FORMAT csv, FORCE_NOT_NULL ({", ".join(text_columns)}))',
+                buffer,
+            )
+
+    def finish(self):
+        if not self._staging_created:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE INDEX ON {self.STAGING_TABLE} (import_key)')
+            cursor.execute(f'ANALYZE {self.STAGING_TABLE}')
+            if self.mode == ImportMode.UPSERT:
+                self._merge_upsert(cursor)
+            else:
+                self._merge_insert(cursor)
+            cursor.execute(
+                f'INSERT INTO {self.record_table} (company_id, status, contacted_at, note, user_id) '
+                f'SELECT s.id, %s, now(), \'\', NULL FROM {self.STAGING_TABLE} s '
+                f'JOIN {self.company_table} c ON c.id = s.id WHERE s.visited',
+                [self.status],
+            )
+            self.stats['contacted'] += cursor.rowcount
+            # The records were just created with the transaction timestamp, so
+            # the stored summary can be advanced without reading them back.
+            cursor.execute(
+                f'UPDATE {self.company_table} c SET last_contact_status = %s, last_contacted_at = now(), '
+                f'contact_records_count = c.contact_records_count + 1, updated_at = now() '
+                f'FROM {self.STAGING_TABLE} s WHERE c.id = s.id AND s.visited',
+                [self.status],
+            )
+
+    def flush(self):
+        self.finish()
+        if self._staging_created:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {self.STAGING_TABLE}')
+            self._staging_created = False
+
+    def flag_missing(self) -> int:
+        if not self._staging_created:
+            self._create_staging_table()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {self.company_table} c SET delisted_at = now(), updated_at = now() '
+                f'WHERE c.delisted_at IS NULL AND c.import_key <> \'\' '
+                f'AND NOT EXISTS (SELECT 1 FROM {self.STAGING_TABLE} s WHERE s.import_key = c.import_key)'
+            )
+            missing = cursor.rowcount
+        self.stats['missing'] += missing
+        return missing
+
+    def _create_staging_table(self):
+        sequence = f"pg_get_serial_sequence('{Company._meta.db_table}', 'id')"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {self.STAGING_TABLE} ('
+                f'id bigint NOT NULL DEFAULT nextval({sequence}), '
+                f'title varchar(255) NOT NULL, '
+                f'description text NOT NULL, '
+                f'in_liquidation boolean NOT NULL, '
+                f'type_id bigint NOT NULL, '
+                f'canton_id bigint NOT NULL, '
+                f'legal_seat_id bigint NOT NULL, '
+                f'legal_form_id bigint NOT NULL, '
+                f'import_key varchar(40) NOT NULL, '
+                f'phone text NOT NULL DEFAULT \'\', '
+                f'email text NOT NULL DEFAULT \'\', '
+                f'website text NOT NULL DEFAULT \'\', '
+                f'visited boolean NOT NULL'
+                f') ON COMMIT DROP'
+            )
+        self._staging_created = True
+
+    def _merge_insert(self, cursor):
+        columns = ', '.join(self.model_columns)
+        cursor.execute(
+            f'INSERT INTO {self.company_table} (id, created_at, updated_at, {columns}) '
+            f'SELECT id, now(), now(), {columns} FROM {self.STAGING_TABLE}'
+        )
+        created = cursor.rowcount
+        self._add_daily_count(cursor, created)
+        self.stats['created'] += created
+
+    def _merge_upsert(self, cursor):
+        columns = ', '.join(self.model_columns)
+        source_columns = ', '.join(f's.{column}' for column in self.model_columns)
+        compared = [Company._meta.get_field(field).attname for field in self.upsert_fields]
+        assignments = ', '.join(f'{column} = s.{column}' for column in compared)
+        current_values = ', '.join(f'c.{column}' for column in compared)
+        new_values = ', '.join(f's.{column}' for column in compared)
+        cursor.execute(
+            f'WITH source AS ('
+            f'  SELECT DISTINCT ON (import_key) * FROM {self.STAGING_TABLE} ORDER BY import_key, id'
+            f'), updated AS ('
+            f'  UPDATE {self.company_table} c SET {assignments}, delisted_at = NULL, updated_at = now() '
+            f'  FROM source s WHERE c.import_key = s.import_key '
+            f'  AND (({current_values}) IS DISTINCT FROM ({new_values}) OR c.delisted_at IS NOT NULL) '
+            f'  RETURNING c.id'
+            f'), inserted AS ('
+            f'  INSERT INTO {self.company_table} (id, created_at, updated_at, {columns}) '
+            f'  SELECT s.id, now(), now(), {source_columns} FROM source s '
+            f'  WHERE NOT EXISTS (SELECT 1 FROM {self.company_table} c WHERE c.import_key = s.import_key) '
+            f'  RETURNING id'
+            f') SELECT '
+            f'  (SELECT count(*) FROM {self.STAGING_TABLE}), '
+            f'  (SELECT count(*) FROM source), '
+            f'  (SELECT count(*) FROM updated), '
+            f'  (SELECT count(*) FROM inserted)'
+        )
+        staged, unique, updated, inserted = cursor.fetchone()
+        self._add_daily_count(cursor, inserted)
+        self.stats['duplicates'] += staged - unique
+        self.stats['updated'] += updated
+        self.stats['created'] += inserted
+        self.stats['unchanged'] += unique - updated - inserted
+
+    def _add_daily_count(self, cursor, created: int):
+        # Inserted rows are stamped with now(), the start of the transaction,
+        # which can be a day earlier than the clock of this process by now.
+        cursor.execute('SELECT now()')
+        (created_at,) = cursor.fetchone()
+        CompanyDailyCount.objects.add({timezone.localdate(created_at): created})
+
+
+def get_company_loader(backend: str, **kwargs) -> CompanyLoader:
+    """
+    Picks the COPY loader on PostgreSQL with psycopg2 and the ORM loader elsewhere.
+    """
+    if backend == LoaderBackend.AUTO:
+        backend = LoaderBackend.COPY if supports_copy() else LoaderBackend.ORM
+    if backend == LoaderBackend.COPY:
+        if not supports_copy():
+            raise ValueError('COPY loader requires PostgreSQL with psycopg2')
+        return PostgresCopyCompanyLoader(**kwargs)
+    return OrmCompanyLoader(**kwargs)
+
+
+def supports_copy() -> bool:
+    if connection.vendor != 'postgresql':
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    return not is_psycopg3
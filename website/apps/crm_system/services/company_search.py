@@ -0,0 +1,133 @@
+import re
+from functools import cache
+from importlib import import_module
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, QuerySet, Value
+
+from apps.crm_system.models import Company, CompanySearchEntry
+
+# FTS5 table the SQLite migration creates, kept in sync by triggers on the company table.
+SQLITE_SEARCH_TABLE = CompanySearchEntry._meta.db_table
+
+# bm25 weights of the title and description columns, the rank of the FTS5 table.
+SQLITE_COLUMN_WEIGHTS = (10.0, 1.0)
+
+# Frozen in the migration that created them. Django does not know about
+# them, a rebuild of the company table by a later migration drops them, see
+# ``ensure_triggers``.
+SQLITE_TRIGGERS = import_module('apps.crm_system.migrations.0009_company_search_index').SQLITE_TRIGGERS
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def search_vector():
+    """
+    The document the PostgreSQL GIN index is built on. Queries only use the
+    index while this expression matches the one in the migration.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector('title', weight='A', config='simple')
+        + SearchVector('description', weight='B', config='simple')
+    )
+
+
+class CompanySearchBackend:
+    """
+    Searches company titles and descriptions for the admin search box.
+
+    ``search`` narrows a queryset to the matching companies and annotates
+    ``search_rank``, higher values are more relevant.
+    """
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        raise NotImplementedError
+
+    def rebuild(self) -> list[str]:
+        """
+        Rebuilds the index, returns the names of missing parts it recreated.
+        """
+        return []
+
+
+class PostgresCompanySearchBackend(CompanySearchBackend):
+    """
+    Matches a ``websearch`` query against the indexed title and description
+    document, or title words within trigram distance of the term, which
+    tolerates typos. Ranks by text rank plus trigram word similarity.
+    """
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+
+        query = SearchQuery(term, config='simple', search_type='websearch')
+        return (
+            queryset
+            .alias(search_document=search_vector())
+            .filter(Q(search_document=query) | Q(title__trigram_word_similar=term))
+            .annotate(search_rank=SearchRank(F('search_document'), query) + TrigramWordSimilarity(term, 'title'))
+        )
+
+
+class SqliteCompanySearchBackend(CompanySearchBackend):
+    """
+    Prefix matches every word of the term in the FTS5 table and ranks with
+    bm25, titles weighing more than descriptions.
+    """
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        match = ' '.join(f'"{token}"*' for token in TOKEN_PATTERN.findall(term))
+        if not match:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        # Joins the FTS table once. A correlated bm25 subquery would repeat
+        # the match for every matching company.
+        return (
+            queryset
+            .filter(search_entry__document__match=match)
+            .annotate(search_rank=-F('search_entry__rank'))
+        )
+
+    def rebuild(self) -> list[str]:
+        recreated = self.ensure_triggers()
+        weights = ', '.join(str(weight) for weight in SQLITE_COLUMN_WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rank) VALUES ('rank', %s)", [f'bm25({weights})'])
+            cursor.execute(f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')")
+        return recreated
+
+    @staticmethod
+    def ensure_triggers() -> list[str]:
+        """
+        Creates the sync triggers that are missing, returns their names.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [Company._meta.db_table])
+            existing = {name for name, in cursor.fetchall()}
+            missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(SQLITE_TRIGGERS[name])
+        return missing
+
+
+class ContainsCompanySearchBackend(CompanySearchBackend):
+    """
+    Unindexed substring match for databases without a search index.
+    """
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        return (
+            queryset
+            .filter(Q(title__icontains=term) | Q(description__icontains=term))
+            .annotate(search_rank=Value(0.0, output_field=FloatField()))
+        )
+
+
+@cache
+def get_company_search_backend() -> CompanySearchBackend:
+    if connection.vendor == 'postgresql':
+        return PostgresCompanySearchBackend()
+    if connection.vendor == 'sqlite' and SQLITE_SEARCH_TABLE in connection.introspection.table_names():
+        return SqliteCompanySearchBackend()
+    return ContainsCompanySearchBackend()
@@ -0,0 +1,16 @@
+import hashlib
+
+# Spawned import workers load this module without setting up Django.
+from apps.core.text import normalize_name
+
+KEY_SEPARATOR = '\x1f'
+
+
+def make_import_key(*parts) -> str:
+    """
+    Key matching a company to its workbook row across imports: the hash of
+    the stripped, case folded parts (see ``normalize_name``), by default the
+    title, legal seat and legal form names.
+    """
+    joined = KEY_SEPARATOR.join(normalize_name(str(part).strip()) for part in parts)
+    return hashlib.sha1(joined.encode()).hexdigest()
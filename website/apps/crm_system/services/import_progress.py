@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+
+PHASES = ['parse', 'resolve', 'write']
+
+
+class ImportProgress:
+    """
+    Collects per-sheet row counters and per-phase timings of an import and
+    reports throughput and ETA at most once per ``interval`` seconds.
+    """
+
+    def __init__(self, write: Callable[[str], None] | None = None, interval: float = 5.0, initial_rows: int = 0):
+        self.write = write
+        self.interval = interval
+        self.initial_rows = initial_rows
+        self.rows = 0
+        self.sheet_rows = Counter()
+        self.sheet_totals: dict[str, int | None] = {}
+        self.timings = Counter()
+        self.started_at = time.monotonic()
+        self._reported_at = self.started_at
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def total(self) -> int | None:
+        if not self.sheet_totals or None in self.sheet_totals.values():
+            return None
+        return sum(self.sheet_totals.values())
+
+    @property
+    def eta(self) -> float | None:
+        if self.total is None or not self.rate:
+            return None
+        return max(self.total - self.initial_rows - self.rows, 0) / self.rate
+
+    def set_totals(self, sheet_totals: Mapping[str, int | None]):
+        self.sheet_totals = dict(sheet_totals)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.monotonic() - started
+
+    def timed(self, iterable: Iterable, name: str) -> Iterator:
+        """
+        Iterates over ``iterable`` and accounts the time spent producing items to ``name``.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def advance(self, sheet: str, rows: int):
+        self.rows += rows
+        self.sheet_rows[sheet] += rows
+        now = time.monotonic()
+        if now - self._reported_at >= self.interval:
+            self._reported_at = now
+            self.report(sheet)
+
+    def report(self, sheet: str):
+        if self.write is None:
+            return
+        sheet_total = self.sheet_totals.get(sheet)
+        sheet_progress = f'{self.sheet_rows[sheet]}/{sheet_total}' if sheet_total else str(self.sheet_rows[sheet])
+        eta = self.eta
+        self.write(
+            f'{sheet}: {sheet_progress} rows, {self.initial_rows + self.rows} total, '
+            f'{self.rate:.0f} rows/s' + (f', ETA {eta:.0f}s' if eta is not None else '')
+        )
+
+    def summary(self) -> list[str]:
+        lines = [f'{self.rows} rows in {self.elapsed:.2f}s ({self.rate:.0f} rows/s)']
+        lines += [f'  sheet {sheet}: {rows} rows' for sheet, rows in self.sheet_rows.items()]
+        lines += [f'  {phase}: {self.timings[phase]:.2f}s' for phase in PHASES]
+        return lines
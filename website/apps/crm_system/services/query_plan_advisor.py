@@ -0,0 +1,77 @@
+import re
+
+from django.db import connection
+from django.db.models import QuerySet
+
+from apps.crm_system.models import Company, CompanyContactRecord, CompanyNote
+from apps.crm_system.services.company_search import get_company_search_backend
+
+PAGE_SIZE = 100
+
+INLINE_PAGE_SIZE = 20
+
+SCANNED_MODELS = [Company, CompanyContactRecord, CompanyNote]
+
+# SQLite reports "SCAN <table>" for a full table scan and "SCAN <table> USING
+# [COVERING] INDEX ..." for a full index scan. The latter is fine for a page
+# read in index order, but not when the whole result is sorted or grouped.
+SEQUENTIAL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (\w+)(?!\w| USING)'),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)'),
+}
+
+SQLITE_INDEX_SCAN_PATTERN = re.compile(r'\bSCAN (\w+) USING (?:COVERING )?INDEX')
+
+SQLITE_FULL_SORT_PATTERN = re.compile(r'USE TEMP B-TREE FOR (?:ORDER|GROUP) BY')
+
+TABLE_ALIAS_PATTERN = re.compile(r'"(\w+)" (\w+)\b')
+
+
+def canonical_queries() -> dict[str, QuerySet]:
+    """
+    The queries the company admin runs for its changelist, filters and inlines,
+    with filter values sampled from the database.
+    """
+    sample = Company.objects.values('pk', 'canton_id', 'legal_form_id', 'legal_seat_id').order_by('-pk').first() or {
+        'pk': 0, 'canton_id': 0, 'legal_form_id': 0, 'legal_seat_id': 0,
+    }
+    changelist = Company.objects.select_related('canton', 'legal_seat', 'legal_form').order_by('-created_at', '-pk')
+    company_records = CompanyContactRecord.objects.filter(company_id=sample['pk'])
+    return {
+        'changelist': changelist[:PAGE_SIZE],
+        'filter_canton': changelist.filter(canton_id=sample['canton_id'])[:PAGE_SIZE],
+        'filter_canton_legal_form': changelist.filter(
+            canton_id=sample['canton_id'],
+            legal_form_id=sample['legal_form_id'],
+        )[:PAGE_SIZE],
+        'filter_legal_form': changelist.filter(legal_form_id=sample['legal_form_id'])[:PAGE_SIZE],
+        'filter_legal_seat': changelist.filter(legal_seat_id=sample['legal_seat_id'])[:PAGE_SIZE],
+        'filter_in_liquidation': changelist.filter(in_liquidation=True)[:PAGE_SIZE],
+        'filter_last_contact_status': changelist.filter_last_contact_status(CompanyContactRecord.Status.REPEAT)[:PAGE_SIZE],
+        'filter_contact_ready': changelist.filter_contact_ready_status(status=True)[:PAGE_SIZE],
+        # Searches are listed by relevance, as in RankedSearchChangeListMixin.
+        'search': get_company_search_backend().search(changelist, 'transport').order_by('-search_rank', '-pk')[:PAGE_SIZE],
+        'company_feed': Company.objects.order_by('updated_at', 'pk')[:PAGE_SIZE],
+        'latest_contact_record': company_records.order_by('-contacted_at')[:1],
+        'contact_record_inline': company_records.order_by('-contacted_at', '-pk')[:INLINE_PAGE_SIZE + 1],
+        'note_inline': CompanyNote.objects.filter(company_id=sample['pk']).order_by('-created_at', '-pk')[:INLINE_PAGE_SIZE + 1],
+    }
+
+
+def table_sizes() -> dict[str, int]:
+    return {model._meta.db_table: model.objects.count() for model in SCANNED_MODELS}
+
+
+def sequential_scans(queryset: QuerySet, plan: str) -> set[str]:
+    """
+    Tables ``plan`` reads sequentially. Aliases Django gives to tables in
+    subqueries are resolved through the query's SQL.
+    """
+    pattern = SEQUENTIAL_SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        raise ValueError(f'Plans of the {connection.vendor} backend are not supported')
+    aliases = {alias: table for table, alias in TABLE_ALIAS_PATTERN.findall(str(queryset.query))}
+    names = pattern.findall(plan)
+    if connection.vendor == 'sqlite' and SQLITE_FULL_SORT_PATTERN.search(plan):
+        names += SQLITE_INDEX_SCAN_PATTERN.findall(plan)
+    return {aliases.get(name, name) for name in names}
@@ -0,0 +1,49 @@
+from collections.abc import Iterable
+
+from django.db.models import Model
+
+from apps.core.models import normalize_name
+from apps.core.table_versions import bump_table_versions
+
+
+class ReferenceResolver:
+    """
+    In-memory ``name -> pk`` map of a ``UniqueNamedModel`` table.
+
+    Keys are the ``normalized_name`` the unique constraint compares, so ``ZH``
+    and ``zh``, or ``ZÜRICH`` and ``Zürich``, resolve to the same row. The
+    table is loaded once and unknown names are created with a single
+    ``bulk_create`` per call to :meth:`resolve`.
+    """
+
+    def __init__(self, model: type[Model]):
+        self.model = model
+        self._ids: dict[str, int] | None = None
+
+    @property
+    def ids(self) -> dict[str, int]:
+        if self._ids is None:
+            self._ids = {
+                normalized_name: pk
+                for pk, normalized_name in self.model.objects.values_list('pk', 'normalized_name').iterator()
+            }
+        return self._ids
+
+    def resolve(self, names: Iterable) -> dict[str, int]:
+        ids = self.ids
+        missing = {}
+        for name in names:
+            key = normalize_name(name)
+            if key not in ids and key not in missing:
+                missing[key] = self.model(name=str(name), normalized_name=key)
+        if missing:
+            created = self.model.objects.bulk_create(missing.values())
+            bump_table_versions(self.model)
+            if all(obj.pk for obj in created):
+                ids.update((key, obj.pk) for key, obj in zip(missing, created, strict=True))
+            else:
+                ids.update(self.model.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'pk'))
+        return ids
+
+    def get_id(self, name) -> int:
+        return self.ids[normalize_name(name)]
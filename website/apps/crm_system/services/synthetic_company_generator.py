@@ -0,0 +1,212 @@
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+CHUNK_SIZE = 10_000
+
+# Generated timestamps lie before this day, the same seed gives the same dates on any day.
+REFERENCE_DATE = date(2026, 1, 1)
+
+# Canton code: (approximate population in thousands, legal seats)
+CANTONS = {
+    'ZH': (1579, ['Zürich', 'Winterthur', 'Uster', 'Dübendorf', 'Adliswil']),
+    'BE': (1051, ['Bern', 'Biel/Bienne', 'Thun', 'Köniz']),
+    'VD': (831, ['Lausanne', 'Yverdon-les-Bains', 'Montreux', 'Nyon']),
+    'AG': (711, ['Aarau', 'Baden', 'Wettingen', 'Mägenwil']),
+    'SG': (519, ['St. Gallen', 'Rapperswil-Jona', 'Wil']),
+    'GE': (509, ['Genève', 'Vernier', 'Lancy']),
+    'LU': (420, ['Luzern', 'Emmen', 'Kriens']),
+    'TI': (354, ['Lugano', 'Bellinzona', 'Mezzovico-Vira', 'Locarno']),
+    'VS': (353, ['Sion', 'Sierre', 'Martigny', 'Visp']),
+    'FR': (329, ['Fribourg', 'Bulle', 'Murten']),
+    'BL': (292, ['Liestal', 'Allschwil', 'Aesch (BL)', 'Pratteln']),
+    'TG': (287, ['Frauenfeld', 'Kreuzlingen', 'Arbon']),
+    'SO': (281, ['Solothurn', 'Olten', 'Grenchen']),
+    'GR': (201, ['Chur', 'Davos', 'Landquart']),
+    'BS': (196, ['Basel', 'Riehen']),
+    'NE': (176, ['Neuchâtel', 'La Chaux-de-Fonds']),
+    'SZ': (164, ['Schwyz', 'Freienbach', 'Einsiedeln']),
+    'ZG': (129, ['Zug', 'Baar', 'Cham']),
+    'SH': (84, ['Schaffhausen', 'Neuhausen am Rheinfall']),
+    'JU': (74, ['Delémont', 'Porrentruy']),
+    'AR': (56, ['Herisau', 'Teufen (AR)']),
+    'NW': (44, ['Stans', 'Hergiswil (NW)']),
+    'GL': (41, ['Glarus', 'Näfels']),
+    'OW': (38, ['Sarnen', 'Kerns']),
+    'UR': (37, ['Altdorf (UR)', 'Erstfeld']),
+    'AI': (16, ['Appenzell']),
+}
+
+LEGAL_FORMS = {
+    'GmbH': 45,
+    'AG': 30,
+    'Einzelunternehmen': 15,
+    'Sagl': 3,
+    'Sàrl': 3,
+    'SA': 2,
+    'Genossenschaft': 1,
+    'Kollektivgesellschaft': 1,
+}
+
+COMPANY_TYPES = {
+    'Transport': 50,
+    'Umzug': 20,
+    'Logistik': 15,
+    'Kurier': 10,
+    'Spedition': 5,
+}
+
+SURNAMES = [
+    'Müller', 'Meier', 'Schmid', 'Keller', 'Weber', 'Huber', 'Schneider', 'Meyer', 'Steiner', 'Fischer',
+    'Gerber', 'Brunner', 'Baumann', 'Frei', 'Zimmermann', 'Moser', 'Widmer', 'Wyss', 'Graf', 'Roth',
+    'Rossi', 'Bianchi', 'Favre', 'Girard', 'Jost', 'Eichli', 'Bühler', 'Kälin', 'Suter', 'Ammann',
+]
+
+BUSINESS_WORDS = [
+    'Transport', 'Transporte', 'Umzüge', 'Logistik', 'Kurierdienst', 'Spedition', 'Express', 'Cargo', 'Trans', 'Mulden',
+]
+
+CONTACT_STATUSES = {
+    'decline': 50,
+    'repeat': 35,
+    'agreed': 15,
+}
+
+NOTES = [
+    'Bitte später zurückrufen',
+    'Kein Interesse',
+    'Offerte gesendet',
+    'Entscheider nicht erreichbar',
+    'Hat bereits einen Partner',
+]
+
+IMPORT_HEADERS = {
+    'title': 'Name',
+    'visited': 'Angerufen',
+    'description': 'Kommentar',
+    'in_liquidation': 'in Liquidation',
+    'canton': 'Kanton',
+    'legal_seat': 'Legal Seat ID',
+    'legal_form': 'Legal Form ID',
+    'type': 'Type',
+    'phone': 'Telefon',
+    'email': 'E-Mail',
+    'website': 'Website',
+}
+
+
+def _weights(values) -> np.ndarray:
+    weights = np.asarray(values, dtype=float)
+    return weights / weights.sum()
+
+
+def skewed_counts(rng: np.random.Generator, size: int, mean: float, skew: float) -> np.ndarray:
+    """
+    Per-company counts with the given mean. ``skew`` is the Pareto shape of
+    the per-company rate, smaller values give a heavier tail. ``0`` draws every
+    count from the same Poisson distribution.
+    """
+    if mean <= 0:
+        return np.zeros(size, dtype=int)
+    if skew <= 0:
+        return rng.poisson(mean, size)
+    rates = rng.pareto(skew, size) + 1
+    rates *= mean / rates.mean()
+    return rng.poisson(rates)
+
+
+class SyntheticCompanyGenerator:
+    """
+    Generates a deterministic dataset of ``count`` companies for a ``seed``.
+
+    Companies are produced in fixed-size chunks, each with its own random
+    generator derived from the seed and the chunk number, so the output does
+    not depend on how the caller batches database writes. Timestamps are
+    spread over the ``years`` before ``reference_date``.
+    """
+
+    def __init__(self, count: int, seed: int = 0, years: int = 5, reference_date: date = REFERENCE_DATE):
+        self.count = count
+        self.seed = seed
+        self.years = years
+        self.now = datetime.combine(reference_date, time(), tzinfo=UTC)
+        self.cantons = list(CANTONS)
+        self.canton_weights = _weights([population for population, _ in CANTONS.values()])
+
+    def rng(self, *key: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, *key])
+
+    def iter_companies(self) -> Iterator[pd.DataFrame]:
+        """
+        Yields chunks with the importer's canonical columns plus ``created_at``.
+        """
+        for chunk, start in enumerate(range(0, self.count, CHUNK_SIZE)):
+            yield self._companies(self.rng(0, chunk), min(CHUNK_SIZE, self.count - start))
+
+    def _companies(self, rng: np.random.Generator, size: int) -> pd.DataFrame:
+        cantons = rng.choice(self.cantons, size, p=self.canton_weights)
+        legal_seats = np.empty(size, dtype=object)
+        for canton in np.unique(cantons):
+            mask = cantons == canton
+            seats = CANTONS[canton][1]
+            # Larger towns host more companies.
+            legal_seats[mask] = rng.choice(seats, mask.sum(), p=_weights(1 / np.arange(1, len(seats) + 1)))
+        legal_forms = rng.choice(list(LEGAL_FORMS), size, p=_weights(list(LEGAL_FORMS.values())))
+        company_types = rng.choice(list(COMPANY_TYPES), size, p=_weights(list(COMPANY_TYPES.values())))
+
+        surnames = pd.Series(rng.choice(SURNAMES, size))
+        words = pd.Series(rng.choice(BUSINESS_WORDS, size))
+        numbers = pd.Series(rng.integers(1, 1000, size)).astype(str)
+        titles = surnames + ' ' + words + ' ' + numbers + ' ' + legal_forms
+        slugs = (surnames + '-' + words + numbers).str.lower().str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+
+        phones = pd.Series(
+            [f'+41 {area} {number // 10000:03d} {number // 100 % 100:02d} {number % 100:02d}'
+             for area, number in zip(rng.integers(21, 92, size), rng.integers(0, 10_000_000, size), strict=True)]
+        )
+        age = rng.uniform(0, self.years * 365, size)
+        return pd.DataFrame({
+            'title': titles,
+            'description': '',
+            'in_liquidation': rng.random(size) < 0.03,
+            'visited': False,
+            'canton': cantons,
+            'type': company_types,
+            'legal_seat': legal_seats,
+            'legal_form': legal_forms,
+            'phone': phones.where(rng.random(size) < 0.6, ''),
+            'email': ('info@' + slugs + '.ch').where(rng.random(size) < 0.4, ''),
+            'website': ('https://www.' + slugs + '.ch').where(rng.random(size) < 0.5, ''),
+            'created_at': [self.now - timedelta(days=days) for days in age],
+        })
+
+    def contact_counts(self, chunk: int, size: int, mean: float, skew: float) -> np.ndarray:
+        """
+        Number of contact records per company of a chunk, the same counts
+        :meth:`contact_records` draws.
+        """
+        return skewed_counts(self.rng(1, chunk), size, mean, skew)
+
+    def contact_records(self, chunk: int, company_ids, created_at, mean: float, skew: float) -> pd.DataFrame:
+        return self._history(self.rng(1, chunk), company_ids, created_at, mean, skew, {
+            'status': (list(CONTACT_STATUSES), _weights(list(CONTACT_STATUSES.values()))),
+        })
+
+    def notes(self, chunk: int, company_ids, created_at, mean: float, skew: float) -> pd.DataFrame:
+        return self._history(self.rng(2, chunk), company_ids, created_at, mean, skew, {
+            'note': (NOTES, None),
+        })
+
+    def _history(self, rng, company_ids, created_at, mean: float, skew: float, choices: dict) -> pd.DataFrame:
+        counts = skewed_counts(rng, len(company_ids), mean, skew)
+        company_ids = np.repeat(np.asarray(company_ids), counts)
+        created_at = np.repeat(np.asarray(created_at, dtype=object), counts)
+        history = pd.DataFrame({'company_id': company_ids})
+        for column, (values, weights) in choices.items():
+            history[column] = rng.choice(values, len(history), p=weights)
+        # Every entry lies between the company creation and the reference date.
+        offsets = rng.random(len(history))
+        history['at'] = [start + (self.now - start) * offset for start, offset in zip(created_at, offsets, strict=True)]
+        return history
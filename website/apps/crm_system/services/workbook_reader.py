@@ -0,0 +1,88 @@
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+
+
+class WorkbookReader:
+    """
+    Reads an XLSX workbook sheet by sheet without loading it into memory.
+
+    The first row of every sheet is treated as a header, the following rows
+    are yielded lazily as ``DataFrame`` chunks of at most ``chunk_size`` rows.
+    Empty rows are skipped and chunks are indexed by the worksheet row number.
+
+    The workbook is opened once, on first use, so its shared strings are only
+    parsed once. Use the reader as a context manager or call :meth:`close`.
+    """
+
+    def __init__(self, file_path: str | Path):
+        self.file_path = file_path
+        self._workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def workbook(self):
+        if self._workbook is None:
+            self._workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        return self._workbook
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+    def sheet_names(self) -> list[str]:
+        return self.workbook.sheetnames
+
+    def row_counts(self) -> dict[str, int | None]:
+        """
+        Approximate number of data rows per sheet taken from the sheet dimensions,
+        ``None`` when the workbook does not store them.
+        """
+        return {
+            sheet.title: max(sheet.max_row - 1, 0) if sheet.max_row else None
+            for sheet in self.workbook.worksheets
+        }
+
+    def iter_frames(
+        self,
+        chunk_size: int,
+        sheet_names: Iterable[str] | None = None,
+        start: tuple[str, int] | None = None,
+    ) -> Iterator[tuple[str, pd.DataFrame]]:
+        """
+        ``start`` is a ``(sheet, rows)`` position: sheets before ``sheet`` and
+        its first ``rows`` non-empty data rows are skipped.
+        """
+        workbook = self.workbook
+        sheets = workbook.worksheets if sheet_names is None else [workbook[name] for name in sheet_names]
+        skip_rows = 0
+        if start is not None:
+            start_sheet, skip_rows = start
+            titles = [sheet.title for sheet in sheets]
+            sheets = sheets[titles.index(start_sheet):] if start_sheet in titles else []
+        for sheet in sheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            columns = [str(column) if column is not None else '' for column in header]
+            rows = (
+                (number, values)
+                for number, values in enumerate(rows, start=2)
+                if any(value is not None for value in values)
+            )
+            if skip_rows:
+                rows = islice(rows, skip_rows, None)
+                skip_rows = 0
+            while chunk := list(islice(rows, chunk_size)):
+                numbers, records = zip(*chunk, strict=True)
+                yield sheet.title, pd.DataFrame.from_records(records, columns=columns, index=numbers)
@@ -0,0 +1,30 @@
+import pytest
+from django.core.cache import cache
+
+from apps.crm_system.models import Canton, Company, CompanyType, LegalForm, LegalSeat
+
+
+@pytest.fixture
+def query_cache(settings):
+    settings.QUERY_CACHE_ENABLED = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def create_company():
+    """
+    Creates a company of type "Bau" in an "AG" of Zürich, other fields can
+    be given as keyword arguments.
+    """
+    def create(title: str, canton: str = 'ZH', **fields) -> Company:
+        return Company.objects.create(
+            title=title,
+            type=CompanyType.objects.get_or_create(name='Bau')[0],
+            canton=Canton.objects.get_or_create(name=canton)[0],
+            legal_seat=LegalSeat.objects.get_or_create(name='Zürich')[0],
+            legal_form=LegalForm.objects.get_or_create(name='AG')[0],
+            **fields,
+        )
+    return create
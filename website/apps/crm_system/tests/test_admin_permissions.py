@@ -0,0 +1,84 @@
+import pytest
+from django.contrib import admin
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.core.admin import REQUEST_PERMISSIONS_ATTR
+from apps.crm_system.admin import CantonAdmin, CompanyAdmin
+from apps.crm_system.models import Canton, Company
+from apps.custom_user.models import CustomUser
+
+
+def create_user(status: str) -> CustomUser:
+    return CustomUser.objects.create(username=status, status=status)
+
+
+@pytest.mark.django_db
+def test_view_only_operator_is_denied_changes(client):
+    canton = Canton.objects.create(name='ZH')
+    client.force_login(create_user(CustomUser.Status.OPERATOR))
+    change_url = reverse('admin:crm_system_canton_change', args=[canton.pk])
+    assert client.get(reverse('admin:crm_system_canton_changelist')).status_code == 200
+    assert client.get(change_url).status_code == 200
+    assert client.get(reverse('admin:crm_system_canton_add')).status_code == 403
+    assert client.post(change_url, {'name': 'BE'}).status_code == 403
+    assert client.post(reverse('admin:crm_system_canton_delete', args=[canton.pk]), {'post': 'yes'}).status_code == 403
+    canton.refresh_from_db()
+    assert canton.name == 'ZH'
+
+
+@pytest.mark.django_db
+def test_manager_may_do_everything(client):
+    canton = Canton.objects.create(name='ZH')
+    client.force_login(create_user(CustomUser.Status.MANAGER))
+    assert client.get(reverse('admin:crm_system_canton_add')).status_code == 200
+    assert client.post(reverse('admin:crm_system_canton_change', args=[canton.pk]), {'name': 'BE'}).status_code == 302
+    assert client.post(reverse('admin:crm_system_canton_delete', args=[canton.pk]), {'post': 'yes'}).status_code == 302
+    assert not Canton.objects.exists()
+
+
+@pytest.mark.django_db
+def test_resolved_permissions_are_kept_per_user_and_admin():
+    operator = create_user(CustomUser.Status.OPERATOR)
+    manager = create_user(CustomUser.Status.MANAGER)
+    canton_admin = CantonAdmin(Canton, admin.site)
+    company_admin = CompanyAdmin(Company, admin.site)
+    request = RequestFactory().get('/')
+
+    request.user = operator
+    assert not canton_admin.has_add_permission(request)
+    assert canton_admin.has_view_permission(request)
+    assert company_admin.has_change_permission(request)
+    assert not company_admin.has_delete_permission(request)
+
+    # The same request object seen with another user does not reuse the operator's actions.
+    request.user = manager
+    assert canton_admin.has_add_permission(request)
+    assert company_admin.has_delete_permission(request)
+
+    assert set(request.__dict__[REQUEST_PERMISSIONS_ATTR]) == {
+        (CantonAdmin, operator.pk),
+        (CompanyAdmin, operator.pk),
+        (CantonAdmin, manager.pk),
+        (CompanyAdmin, manager.pk),
+    }
+
+
+@pytest.mark.django_db
+def test_permissions_are_resolved_once_per_request(monkeypatch):
+    canton_admin = CantonAdmin(Canton, admin.site)
+    calls = []
+    monkeypatch.setattr(
+        CantonAdmin,
+        'get_user_status_permissions',
+        lambda self, request: calls.append(request) or CantonAdmin.status_permissions[request.user.status],
+    )
+    operator = create_user(CustomUser.Status.OPERATOR)
+    for _ in range(2):
+        request = RequestFactory().get('/')
+        request.user = operator
+        for _ in range(3):
+            assert canton_admin.has_view_permission(request)
+            assert not canton_admin.has_change_permission(request)
+    # Once for each of the two requests.
+    assert len(calls) == 2
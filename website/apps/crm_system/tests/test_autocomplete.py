@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from django.contrib import admin
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.test import RequestFactory
+
+from apps.crm_system.models import Canton
+from apps.custom_user.models import CustomUser
+
+URL = '/admin/autocomplete/'
+
+
+def params(term: str = '') -> dict:
+    return {'term': term, 'app_label': 'crm_system', 'model_name': 'company', 'field_name': 'canton'}
+
+
+@pytest.fixture
+def operator():
+    return CustomUser.objects.create(username='operator', status=CustomUser.Status.OPERATOR)
+
+
+@pytest.fixture
+def cantons():
+    return [Canton.objects.create(name=name) for name in ['Zürich', 'Zug', 'Bern', 'Basel-Stadt']]
+
+
+def stock_results(user, term: str) -> dict:
+    request = RequestFactory().get(URL, params(term))
+    request.user = user
+    response = AutocompleteJsonView.as_view(admin_site=admin.site)(request)
+    return json.loads(response.content)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('term', ['', 'z', 'BASEL'])
+def test_results_match_stock_view(client, query_cache, operator, cantons, term):
+    client.force_login(operator)
+    response = client.get(URL, params(term))
+    assert response.status_code == 200
+    assert response.json() == stock_results(operator, term)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('enabled', [True, False])
+def test_target_view_permission_is_enforced(client, settings, cantons, enabled):
+    settings.QUERY_CACHE_ENABLED = enabled
+    # No status, no actions on the canton admin.
+    client.force_login(CustomUser.objects.create(username='nobody'))
+    assert client.get(URL, params()).status_code == 403
+
+
+def texts(client, term: str) -> list[str]:
+    return [result['text'] for result in client.get(URL, params(term)).json()['results']]
+
+
+@pytest.mark.django_db
+def test_added_reference_invalidates_index(client, query_cache, operator, cantons, django_capture_on_commit_callbacks):
+    client.force_login(operator)
+    assert texts(client, 'z') == ['Zug', 'Zürich']
+    # Served from the index, an update without signals is not seen.
+    Canton.objects.filter(name='Bern').update(name='Zernez')
+    assert texts(client, 'z') == ['Zug', 'Zürich']
+    with django_capture_on_commit_callbacks(execute=True):
+        Canton.objects.create(name='Zuoz')
+    assert texts(client, 'z') == ['Zernez', 'Zug', 'Zuoz', 'Zürich']
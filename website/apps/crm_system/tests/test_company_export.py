@@ -0,0 +1,68 @@
+import io
+from datetime import datetime
+
+import pytest
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from apps.crm_system.models import Company
+from apps.crm_system.services import company_export
+from apps.crm_system.services.company_export import CompanyExporter
+from apps.custom_user.models import CustomUser
+
+
+def read_workbook(parts) -> dict[str, list[tuple]]:
+    workbook = load_workbook(io.BytesIO(b''.join(parts)), read_only=True)
+    return {sheet.title: list(sheet.values) for sheet in workbook.worksheets}
+
+
+@pytest.mark.django_db
+def test_xlsx_keeps_cell_types(create_company):
+    create_company('Müller & Söhne <AG>', description='Holz\x01bau', in_liquidation=True)
+    exporter = CompanyExporter(Company.objects.all())
+    sheets = read_workbook(exporter.iter_xlsx())
+    assert list(sheets) == ['Companies']
+    header, row = sheets['Companies']
+    assert list(header) == exporter.header()
+    values = dict(zip(company_export.EXPORT_FIELDS, row, strict=True))
+    assert values['title'] == 'Müller & Söhne <AG>'
+    assert values['description'] == 'Holzbau'
+    assert values['canton'] == 'ZH'
+    assert values['in_liquidation'] is True
+    assert values['contact_records_count'] == 0
+    assert values['last_contacted_at'] is None
+    assert isinstance(values['created_at'], datetime)
+    assert values['created_at'] == next(exporter.rows())[-1]
+
+
+@pytest.mark.django_db
+def test_xlsx_streams_and_continues_on_new_sheets(create_company, monkeypatch):
+    monkeypatch.setattr(company_export, 'XLSX_MAX_ROWS', 3)
+    monkeypatch.setattr(company_export, 'XLSX_BUFFER_SIZE', 1)
+    for title in ['Alpha AG', 'Beta AG', 'Gamma AG', 'Delta AG', 'Epsilon AG']:
+        create_company(title)
+    parts = list(CompanyExporter(Company.objects.order_by('title')).iter_xlsx())
+    assert len(parts) > 2
+    sheets = read_workbook(parts)
+    assert list(sheets) == ['Companies', 'Companies (2)', 'Companies (3)']
+    assert [[row[0] for row in rows[1:]] for rows in sheets.values()] == [
+        ['Alpha AG', 'Beta AG'], ['Delta AG', 'Epsilon AG'], ['Gamma AG'],
+    ]
+
+
+@pytest.mark.django_db
+def test_xlsx_of_no_companies_has_header():
+    assert read_workbook(CompanyExporter(Company.objects.none()).iter_xlsx()) == {
+        'Companies': [tuple(CompanyExporter(Company.objects.none()).header())],
+    }
+
+
+@pytest.mark.django_db
+def test_export_view_streams_xlsx(create_company, client):
+    create_company('Alpha AG')
+    client.force_login(CustomUser.objects.create(username='manager', status=CustomUser.Status.MANAGER))
+    response = client.get(reverse('admin:crm_system_company_export', args=['xlsx']))
+    assert response.status_code == 200
+    assert response.streaming
+    assert 'attachment' in response['Content-Disposition']
+    assert read_workbook(response.streaming_content)['Companies'][1][0] == 'Alpha AG'
@@ -0,0 +1,103 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+
+from apps.core.paginators import InvalidCursor
+from apps.crm_system.models import (
+    Company,
+    CompanyContactRecord,
+    CompanyDeletion,
+    CompanyNote,
+)
+from apps.crm_system.services.company_feed import CompanyFeed
+from apps.custom_user.models import CustomUser
+
+
+def feed(**kwargs) -> CompanyFeed:
+    return CompanyFeed(Company.objects.all(), chunk_size=2, settle_time=timedelta(0), **kwargs)
+
+
+@pytest.mark.django_db
+def test_rows_resume_after_cursor(create_company):
+    for title in ['Alpha AG', 'Beta AG', 'Gamma AG']:
+        create_company(title)
+    rows = list(feed().rows())
+    assert [row['title'] for row in rows] == ['Alpha AG', 'Beta AG', 'Gamma AG']
+    assert [row['title'] for row in feed().rows(rows[0]['cursor'])] == ['Beta AG', 'Gamma AG']
+    assert list(feed().rows(rows[-1]['cursor'])) == []
+
+
+@pytest.mark.django_db
+def test_updated_rows_come_again(create_company):
+    alpha = create_company('Alpha AG')
+    create_company('Beta AG')
+    cursor = list(feed().rows())[-1]['cursor']
+    alpha.description = 'Holzbau'
+    alpha.save()
+    assert [row['title'] for row in feed().rows(cursor)] == ['Alpha AG']
+
+
+@pytest.mark.django_db
+def test_rows_within_settle_time_are_held_back(create_company):
+    create_company('Alpha AG')
+    assert list(CompanyFeed(Company.objects.all()).rows()) == []
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_raises_before_reading():
+    with pytest.raises(InvalidCursor):
+        feed().rows('not-a-cursor')
+    with pytest.raises(InvalidCursor):
+        feed().deletions('not-a-cursor')
+
+
+@pytest.mark.django_db
+def test_deletions_report_deleted_companies(create_company):
+    alpha = create_company('Alpha AG')
+    beta = create_company('Beta AG')
+    alpha_id = alpha.pk
+    alpha.delete()
+    deletions = list(feed().deletions())
+    assert [row['id'] for row in deletions] == [alpha_id]
+    Company.objects.filter(pk=beta.pk).delete()
+    assert [row['id'] for row in feed().deletions(deletions[-1]['cursor'])] == [beta.pk]
+
+
+@pytest.mark.django_db
+def test_delete_with_tombstones_removes_history(create_company):
+    alpha = create_company('Alpha AG')
+    beta = create_company('Beta AG')
+    CompanyContactRecord.objects.create(company=alpha, status='agreed')
+    CompanyNote.objects.create(company=alpha, note='Call back')
+    assert Company.objects.filter(pk=alpha.pk).delete_with_tombstones() == 1
+    assert list(Company.objects.values_list('pk', flat=True)) == [beta.pk]
+    assert not CompanyContactRecord.objects.exists()
+    assert not CompanyNote.objects.exists()
+    assert list(CompanyDeletion.objects.values_list('company_id', 'import_key')) == [(alpha.pk, alpha.import_key)]
+
+
+@pytest.mark.django_db
+def test_refresh_contact_summary_touches_changed_companies_only(create_company):
+    alpha = create_company('Alpha AG')
+    beta = create_company('Beta AG')
+    CompanyContactRecord.objects.create(company=alpha, status='agreed')
+    assert Company.objects.refresh_contact_summary() == 1
+    alpha.refresh_from_db()
+    assert alpha.last_contact_status == 'agreed'
+    assert alpha.contact_records_count == 1
+    assert Company.objects.get(pk=beta.pk).updated_at == beta.updated_at
+    assert Company.objects.refresh_contact_summary() == 0
+    assert Company.objects.get(pk=alpha.pk).updated_at == alpha.updated_at
+
+
+@pytest.mark.django_db
+def test_deletion_feed_view(create_company, client):
+    company = create_company('Alpha AG')
+    CompanyDeletion.objects.create(company_id=company.pk, deleted_at=company.created_at - timedelta(minutes=1))
+    client.force_login(CustomUser.objects.create(username='manager', status=CustomUser.Status.MANAGER))
+    response = client.get(reverse('company_deletion_feed'))
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+    assert [row['id'] for row in rows] == [company.pk]
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from apps.crm_system.services.company_frame_mapper import (
+    MissingColumnError,
+    factorize_references,
+    from_batch,
+    map_company_frame,
+    to_batch,
+)
+from apps.crm_system.services.import_keys import make_import_key
+
+COLUMNS = {
+    'title': 'Title',
+    'type': 'Type',
+    'canton': 'Canton',
+    'legal_seat': 'Seat',
+    'legal_form': 'Form',
+    'liquidation': 'Liquidation',
+    'visited': 'Visited',
+    'email': 'Email',
+}
+
+
+def frame(**columns) -> pd.DataFrame:
+    data = {'Title': [' Alpha AG '], 'Type': ['Bau'], 'Canton': ['ZH'], 'Seat': ['Zürich'], 'Form': ['AG'], **columns}
+    return pd.DataFrame(data, index=range(2, len(data['Title']) + 2))
+
+
+def test_map_coerces_and_defaults_columns():
+    mapped = map_company_frame(frame(Liquidation=['ja'], Visited=['nein'], Email=[None]), COLUMNS)
+    row = mapped.loc[2]
+    assert row['title'] == 'Alpha AG'
+    assert row['legal_seat'] == 'Zürich'
+    assert (row['in_liquidation'], row['visited']) == (True, False)
+    assert (row['email'], row['phone'], row['description']) == ('', '', '')
+    assert row['import_key'] == make_import_key('Alpha AG', 'Zürich', 'AG')
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('', False), ('0', False), ('no', False), ('Nein', False), (None, False), (float('nan'), False),
+    ('1', True), ('x', True), ('yes', True),
+])
+def test_map_reads_booleans(value, expected):
+    assert map_company_frame(frame(Liquidation=[value]), COLUMNS).loc[2, 'in_liquidation'] == expected
+
+
+def test_map_uses_key_column():
+    mapped = map_company_frame(frame(Key=[' CHE-1 ']), {**COLUMNS, 'key': 'Key'})
+    assert mapped.loc[2, 'import_key'] == make_import_key('CHE-1')
+
+
+def test_map_reports_every_missing_column():
+    with pytest.raises(MissingColumnError, match='Columns not found: Seat, Key'):
+        map_company_frame(frame().drop(columns='Seat'), {**COLUMNS, 'key': 'Key'})
+
+
+def test_factorize_references_ignores_case():
+    mapped = map_company_frame(frame(Title=['A', 'B', 'C'], Type=['Bau'] * 3, Canton=['ZH', 'zh', 'BE'],
+                                     Seat=['Zürich'] * 3, Form=['AG'] * 3), COLUMNS)
+    codes, uniques = factorize_references(mapped, 'canton')
+    assert list(codes) == [0, 0, 1]
+    assert list(uniques) == ['zh', 'be']
+
+
+def test_batch_round_trip_keeps_rows_and_types():
+    mapped = map_company_frame(frame(Liquidation=['1']), COLUMNS)
+    restored = from_batch(to_batch(mapped))
+    pd.testing.assert_frame_equal(restored, mapped)
@@ -0,0 +1,53 @@
+import pytest
+from openpyxl import Workbook
+
+from apps.crm_system.models import Company
+from apps.crm_system.services.company_import_service import CompanyImportService
+from apps.crm_system.services.company_loaders import ImportMode, LoaderBackend
+
+COLUMNS = {'title': 'Title', 'type': 'Type', 'canton': 'Canton', 'legal_seat': 'Seat', 'legal_form': 'Form'}
+
+SHEETS = {'ZH': 5, 'BE': 0, 'AG': 3}
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for canton, rows in SHEETS.items():
+        sheet = workbook.create_sheet(canton)
+        sheet.append(list(COLUMNS.values()))
+        for number in range(rows):
+            sheet.append([f'{canton} Company {number}', 'Bau', canton, f'{canton} Seat', 'AG'])
+            if number == 1:
+                sheet.append([None] * len(COLUMNS))
+    path = tmp_path / 'companies.xlsx'
+    workbook.save(path)
+    return path
+
+
+def import_file(path, workers: int, start=None) -> list[tuple[str, str]]:
+    service = CompanyImportService(COLUMNS, mode=ImportMode.REPLACE, loader=LoaderBackend.ORM, batch_size=2)
+    assert service.import_file(path, workers=workers, start=start) == Company.objects.count()
+    return list(Company.objects.order_by('pk').values_list('title', 'canton__name'))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('workers', [1, 2])
+def test_import_file_keeps_sheet_and_row_order(workbook_path, workers):
+    companies = import_file(workbook_path, workers)
+    assert companies == [(f'{canton} Company {number}', canton) for canton, rows in SHEETS.items() for number in range(rows)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('workers', [1, 2])
+def test_import_file_resumes_from_position(workbook_path, workers):
+    companies = import_file(workbook_path, workers, start=('ZH', 3))
+    assert [title for title, _ in companies] == ['ZH Company 3', 'ZH Company 4', *(f'AG Company {number}' for number in range(3))]
+
+
+@pytest.mark.django_db
+def test_parallel_import_reports_worker_errors(workbook_path):
+    service = CompanyImportService({**COLUMNS, 'title': 'Name'}, loader=LoaderBackend.ORM)
+    with pytest.raises(ValueError, match='Columns not found: Name'):
+        service.import_file(workbook_path, workers=2)
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from apps.crm_system.services.company_import_validator import REPORT_COLUMNS, CompanyImportValidator
+
+COLUMNS = {
+    'title': 'Title',
+    'type': 'Type',
+    'canton': 'Canton',
+    'legal_seat': 'Seat',
+    'legal_form': 'Form',
+    'email': 'Email',
+    'website': 'Website',
+}
+
+
+def frame(*rows) -> pd.DataFrame:
+    return pd.DataFrame(
+        [{'Title': title, 'Type': 'Bau', 'Canton': 'ZH', 'Seat': 'Zürich', 'Form': 'AG', 'Email': email, 'Website': website}
+         for title, email, website in rows],
+        index=range(2, len(rows) + 2),
+    )
+
+
+def errors(report: pd.DataFrame) -> list[tuple]:
+    return list(report[['row', 'column', 'level', 'error']].itertuples(index=False, name=None))
+
+
+def test_valid_rows_report_nothing():
+    report = CompanyImportValidator(COLUMNS).validate('ZH', frame(('Alpha AG', 'info@alpha.ch', 'https://alpha.ch')))
+    assert list(report.columns) == REPORT_COLUMNS
+    assert report.empty
+
+
+def test_reports_errors_per_row_in_row_order():
+    report = CompanyImportValidator(COLUMNS).validate('ZH', frame(
+        ('Alpha AG', 'info@alpha', ''),
+        ('', '', 'alpha.ch'),
+        ('A' * 256, '', ''),
+    ))
+    assert errors(report) == [
+        (2, 'Email', 'error', 'invalid_email'),
+        (3, 'Title', 'error', 'empty'),
+        (3, 'Website', 'error', 'invalid_url'),
+        (4, 'Title', 'error', 'longer_than_255'),
+    ]
+    assert set(report['sheet']) == {'ZH'}
+
+
+def test_unknown_references_are_warnings():
+    known = {'canton': {'zh'}, 'type': {'bau'}, 'legal_seat': set(), 'legal_form': {'ag'}}
+    report = CompanyImportValidator(COLUMNS, known).validate('ZH', frame(('Alpha AG', '', '')))
+    assert errors(report) == [(2, 'Seat', 'warning', 'unknown_reference')]
+
+
+def test_missing_columns_are_reported_once_per_sheet():
+    validator = CompanyImportValidator(COLUMNS)
+    chunk = frame(('Alpha AG', '', '')).drop(columns='Form')
+    assert errors(validator.validate('ZH', chunk)) == [(None, None, 'error', 'missing_columns')]
+    assert validator.validate('ZH', chunk).empty
+    assert len(validator.validate('BE', chunk)) == 1
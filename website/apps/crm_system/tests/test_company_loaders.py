@@ -0,0 +1,121 @@
+import importlib
+
+import pandas as pd
+import pytest
+from django.apps import apps
+
+from apps.crm_system.models import Canton, Company, CompanyContactRecord, CompanyType, LegalForm, LegalSeat
+from apps.crm_system.services.company_import_service import CompanyImportService
+from apps.crm_system.services.company_loaders import ImportMode, LoaderBackend
+from apps.crm_system.services.import_keys import make_import_key
+
+COLUMNS = {
+    'title': 'Title',
+    'type': 'Type',
+    'canton': 'Canton',
+    'legal_seat': 'Seat',
+    'legal_form': 'Form',
+    'visited': 'Visited',
+    'phone': 'Phone',
+}
+
+
+def frame(*rows) -> pd.DataFrame:
+    return pd.DataFrame(
+        [{'Title': title, 'Type': 'Bau', 'Canton': 'ZH', 'Seat': 'Zürich', 'Form': 'AG', 'Visited': visited, 'Phone': phone}
+         for title, phone, visited in rows],
+        index=range(2, len(rows) + 2),
+    )
+
+
+def import_frames(mode: str, *frames: pd.DataFrame) -> CompanyImportService:
+    service = CompanyImportService(COLUMNS, status='agreed', mode=mode, loader=LoaderBackend.ORM)
+    service.import_frames(frames)
+    return service
+
+
+@pytest.mark.django_db
+def test_replace_inserts_rows_and_contact_records():
+    service = import_frames(ImportMode.REPLACE, frame(('Alpha AG', '044', 'yes'), ('Beta AG', '', '')))
+    assert Company.objects.count() == 2
+    assert service.stats['created'] == 2
+    alpha = Company.objects.get(title='Alpha AG')
+    assert alpha.import_key
+    assert alpha.contact_records_count == 1
+    assert alpha.last_contact_status == 'agreed'
+
+
+@pytest.mark.django_db
+def test_upsert_updates_changed_and_skips_unchanged():
+    import_frames(ImportMode.REPLACE, frame(('Alpha AG', '044', ''), ('Beta AG', '', '')))
+    service = import_frames(ImportMode.UPSERT, frame(('Alpha AG', '043', ''), ('Beta AG', '', ''), ('Gamma AG', '', '')))
+    assert Company.objects.count() == 3
+    assert Company.objects.get(title='Alpha AG').phone == '043'
+    assert (service.stats['created'], service.stats['updated'], service.stats['unchanged']) == (1, 1, 1)
+
+
+@pytest.mark.django_db
+def test_upsert_counts_duplicate_keys_once():
+    service = import_frames(ImportMode.UPSERT, frame(('Alpha AG', '', ''), ('ALPHA AG', '', '')))
+    assert Company.objects.count() == 1
+    assert service.stats['duplicates'] == 1
+
+
+@pytest.mark.django_db
+def test_upsert_matches_companies_created_by_hand():
+    Company.objects.create(
+        title='Alpha AG',
+        type=CompanyType.objects.create(name='Bau'),
+        canton=Canton.objects.create(name='ZH'),
+        legal_seat=LegalSeat.objects.create(name='Zürich'),
+        legal_form=LegalForm.objects.create(name='AG'),
+    )
+    import_frames(ImportMode.UPSERT, frame(('alpha ag', '', 'yes')))
+    assert Company.objects.count() == 1
+    assert CompanyContactRecord.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_upsert_matches_companies_without_key_after_migration():
+    import_frames(ImportMode.REPLACE, frame(('Alpha AG', '', ''), ('Beta AG', '', '')))
+    Company.objects.update(import_key='')
+    migration = importlib.import_module('apps.crm_system.migrations.0014_fill_company_import_key')
+    migration.fill_import_keys(apps, None)
+    assert not Company.objects.filter(import_key='').exists()
+
+    service = import_frames(ImportMode.UPSERT, frame(('Alpha AG', '', 'yes'), ('Beta AG', '', '')))
+    assert Company.objects.count() == 2
+    assert service.stats['unchanged'] == 2
+    assert CompanyContactRecord.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_upsert_matches_titles_folded_beyond_ascii():
+    import_frames(ImportMode.REPLACE, frame(('Strassenbau Müller AG', '', '')))
+    service = import_frames(ImportMode.UPSERT, frame(('STRAßENBAU MÜLLER AG', '', '')))
+    assert Company.objects.count() == 1
+    assert service.stats['updated'] == 1
+
+
+@pytest.mark.django_db
+def test_migration_refolds_lowered_import_keys():
+    import_frames(ImportMode.REPLACE, frame(('Straßenbau AG', '', ''), ('Beta AG', '', '')))
+    migration = importlib.import_module('apps.crm_system.migrations.0018_refold_company_import_key')
+    seat, form = 'Zürich', 'AG'
+    Company.objects.filter(title='Straßenbau AG').update(
+        import_key=migration.make_lowered_import_key('Straßenbau AG', seat, form),
+    )
+    Company.objects.filter(title='Beta AG').update(import_key='registry-key')
+    migration.refold_import_keys(apps, None)
+    assert dict(Company.objects.values_list('title', 'import_key')) == {
+        'Straßenbau AG': make_import_key('Strassenbau AG', seat, form),
+        'Beta AG': 'registry-key',
+    }
+
+
+@pytest.mark.django_db
+def test_flag_missing_delists_companies_not_in_file():
+    import_frames(ImportMode.REPLACE, frame(('Alpha AG', '', ''), ('Beta AG', '', '')))
+    service = import_frames(ImportMode.UPSERT, frame(('Alpha AG', '', '')))
+    assert service.flag_missing() == 1
+    assert list(Company.objects.filter(delisted_at__isnull=False).values_list('title', flat=True)) == ['Beta AG']
@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+
+from apps.crm_system.models import Company
+from apps.crm_system.services.company_search import SQLITE_TRIGGERS, SqliteCompanySearchBackend
+
+pytestmark = pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 index of SQLite')
+
+
+def search(term: str) -> list[str]:
+    queryset = SqliteCompanySearchBackend().search(Company.objects.all(), term)
+    return list(queryset.order_by('-search_rank').values_list('title', flat=True))
+
+
+@pytest.mark.django_db
+def test_search_prefix_matches_every_word(create_company):
+    create_company('Muster Holz AG')
+    create_company('Muster Stahl AG')
+    assert search('must hol') == ['Muster Holz AG']
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_over_description(create_company):
+    create_company('Alpha AG', description='Holzbau und Zimmerei')
+    create_company('Holzbau Beta AG', description='Zimmerei')
+    assert search('holzbau') == ['Holzbau Beta AG', 'Alpha AG']
+
+
+@pytest.mark.django_db
+def test_search_follows_updates_and_deletes(create_company):
+    company = create_company('Alpha AG')
+    company.title = 'Gamma AG'
+    company.save()
+    assert search('alpha') == []
+    assert search('gamma') == ['Gamma AG']
+    company.delete()
+    assert search('gamma') == []
+
+
+@pytest.mark.django_db
+def test_rebuild_recreates_dropped_triggers(create_company):
+    name = next(iter(SQLITE_TRIGGERS))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TRIGGER {name}')
+    assert SqliteCompanySearchBackend().rebuild() == [name]
+    create_company('Alpha AG')
+    assert search('alpha') == ['Alpha AG']
+    assert SqliteCompanySearchBackend().rebuild() == []
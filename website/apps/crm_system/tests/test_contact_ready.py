@@ -0,0 +1,36 @@
+import pytest
+
+from apps.crm_system.models import Company, CompanyContactRecord
+
+
+@pytest.fixture
+def companies(create_company):
+    create_company('No Contact AG')
+    create_company('Phone AG', phone='+41 44 000 00 00')
+    create_company('Email AG', email='info@email.ch')
+    contacted = create_company('Contacted AG', phone='+41 44 000 00 01')
+    CompanyContactRecord.objects.create(company=contacted, status=CompanyContactRecord.Status.REPEAT)
+    Company.objects.refresh_contact_summary()
+
+
+def titles(queryset) -> list[str]:
+    return sorted(queryset.values_list('title', flat=True))
+
+
+@pytest.mark.django_db
+def test_filter_reads_stored_records_count(companies):
+    ready = Company.objects.filter_contact_ready_status(status=True)
+    assert titles(ready) == ['Email AG', 'Phone AG']
+    assert titles(Company.objects.filter_contact_ready_status(status=False)) == ['Contacted AG', 'No Contact AG']
+    sql = str(ready.query)
+    assert CompanyContactRecord._meta.db_table not in sql
+    assert 'GROUP BY' not in sql
+
+
+@pytest.mark.django_db
+def test_annotation_matches_filter_without_join(companies):
+    annotated = Company.objects.annotate_contact_ready_status()
+    assert titles(annotated.filter(contact_ready=True)) == ['Email AG', 'Phone AG']
+    sql = str(annotated.query)
+    assert 'JOIN' not in sql
+    assert 'GROUP BY' not in sql
@@ -0,0 +1,83 @@
+import pytest
+from django.urls import reverse
+
+from apps.crm_system.models import Company, CompanyContactRecord
+from apps.custom_user.models import CustomUser
+
+Status = CompanyContactRecord.Status
+
+
+def change_form_data(response) -> dict:
+    """
+    The change form as the browser would post it unchanged.
+    """
+    forms = [response.context['adminform'].form]
+    for inline_admin_formset in response.context['inline_admin_formsets']:
+        forms.append(inline_admin_formset.formset.management_form)
+        forms.extend(inline_admin_formset.formset.forms)
+    data = {}
+    for form in forms:
+        for name in form.fields:
+            value = form[name].value()
+            if value is True:
+                data[form.add_prefix(name)] = 'on'
+            elif value is not None and value is not False:
+                data[form.add_prefix(name)] = value
+    return data
+
+
+@pytest.fixture
+def company(create_company):
+    return create_company('Alpha AG')
+
+
+@pytest.fixture
+def post_change_form(client, company):
+    client.force_login(CustomUser.objects.create(username='operator', status=CustomUser.Status.OPERATOR))
+    url = reverse('admin:crm_system_company_change', args=[company.pk])
+
+    def post(**changes):
+        data = {**change_form_data(client.get(url)), **changes}
+        response = client.post(url, data)
+        assert response.status_code == 302, response.context['errors'] if response.context else response
+        company.refresh_from_db()
+    return post
+
+
+def add_record(company, status: str) -> CompanyContactRecord:
+    record = CompanyContactRecord.objects.create(company=company, status=status)
+    Company.objects.filter(pk=company.pk).refresh_contact_summary()
+    return record
+
+
+@pytest.mark.django_db
+def test_inline_add_refreshes_summary(company, post_change_form):
+    post_change_form(**{
+        'contact_records-TOTAL_FORMS': 1,
+        'contact_records-0-status': Status.AGREED,
+        'contact_records-0-company': company.pk,
+    })
+    record = company.contact_records.get()
+    assert record.user.username == 'operator'
+    assert (company.contact_records_count, company.last_contact_status) == (1, Status.AGREED)
+    assert company.last_contacted_at == record.contacted_at
+
+
+@pytest.mark.django_db
+def test_inline_edit_refreshes_summary(company, post_change_form):
+    add_record(company, Status.DECLINE)
+    latest = add_record(company, Status.REPEAT)
+    post_change_form(**{'contact_records-0-status': Status.AGREED})
+    latest.refresh_from_db()
+    assert latest.status == Status.AGREED
+    assert (company.contact_records_count, company.last_contact_status) == (2, Status.AGREED)
+
+
+@pytest.mark.django_db
+def test_inline_delete_refreshes_summary(company, post_change_form):
+    first = add_record(company, Status.DECLINE)
+    add_record(company, Status.REPEAT)
+    # The newest record is listed first.
+    post_change_form(**{'contact_records-0-DELETE': 'on'})
+    assert (company.contact_records_count, company.last_contact_status) == (1, Status.DECLINE)
+    assert company.last_contacted_at == first.contacted_at
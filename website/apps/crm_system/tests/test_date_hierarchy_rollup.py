@@ -0,0 +1,100 @@
+from datetime import date, datetime
+
+import pytest
+from django.contrib import admin
+from django.test import RequestFactory
+from django.utils import timezone
+
+from apps.core.templatetags.admin_rollups import rollup_date_hierarchy
+from apps.crm_system.admin import CompanyAdmin
+from apps.crm_system.models import Company, CompanyDailyCount
+from apps.custom_user.models import CustomUser
+
+DAYS = [date(2023, 12, 31), date(2024, 3, 1), date(2024, 3, 15), date(2024, 3, 15), date(2024, 5, 2)]
+
+
+@pytest.fixture
+def manager():
+    return CustomUser.objects.create(username='manager', status=CustomUser.Status.MANAGER)
+
+
+@pytest.fixture
+def companies(create_company):
+    for number, day in enumerate(DAYS):
+        company = create_company(f'Company {number}')
+        created_at = timezone.make_aware(datetime(day.year, day.month, day.day, 12))
+        Company.objects.filter(pk=company.pk).update(created_at=created_at)
+    CompanyDailyCount.objects.rebuild()
+
+
+def stored_counts() -> dict[date, int]:
+    return dict(CompanyDailyCount.objects.values_list('day', 'companies'))
+
+
+def changelist(user, **params):
+    request = RequestFactory().get('/', params)
+    request.user = user
+    return CompanyAdmin(Company, admin.site).get_changelist_instance(request)
+
+
+def hierarchy(user, **params) -> dict:
+    return rollup_date_hierarchy(changelist(user, **params))
+
+
+def titles(hierarchy: dict) -> list[str]:
+    return [choice['title'] for choice in hierarchy['choices']]
+
+
+@pytest.mark.django_db
+def test_drill_down_reads_daily_counts(companies, manager, django_assert_num_queries):
+    # A day only the rollup knows of shows that no other query is made.
+    CompanyDailyCount.objects.create(day=date(2022, 6, 1), companies=1)
+    unfiltered = changelist(manager)
+    with django_assert_num_queries(1):
+        assert titles(rollup_date_hierarchy(unfiltered)) == ['2022', '2023', '2024']
+    months = hierarchy(manager, created_at__year='2024')['choices']
+    assert [choice['link'] for choice in months] == [
+        '?created_at__month=3&created_at__year=2024',
+        '?created_at__month=5&created_at__year=2024',
+    ]
+    days = hierarchy(manager, created_at__year='2024', created_at__month='3')['choices']
+    assert [choice['link'] for choice in days] == [
+        '?created_at__day=1&created_at__month=3&created_at__year=2024',
+        '?created_at__day=15&created_at__month=3&created_at__year=2024',
+    ]
+    days = hierarchy(manager, created_at__year='2024', created_at__month='3', created_at__day='15')
+    assert days['back'] is not None
+    assert len(days['choices']) == 1
+
+
+@pytest.mark.django_db
+def test_filtered_changelist_falls_back_to_the_admin_hierarchy(companies, manager):
+    CompanyDailyCount.objects.create(day=date(2022, 6, 1), companies=1)
+    assert titles(hierarchy(manager, in_liquidation__exact='0')) == ['2023', '2024']
+
+
+@pytest.mark.django_db
+def test_admin_writes_keep_daily_counts(companies, manager):
+    model_admin = CompanyAdmin(Company, admin.site)
+    request = RequestFactory().post('/')
+    request.user = manager
+    assert stored_counts() == Company.objects.daily_counts()
+
+    company = Company(title='Delta AG', **{
+        field: getattr(Company.objects.first(), field)
+        for field in ['type', 'canton', 'legal_seat', 'legal_form']
+    })
+    model_admin.save_model(request, company, form=None, change=False)
+    assert stored_counts() == Company.objects.daily_counts()
+    assert stored_counts()[timezone.localdate()] == 1
+
+    company.title = 'Delta GmbH'
+    model_admin.save_model(request, company, form=None, change=True)
+    assert stored_counts() == Company.objects.daily_counts()
+
+    model_admin.delete_model(request, company)
+    assert stored_counts() == Company.objects.daily_counts()
+    assert timezone.localdate() not in stored_counts()
+
+    model_admin.delete_queryset(request, Company.objects.filter(created_at__year=2024))
+    assert stored_counts() == Company.objects.daily_counts() == {date(2023, 12, 31): 1}
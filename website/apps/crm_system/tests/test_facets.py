@@ -0,0 +1,45 @@
+import pytest
+from django.urls import reverse
+
+from apps.crm_system.admin import CompanyAdmin
+from apps.crm_system.models import Canton, Company
+from apps.custom_user.models import CustomUser
+
+
+@pytest.mark.django_db
+def test_count_groups_by_field(create_company):
+    alpha = create_company('Alpha AG', 'ZH')
+    create_company('Beta AG', 'ZH', in_liquidation=True)
+    beta = create_company('Gamma AG', 'BE', in_liquidation=True)
+    counter = CompanyAdmin.facet_counter
+    assert counter.count(Company.objects.all(), 'canton') == {alpha.canton_id: 2, beta.canton_id: 1}
+    assert counter.count(Company.objects.all(), 'in_liquidation') == {False: 1, True: 2}
+    assert counter.count(Company.objects.all(), 'legal_form') == {alpha.legal_form_id: 3}
+
+
+@pytest.mark.django_db
+def test_changelist_labels_filters_with_counts(create_company, client):
+    create_company('Alpha AG', 'ZH')
+    create_company('Beta AG', 'BE', in_liquidation=True)
+    client.force_login(CustomUser.objects.create(username='manager', status=CustomUser.Status.MANAGER))
+    response = client.get(reverse('admin:crm_system_company_changelist'))
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert 'ZH (1)' in content
+    assert 'BE (1)' in content
+
+
+@pytest.mark.django_db
+def test_selected_option_keeps_counts_of_other_options(create_company, client):
+    create_company('Alpha AG', 'ZH')
+    create_company('Beta AG', 'ZH', in_liquidation=True)
+    create_company('Gamma AG', 'BE', in_liquidation=True)
+    client.force_login(CustomUser.objects.create(username='manager', status=CustomUser.Status.MANAGER))
+    response = client.get(reverse('admin:crm_system_company_changelist'), {'canton__id__exact': Canton.objects.get(name='ZH').pk})
+    assert response.status_code == 200
+    content = response.content.decode()
+    # The canton filter ignores its own selection, the others count within it.
+    assert 'ZH (2)' in content
+    assert 'BE (1)' in content
+    assert 'Yes (1)' in content
+    assert 'No (1)' in content
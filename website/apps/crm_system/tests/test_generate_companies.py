@@ -0,0 +1,33 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+from django.core.management import call_command
+
+from apps.crm_system.models import Company
+from apps.crm_system.services.company_frame_mapper import map_company_frame
+from apps.crm_system.services.synthetic_company_generator import IMPORT_HEADERS, SyntheticCompanyGenerator
+
+
+def test_generator_is_deterministic_for_a_seed():
+    first, = SyntheticCompanyGenerator(50, seed=7).iter_companies()
+    second, = SyntheticCompanyGenerator(50, seed=7).iter_companies()
+    pd.testing.assert_frame_equal(first, second)
+    assert first['created_at'].max() < pd.Timestamp('2026-01-01', tz='UTC')
+
+
+def test_generator_ends_history_at_reference_date():
+    generator = SyntheticCompanyGenerator(50, seed=7, reference_date=date(2020, 6, 1))
+    companies, = generator.iter_companies()
+    records = generator.contact_records(0, range(50), companies['created_at'], 2.0, 1.5)
+    assert records['at'].max() <= pd.Timestamp('2020-06-01', tz='UTC')
+
+
+@pytest.mark.django_db
+def test_generated_companies_get_the_import_key_of_their_row():
+    call_command('generate_companies', companies=20, seed=3)
+    companies, = SyntheticCompanyGenerator(20, seed=3).iter_companies()
+    frame = companies.rename(columns=IMPORT_HEADERS)
+    columns = {attribute: header for attribute, header in IMPORT_HEADERS.items() if attribute != 'visited'}
+    keys = map_company_frame(frame, columns)['import_key']
+    assert sorted(Company.objects.values_list('import_key', flat=True)) == sorted(keys)
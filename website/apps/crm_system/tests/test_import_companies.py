@@ -0,0 +1,101 @@
+import pytest
+from django.core.management import CommandError, call_command
+from openpyxl import Workbook
+
+from apps.crm_system.models import Company, CompanyDeletion, CompanyImportRun
+
+OPTIONS = ['--title=Title', '--type=Type', '--canton=Canton', '--legal_seat=Seat', '--legal_form=Form']
+
+
+def write_workbook(path, titles):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'ZH'
+    sheet.append(['Title', 'Type', 'Canton', 'Seat', 'Form'])
+    for title in titles:
+        sheet.append([title, 'Bau', 'ZH', 'Zürich', 'AG'])
+    workbook.save(path)
+    return path
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    return write_workbook(tmp_path / 'companies.xlsx', ['Alpha AG', 'Beta AG', 'Gamma AG'])
+
+
+def import_companies(path, *args):
+    call_command('import_companies', f'--file={path}', *OPTIONS, *args, progress_interval=0)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('args', [
+    ['--checkpoint', '--mode=upsert', '--flag-missing'],
+    ['--checkpoint', '--flag-missing'],
+    ['--checkpoint', '--loader=copy'],
+])
+def test_rejected_invocations_leave_no_run(workbook_path, args):
+    with pytest.raises(CommandError):
+        import_companies(workbook_path, *args)
+    assert not CompanyImportRun.objects.exists()
+
+
+@pytest.mark.django_db
+def test_checkpointed_run_records_file(workbook_path):
+    import_companies(workbook_path, '--checkpoint', '--batch-size=2')
+    run = CompanyImportRun.objects.get()
+    assert (run.status, run.last_sheet, run.last_row, run.rows_imported) == (CompanyImportRun.Status.COMPLETED, 'ZH', 3, 3)
+    assert len(run.file_hash) == 64
+
+
+@pytest.mark.django_db
+def test_resume_continues_after_last_row(workbook_path):
+    import_companies(workbook_path, '--checkpoint')
+    run = CompanyImportRun.objects.get()
+    Company.objects.filter(title='Gamma AG').delete()
+    CompanyImportRun.objects.update(status=CompanyImportRun.Status.FAILED, last_row=2, rows_imported=2)
+    import_companies(workbook_path, '--resume')
+    run.refresh_from_db()
+    assert run.status == CompanyImportRun.Status.COMPLETED
+    assert sorted(Company.objects.values_list('title', flat=True)) == ['Alpha AG', 'Beta AG', 'Gamma AG']
+
+
+@pytest.mark.django_db
+def test_resume_rejects_changed_file(workbook_path):
+    import_companies(workbook_path, '--checkpoint')
+    CompanyImportRun.objects.update(status=CompanyImportRun.Status.FAILED, last_row=1)
+    # Same name and size, different content.
+    write_workbook(workbook_path, ['Alpha AG', 'Beta AG', 'Gamma AX'])
+    with pytest.raises(CommandError, match='file changed'):
+        import_companies(workbook_path, '--resume')
+
+
+@pytest.mark.django_db
+def test_resume_rejects_changed_options(workbook_path):
+    import_companies(workbook_path, '--checkpoint')
+    CompanyImportRun.objects.update(status=CompanyImportRun.Status.FAILED, last_row=1)
+    with pytest.raises(CommandError, match='Options differ from the interrupted import: --description, --mode'):
+        import_companies(workbook_path, '--resume', '--description=Title', '--mode=upsert')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('titles, args, error', [
+    ([], [], 'Provided file is empty'),
+    (['Delta AG'], ['--title=Name'], 'Columns not found: Name'),
+])
+def test_checkpointed_replace_keeps_companies_of_unusable_file(workbook_path, tmp_path, titles, args, error):
+    import_companies(workbook_path)
+    bad_path = write_workbook(tmp_path / 'bad.xlsx', titles)
+    with pytest.raises(CommandError, match=error):
+        import_companies(bad_path, '--checkpoint', *args)
+    assert Company.objects.count() == 3
+    assert not CompanyDeletion.objects.exists()
+    assert not CompanyImportRun.objects.exists()
+
+
+@pytest.mark.django_db
+def test_replace_leaves_tombstones_of_replaced_companies(workbook_path):
+    import_companies(workbook_path)
+    old_ids = set(Company.objects.values_list('pk', flat=True))
+    import_companies(workbook_path)
+    assert set(CompanyDeletion.objects.values_list('company_id', flat=True)) == old_ids
+    assert Company.objects.count() == 3
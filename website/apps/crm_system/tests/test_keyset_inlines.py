@@ -0,0 +1,93 @@
+import pytest
+from django.forms import inlineformset_factory
+from django.urls import reverse
+
+from apps.core.admin import KeysetInlineFormSet
+from apps.crm_system.admin import CompanyNoteStacked
+from apps.crm_system.models import Company, CompanyNote
+from apps.custom_user.models import CustomUser
+
+NoteFormSet = inlineformset_factory(Company, CompanyNote, formset=KeysetInlineFormSet, fields=['note'], extra=0)
+NoteFormSet.keyset_ordering = ['-created_at', '-pk']
+NoteFormSet.per_page = 2
+
+
+@pytest.fixture
+def company(create_company):
+    company = create_company('Alpha AG')
+    for number in range(5):
+        CompanyNote.objects.create(company=company, note=f'Note {number}')
+    return company
+
+
+def newest_notes(company) -> list[CompanyNote]:
+    return list(company.comments.order_by('-created_at', '-pk'))
+
+
+def post_data(notes, changes=None) -> dict:
+    data = {
+        'comments-TOTAL_FORMS': len(notes),
+        'comments-INITIAL_FORMS': len(notes),
+    }
+    for i, note in enumerate(notes):
+        data[f'comments-{i}-id'] = note.pk
+        data[f'comments-{i}-note'] = (changes or {}).get(note.pk, note.note)
+    return data
+
+
+@pytest.mark.django_db
+def test_unbound_formset_lists_a_page(company):
+    formset = NoteFormSet(instance=company)
+    notes = newest_notes(company)
+    assert [form.instance for form in formset.forms] == notes[:2]
+    assert formset.keyset_page.has_next()
+    formset = NoteFormSet(instance=company, cursor=formset.keyset_page.next_cursor)
+    assert [form.instance for form in formset.forms] == notes[2:4]
+
+
+@pytest.mark.django_db
+def test_bound_formset_loads_posted_rows_only(company, django_assert_num_queries):
+    notes = newest_notes(company)
+    # An unchanged row that would not pass validation.
+    CompanyNote.objects.filter(pk=notes[1].pk).update(note='')
+    notes[1].note = ''
+    formset = NoteFormSet(post_data(notes[:2], {notes[0].pk: 'Changed'}), instance=company)
+    with django_assert_num_queries(1):
+        assert [form.instance for form in formset.forms] == notes[:2]
+    assert formset.is_valid(), formset.errors
+    formset.save()
+    assert CompanyNote.objects.get(pk=notes[0].pk).note == 'Changed'
+    assert CompanyNote.objects.get(pk=notes[1].pk).note == ''
+
+
+@pytest.mark.django_db
+def test_saving_a_page_keeps_rows_of_other_pages(company):
+    notes = newest_notes(company)
+    data = post_data(notes[:2])
+    data['comments-0-DELETE'] = 'on'
+    formset = NoteFormSet(data, instance=company)
+    assert formset.is_valid(), formset.errors
+    formset.save()
+    assert newest_notes(company) == notes[1:]
+
+
+@pytest.mark.django_db
+def test_inline_page_view_pages_with_cursor(company, client, monkeypatch):
+    monkeypatch.setattr(CompanyNoteStacked, 'per_page', 2)
+    client.force_login(CustomUser.objects.create(username='manager', status=CustomUser.Status.MANAGER))
+    url = reverse('admin:crm_system_company_inline_page', args=[company.pk, 'comments'])
+    notes = newest_notes(company)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    page = response.context['inline_admin_formset'].formset.keyset_page
+    assert page.object_list == notes[:2]
+    assert page.has_next()
+
+    response = client.get(url, {'cursor': page.next_cursor})
+    page = response.context['inline_admin_formset'].formset.keyset_page
+    assert page.object_list == notes[2:4]
+    assert page.has_previous()
+
+    assert client.get(url, {'cursor': 'invalid'}).status_code == 400
+    assert client.get(reverse('admin:crm_system_company_inline_page', args=[company.pk, 'other'])).status_code == 404
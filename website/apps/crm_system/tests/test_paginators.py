@@ -0,0 +1,111 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.db import connection
+
+from apps.core import paginators
+from apps.core.paginators import EstimatedCountPaginator, InvalidCursor, KeysetPaginator, estimate_count
+from apps.crm_system.models import Canton, Company, CompanyType, LegalForm, LegalSeat
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def companies():
+    references = {
+        'type': CompanyType.objects.create(name='Bau'),
+        'canton': Canton.objects.create(name='ZH'),
+        'legal_seat': LegalSeat.objects.create(name='Zürich'),
+        'legal_form': LegalForm.objects.create(name='AG'),
+    }
+    created = [Company.objects.create(title=f'Company {index}', **references) for index in range(7)]
+    # Pairs of companies share a creation time, the pk breaks the tie.
+    for index, company in enumerate(created):
+        Company.objects.filter(pk=company.pk).update(created_at=START + timedelta(days=index // 2))
+    return list(Company.objects.order_by('-created_at', '-pk'))
+
+
+def titles(page) -> list[str]:
+    return [company.title for company in page]
+
+
+@pytest.mark.django_db
+def test_pages_forward_across_ties(companies):
+    paginator = KeysetPaginator(Company.objects.all(), per_page=3)
+    pages = list(paginator.iter_pages())
+    assert [titles(page) for page in pages] == [
+        titles(companies[0:3]), titles(companies[3:6]), titles(companies[6:7]),
+    ]
+    assert (pages[0].has_previous(), pages[-1].has_next()) == (False, False)
+
+
+@pytest.mark.django_db
+def test_pages_back_from_next_page(companies):
+    paginator = KeysetPaginator(Company.objects.all(), per_page=3)
+    first = paginator.page()
+    second = paginator.page(first.next_cursor)
+    third = paginator.page(second.next_cursor)
+    assert titles(paginator.page(third.previous_cursor)) == titles(second)
+    back = paginator.page(second.previous_cursor)
+    assert titles(back) == titles(first)
+    assert not back.has_previous()
+    assert back.has_next()
+
+
+@pytest.mark.django_db
+def test_after_reads_the_rest(companies):
+    paginator = KeysetPaginator(Company.objects.all(), per_page=2)
+    first = paginator.page()
+    assert [company.title for company in paginator.after(first.next_cursor)] == titles(companies[2:])
+
+
+@pytest.mark.django_db
+def test_ascending_ordering(companies):
+    paginator = KeysetPaginator(Company.objects.all(), per_page=4, ordering=['created_at', 'pk'])
+    assert [titles(page) for page in paginator.iter_pages()] == [
+        titles(companies[::-1][0:4]), titles(companies[::-1][4:7]),
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('cursor', ['not base64!', 'WyJuZXh0Il0=', 'WyJzaWRld2F5cyIsIFtdXQ=='])
+def test_invalid_cursor(companies, cursor):
+    paginator = KeysetPaginator(Company.objects.all(), per_page=3)
+    with pytest.raises(InvalidCursor):
+        paginator.page(cursor)
+
+
+@pytest.mark.django_db
+def test_after_rejects_previous_cursor(companies):
+    paginator = KeysetPaginator(Company.objects.all(), per_page=3)
+    second = paginator.page(paginator.page().next_cursor)
+    with pytest.raises(InvalidCursor):
+        paginator.after(second.previous_cursor)
+
+
+def test_ordering_must_be_model_fields():
+    with pytest.raises(ValueError, match='model fields'):
+        KeysetPaginator(Company.objects.all(), per_page=3, ordering=['-unknown', '-pk'])
+
+
+@pytest.mark.django_db
+def test_estimate_is_unavailable_on_sqlite(companies):
+    if connection.vendor != 'sqlite':
+        pytest.skip('PostgreSQL has planner estimates')
+    assert estimate_count(Company.objects.all()) is None
+    assert EstimatedCountPaginator(Company.objects.all(), per_page=3).count == 7
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('estimate, count', [
+    (5000, 5000),
+    (1000, 1000),
+    (999, 7),
+    (None, 7),
+])
+def test_estimate_is_used_from_threshold(companies, settings, monkeypatch, estimate, count):
+    settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 1000
+    monkeypatch.setattr(paginators, 'estimate_count', lambda queryset: estimate)
+    paginator = EstimatedCountPaginator(Company.objects.all(), per_page=3)
+    assert paginator.count == count
+    assert paginator.num_pages == -(-count // 3)
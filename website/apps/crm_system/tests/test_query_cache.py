@@ -0,0 +1,62 @@
+import pytest
+
+from apps.crm_system.models import Company, CompanyContactRecord
+from apps.crm_system.services.company_contact_service import CompanyContactService
+
+
+def cached_titles(**filters) -> list[str]:
+    return list(Company.objects.cached('test').filter(**filters).order_by('title').values_list('title', flat=True))
+
+
+@pytest.mark.django_db
+def test_save_and_delete_invalidate(create_company, query_cache, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        alpha = create_company('Alpha AG')
+    assert cached_titles() == ['Alpha AG']
+    with django_capture_on_commit_callbacks(execute=True):
+        create_company('Beta AG')
+    assert cached_titles() == ['Alpha AG', 'Beta AG']
+    with django_capture_on_commit_callbacks(execute=True):
+        alpha.delete()
+    assert cached_titles() == ['Beta AG']
+
+
+@pytest.mark.django_db
+def test_renaming_a_reference_invalidates(create_company, query_cache, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        company = create_company('Alpha AG')
+    assert cached_titles(canton__name='ZH') == ['Alpha AG']
+    with django_capture_on_commit_callbacks(execute=True):
+        canton = company.canton
+        canton.name = 'Zürich'
+        canton.save()
+    assert cached_titles(canton__name='ZH') == []
+    assert cached_titles(canton__name='Zürich') == ['Alpha AG']
+
+
+@pytest.mark.django_db
+def test_contact_summary_update_invalidates(create_company, query_cache, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        company = create_company('Alpha AG')
+    assert cached_titles(contact_records_count=1) == []
+    with django_capture_on_commit_callbacks(execute=True):
+        CompanyContactService.add_contact_record(None, company)
+    assert cached_titles(contact_records_count=1) == ['Alpha AG']
+    assert CompanyContactRecord.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_update_without_bump_stays_cached(create_company, query_cache):
+    create_company('Alpha AG')
+    assert cached_titles() == ['Alpha AG']
+    Company.objects.update(title='Beta AG')
+    assert cached_titles() == ['Alpha AG']
+
+
+@pytest.mark.django_db
+def test_disabled_reads_the_database(create_company, settings):
+    settings.QUERY_CACHE_ENABLED = False
+    create_company('Alpha AG')
+    assert cached_titles() == ['Alpha AG']
+    Company.objects.update(title='Beta AG')
+    assert cached_titles() == ['Beta AG']
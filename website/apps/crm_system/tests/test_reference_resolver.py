@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from django.core.exceptions import ValidationError
+from django.forms import modelform_factory
+
+from apps.crm_system.models import Canton, LegalSeat
+from apps.crm_system.services.company_import_validator import CompanyImportValidator
+from apps.crm_system.services.reference_resolver import ReferenceResolver
+
+
+@pytest.mark.django_db
+def test_resolve_matches_names_ignoring_case():
+    seat = LegalSeat.objects.create(name='Zürich')
+    resolver = ReferenceResolver(LegalSeat)
+    ids = resolver.resolve(['ZÜRICH', 'zürich', 'Écublens', 'ÉCUBLENS'])
+    assert resolver.get_id('ZÜRICH') == seat.pk
+    assert resolver.get_id('écublens') == ids['écublens']
+    assert list(LegalSeat.objects.order_by('pk').values_list('name', 'normalized_name')) == [
+        ('Zürich', 'zürich'),
+        ('Écublens', 'écublens'),
+    ]
+
+
+@pytest.mark.django_db
+def test_save_keeps_normalized_name_in_sync():
+    seat = LegalSeat.objects.create(name='Genève')
+    seat.name = 'GENÈVE'
+    seat.save(update_fields=['name'])
+    seat.refresh_from_db()
+    assert seat.normalized_name == 'genève'
+
+
+@pytest.mark.django_db
+def test_form_rejects_name_differing_in_non_ascii_case():
+    LegalSeat.objects.create(name='Zürich')
+    form = modelform_factory(LegalSeat, fields=['name'])({'name': 'ZÜRICH'})
+    assert not form.is_valid()
+    assert form.non_field_errors() == ['Record with this name already exists']
+
+
+@pytest.mark.django_db
+def test_full_clean_rejects_duplicate():
+    Canton.objects.create(name='ZH')
+    with pytest.raises(ValidationError):
+        Canton(name='zh').full_clean()
+
+
+@pytest.mark.django_db
+def test_validator_knows_references_ignoring_case():
+    LegalSeat.objects.create(name='Zürich')
+    known = CompanyImportValidator.load_known_references()
+    columns = {'title': 'Title', 'canton': 'Canton', 'type': 'Type', 'legal_seat': 'Seat', 'legal_form': 'Form'}
+    frame = pd.DataFrame(
+        {'Title': ['A', 'B'], 'Canton': ['ZH', 'ZH'], 'Type': ['T', 'T'], 'Seat': ['ZÜRICH', 'Bern'], 'Form': ['AG', 'AG']},
+        index=[2, 3],
+    )
+    report = CompanyImportValidator(columns, known).validate('Sheet', frame)
+    unknown_seats = report[(report['column'] == 'Seat') & (report['error'] == 'unknown_reference')]
+    assert list(unknown_seats['value']) == ['Bern']
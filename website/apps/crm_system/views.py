@@ -0,0 +1,72 @@
+import json
+from collections.abc import Iterator
+
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+
+from apps.core.paginators import InvalidCursor
+from apps.crm_system.forms import CompanyFeedForm, FeedForm
+from apps.crm_system.models import Company
+from apps.crm_system.services.company_feed import CompanyFeed
+
+
+class CompanyFeedView(View):
+    """
+    Streams companies, optionally with their contact records and notes, as
+    NDJSON (default) or as a JSON array, see ``CompanyFeed``. Access follows
+    the view permission of the company admin.
+    """
+
+    admin_site = None
+    chunk_size = 1000
+    form_class = CompanyFeedForm
+
+    def get(self, request, *args, **kwargs):
+        if not self.admin_site._registry[Company].has_view_permission(request):
+            raise PermissionDenied
+        form = self.form_class(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        try:
+            rows = self.get_rows(form)
+        except InvalidCursor as e:
+            return JsonResponse({'errors': {'cursor': [str(e)]}}, status=400)
+        if form.cleaned_data['format'] == 'json':
+            return StreamingHttpResponse(self._json_array(rows), content_type='application/json')
+        return StreamingHttpResponse(
+            (self._dumps(row) + '\n' for row in rows),
+            content_type='application/x-ndjson',
+        )
+
+    def get_rows(self, form) -> Iterator[dict]:
+        feed = CompanyFeed(
+            form.filter(Company.objects.all()),
+            include=form.cleaned_data['include'],
+            chunk_size=self.chunk_size,
+        )
+        return feed.rows(form.cleaned_data['cursor'] or None)
+
+    def _json_array(self, rows: Iterator[dict]) -> Iterator[str]:
+        yield '['
+        for index, row in enumerate(rows):
+            yield (',\n' if index else '\n') + self._dumps(row)
+        yield '\n]\n'
+
+    @staticmethod
+    def _dumps(row: dict) -> str:
+        return json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+class CompanyDeletionFeedView(CompanyFeedView):
+    """
+    Streams the tombstones of deleted companies, see ``CompanyFeed.deletions()``.
+    A sync reads them after the companies and drops the listed ids.
+    """
+
+    form_class = FeedForm
+
+    def get_rows(self, form) -> Iterator[dict]:
+        feed = CompanyFeed(Company.objects.all(), chunk_size=self.chunk_size)
+        return feed.deletions(form.cleaned_data['cursor'] or None)
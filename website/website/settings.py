@@ -114,6 +114,41 @@ if bool(os.getenv("POSTGRES_DB")):
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
     }
+    # Full text and trigram search lookups of the company search.
+    INSTALLED_APPS.append("django.contrib.postgres")
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Holds table versions and cached query results. Processes only share them
+# through a common backend: set DJANGO_CACHE_DIR for a file based cache, or
+# DJANGO_CACHE_BACKEND and DJANGO_CACHE_LOCATION for any other backend.
+CACHE_DIR = os.getenv("DJANGO_CACHE_DIR")
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache" if CACHE_DIR else "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", CACHE_DIR or ""),
+    }
+}
+
+# Query results and autocomplete indexes are only cached when every process
+# reads the same table versions. With a cache per process, e.g. the default
+# local memory cache and several gunicorn workers, a write in one worker
+# would leave the others serving stale results.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+QUERY_CACHE_ENABLED = is_true(
+    os.getenv("DJANGO_QUERY_CACHE_ENABLED", str(CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES))
+)
+
+# Seconds results of QueryCache, e.g. company changelist counts and pages,
+# are kept at most. Writes invalidate them earlier by bumping table versions.
+QUERY_CACHE_TIMEOUT = int(os.getenv("DJANGO_QUERY_CACHE_TIMEOUT", 600))
 
 
 # Password validation
@@ -259,3 +294,7 @@ LOGGING = {
 AUTH_USER_MODEL = 'custom_user.CustomUser'
 
 GRAPPELLI_ADMIN_TITLE = translate('CRM System')
+
+# Admin changelists using EstimatedCountPaginator show planner estimates instead
+# of exact counts for results of at least this many rows (PostgreSQL only).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv("DJANGO_ADMIN_ESTIMATED_COUNT_THRESHOLD", 100_000))
@@ -15,6 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from apps.core.autocomplete import CachedAutocompleteJsonView
+from apps.crm_system.views import CompanyDeletionFeedView, CompanyFeedView
 from apps.custom_user.forms import AdminAuthenticationForm
 from django.conf import settings
 from django.conf.urls.static import static
@@ -27,7 +29,22 @@ admin.site.login_form = AdminAuthenticationForm
 urlpatterns = [
     path('', RedirectView.as_view(pattern_name='admin:index')),
     path('grappelli/', include('grappelli.urls')), # grappelli URLS
+    # Takes precedence over the admin's own autocomplete view.
+    path(
+        "admin/autocomplete/",
+        admin.site.admin_view(CachedAutocompleteJsonView.as_view(admin_site=admin.site)),
+    ),
     path("admin/", admin.site.urls),
+    path(
+        "api/companies/",
+        admin.site.admin_view(CompanyFeedView.as_view(admin_site=admin.site)),
+        name="company_feed",
+    ),
+    path(
+        "api/companies/deletions/",
+        admin.site.admin_view(CompanyDeletionFeedView.as_view(admin_site=admin.site)),
+        name="company_deletion_feed",
+    ),
 ]
 
 # Serve media files from MEDIA_ROOT. It will only work when DEBUG=True is set.